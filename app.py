@@ -1,30 +1,194 @@
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
+from flask import (Flask, Blueprint, render_template, request, jsonify, session, redirect, url_for,
+                   Response, current_app, send_file, stream_with_context, g)
+from markupsafe import Markup
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session as FlaskSession
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.orm import Session, validates
 from werkzeug.security import generate_password_hash, check_password_hash
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from functools import partial, wraps
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextlib import ExitStack, closing, contextmanager
+from operator import itemgetter
+import base64
+import click
+import hashlib
+import heapq
+import csv
+import gzip
+import inspect
+import io
+import itertools
+import json
+import math
 import os
+import queue
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import traceback
+import threading
+import time
 
-app = Flask(__name__)
-app.config['SECRET_KEY'] = 'your-secret-key-change-this-in-production-12345'
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///skillverify.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(days=7)
+try:
+    import orjson
+except ImportError:  # falls back to the stdlib encoder
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = pq = None
+
+try:
+    import numpy as np
+except ImportError:  # so are the admin cohort analytics
+    np = None
+
+class Config:
+    SECRET_KEY = 'your-secret-key-change-this-in-production-12345'
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///skillverify.db'
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    PERMANENT_SESSION_LIFETIME = timedelta(days=7)
+    
+    # Admission control: (tokens, per seconds) for rate limits, slots/queue for concurrency
+    LOGIN_RATE_PER_IP = (20, 60)
+    LOGIN_RATE_PER_ACCOUNT = (5, 60)
+    AUTH_CONCURRENCY = 4
+    AUTH_QUEUE_DEPTH = 16
+    ADMIN_CONCURRENCY = 2
+    ADMIN_QUEUE_DEPTH = 4
+    ADMISSION_QUEUE_TIMEOUT = 2.0
+    EXPORT_CONCURRENCY = 2
+    EXPORT_BATCH_SIZE = 5000
+    # Request writes go through one writer thread per database in each worker process,
+    # which commits up to WRITE_BATCH_SIZE of them in one transaction
+    WRITE_BATCH_SIZE = 64
+    WRITE_QUEUE_DEPTH = 1000
+    WRITE_TIMEOUT = 10.0
+    # Admin tables fetch rows in keyset pages as they scroll
+    ADMIN_PAGE_SIZE = 100
+    ADMIN_MAX_PAGE_SIZE = 500
+    USER_EXISTS_MAX_EMAILS = 1000
+    
+    # /api/xp-history serves at most this many hourly or daily rollup buckets per request
+    XP_HISTORY_DEFAULT_BUCKETS = 30
+    XP_HISTORY_MAX_BUCKETS = 1000
+    
+    # Admin cohort analytics (needs numpy): weekly signup cohorts, each followed for
+    # ANALYTICS_COHORT_WEEKS weeks; computed cohorts are reused for ANALYTICS_CACHE_TTL seconds
+    ANALYTICS_DEFAULT_COHORTS = 12
+    ANALYTICS_MAX_COHORTS = 104
+    ANALYTICS_COHORT_WEEKS = 12
+    ANALYTICS_READY_THRESHOLD = 70
+    ANALYTICS_CACHE_TTL = 600
+    
+    # Question set new survey submissions are recorded against
+    SURVEY_QUESTION_SET = 1
+    
+    CHALLENGE_PAGE_SIZE = 20
+    CHALLENGE_MAX_PAGE_SIZE = 100
+    # Cached challenge lists live at most this long, or until the next deadline passes
+    CHALLENGE_CACHE_TTL = 300
+    
+    # Survey responses older than this move to the attached archive database
+    ARCHIVE_DATABASE = 'skillverify_archive.db'
+    ARCHIVE_AFTER_DAYS = 365
+    ARCHIVE_BATCH_SIZE = 1000
+    ARCHIVE_BATCH_PAUSE = 0.05
+    
+    # Background jobs: threads per worker process, queue poll interval and how long
+    # a running job may go without a heartbeat before it is requeued
+    JOB_WORKERS = 2
+    JOB_POLL_INTERVAL = 2.0
+    JOB_STALE_AFTER = 60
+    JOB_EXPORT_DIR = 'exports'
+    
+    # Online backups: the SQLite backup API copies each database a few pages per step,
+    # pausing between steps so writers keep going. Each copy is cut into chunks of
+    # BACKUP_CHUNK_SIZE bytes, gzipped into a content-addressed store under BACKUP_DIR,
+    # so a snapshot only stores the chunks that changed since the ones it keeps.
+    BACKUP_DIR = 'backups'
+    BACKUP_CHUNK_SIZE = 256 * 1024
+    BACKUP_PAGES_PER_STEP = 256
+    BACKUP_STEP_PAUSE = 0.005
+    BACKUP_MAX_RESTARTS = 5
+    BACKUP_KEEP = 14
+    # Seconds between backups queued by the job runners; None turns scheduling off
+    BACKUP_INTERVAL = None
+    
+    # Admin and reporting reads go to a read-only copy of every database under
+    # READ_REPLICA_DIR, refreshed by the job runners. A copy older than this many
+    # seconds is not used and those reads go to the primary; None turns it off.
+    READ_REPLICA_MAX_STALENESS = None
+    READ_REPLICA_DIR = 'replica'
+    
+    # Once `flask reshard` records a layout, users, profiles and survey responses live
+    # in these files (shard = user id % shard count); the primary keeps a user directory
+    USER_SHARD_DATABASE = 'skillverify_users_g{generation}_s{shard}.db'
+
+
+class RoutingSession(FlaskSession):
+    """db.session, reading from the read replica in contexts routed there (see replica_reads)"""
+    
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        replica = g.get('read_replica')
+        if bind is None and replica is not None:
+            return replica.engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+bp = Blueprint('skillverify', __name__, cli_group=None)
+
+
+def attach_archive(path, dbapi_connection, connection_record):
+    """ATTACH the cold archive database to every new SQLite connection"""
+    dbapi_connection.execute('ATTACH DATABASE ? AS archive', (path,))
+
+
+def use_wal(dbapi_connection, connection_record):
+    """Write-ahead logging on a live database and its archive (a no-op once set).
+    
+    In rollback-journal mode a reader holds off every commit, so a streamed export
+    or admin scan would lock writers out for as long as the client takes to read it.
+    WAL commits are not atomic across attached databases, which archival allows for.
+    """
+    for schema in ('main', 'archive'):
+        dbapi_connection.execute(f'PRAGMA {schema}.journal_mode=WAL')
 
-db = SQLAlchemy(app)
 
 # ============= DATABASE MODELS =============
 
+def normalize_email(email):
+    """Canonical form of an address for uniqueness checks and lookups"""
+    return email.strip().lower()
+
+
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), unique=True, nullable=False)
+    # Kept in step with email; its unique index is what stops case/whitespace duplicates
+    email_normalized = db.Column(db.String(120), nullable=False, unique=True, index=True)
     password_hash = db.Column(db.String(255), nullable=False)
     name = db.Column(db.String(100))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     
     # Relationships
     profile = db.relationship('UserProfile', backref='user', uselist=False, cascade='all, delete-orphan')
     survey_responses = db.relationship('SurveyResponse', backref='user', cascade='all, delete-orphan')
     
+    @validates('email')
+    def _normalize_email(self, key, email):
+        self.email_normalized = normalize_email(email)
+        return email
+    
     def set_password(self, password):
         self.password_hash = generate_password_hash(password)
     
@@ -57,35 +221,99 @@ class UserProfile(db.Model):
         }
 
 
+class XpEvent(db.Model):
+    """Append-only log of profile counter changes, written by triggers on user_profile"""
+    __table_args__ = (db.Index('ix_xp_event_user_metric_id', 'user_id', 'metric', 'id'),)
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False)
+    metric = db.Column(db.String(30), nullable=False)
+    delta = db.Column(db.Integer, nullable=False)
+    # The counter's value right after the change
+    value = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+
+class XpRollup(db.Model):
+    """Hourly and daily sums of XpEvent, per user and for everyone (user_id 0)"""
+    period = db.Column(db.String(4), primary_key=True)
+    user_id = db.Column(db.Integer, primary_key=True)
+    metric = db.Column(db.String(30), primary_key=True)
+    bucket = db.Column(db.DateTime, primary_key=True)
+    delta = db.Column(db.Integer, nullable=False, default=0)
+    events = db.Column(db.Integer, nullable=False, default=0)
+    # Last value in the bucket; NULL for the everyone rows
+    value = db.Column(db.Integer)
+
+
 class SurveyResponse(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    question_1 = db.Column(db.String(50))
-    question_2 = db.Column(db.String(50))
-    question_3 = db.Column(db.String(50))
-    question_4 = db.Column(db.String(50))
-    question_5 = db.Column(db.String(50))
-    completed_at = db.Column(db.DateTime, default=datetime.utcnow)
+    question_set_id = db.Column(db.Integer, db.ForeignKey('survey_question_set.id'), nullable=False, default=1)
+    # One byte per question: 0 = unanswered, else a survey_option code
+    answers = db.Column(db.LargeBinary, nullable=False, default=b'')
+    completed_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    
+    def to_dict(self):
+        survey = {'id': self.id, 'question_set': self.question_set_id}
+        survey.update(get_codebook().decode(self.question_set_id, self.answers))
+        survey['completed_at'] = self.completed_at.isoformat()
+        return survey
+
+
+class SurveyQuestionSet(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100))
+    question_count = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     def to_dict(self):
         return {
             'id': self.id,
-            'question_1': self.question_1,
-            'question_2': self.question_2,
-            'question_3': self.question_3,
-            'question_4': self.question_4,
-            'question_5': self.question_5,
-            'completed_at': self.completed_at.isoformat()
+            'name': self.name,
+            'question_count': self.question_count,
+            'created_at': self.created_at.isoformat()
         }
 
 
+class SurveyOption(db.Model):
+    """Answer dictionary: each distinct answer per question gets a small code"""
+    __table_args__ = (
+        db.UniqueConstraint('question_set_id', 'position', 'value'),
+        db.UniqueConstraint('question_set_id', 'position', 'code'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    question_set_id = db.Column(db.Integer, db.ForeignKey('survey_question_set.id'), nullable=False)
+    position = db.Column(db.Integer, nullable=False)
+    code = db.Column(db.Integer, nullable=False)
+    value = db.Column(db.String(50), nullable=False)
+
+
 class Challenge(db.Model):
+    # (filter column, id) so filtered keyset pages are a single index range scan, and
+    # (filter column, sort column, id) so filtered pages sorted by title or deadline
+    # are too, without a temporary B-tree for the ORDER BY
+    __table_args__ = (
+        db.Index('ix_challenge_domain_id', 'domain', 'id'),
+        db.Index('ix_challenge_difficulty_id', 'difficulty', 'id'),
+        db.Index('ix_challenge_company_id', 'company', 'id'),
+        db.Index('ix_challenge_status_id', 'status', 'id'),
+        db.Index('ix_challenge_title_id', 'title', 'id'),
+        db.Index('ix_challenge_deadline_id', 'deadline_at', 'id'),
+        *(db.Index(f'ix_challenge_{column}_{sort}_id', column, sort_column, 'id')
+          for column in ('domain', 'difficulty', 'company', 'status')
+          for sort, sort_column in (('title', 'title'), ('deadline', 'deadline_at'))),
+    )
+    
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     company = db.Column(db.String(100))
     domain = db.Column(db.String(100))
     difficulty = db.Column(db.String(50))
-    deadline = db.Column(db.String(50))
+    # Older databases also carry the free-text "deadline" column this replaced;
+    # migrate_challenge_deadlines() backfills from it
+    deadline = db.Column('deadline_at', db.DateTime)
     status = db.Column(db.String(50))
     
     def to_dict(self):
@@ -95,1043 +323,4834 @@ class Challenge(db.Model):
             'company': self.company,
             'domain': self.domain,
             'difficulty': self.difficulty,
-            'deadline': self.deadline,
+            'deadline': self.deadline.isoformat() if self.deadline else None,
             'status': self.status
         }
 
 
-# ============= MAIN ROUTES =============
+class TableVersion(db.Model):
+    """Per-table change counter, bumped by triggers in the same transaction as the write"""
+    table_name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
 
-@app.route('/')
-def index():
-    """Main dashboard page"""
-    return render_template('dashboard.html')
 
+class UserDirectory(db.Model):
+    """Primary-database index of sharded users: allocates ids and resolves logins"""
+    id = db.Column(db.Integer, primary_key=True)
+    # Normalized, like User.email_normalized
+    email = db.Column(db.String(120), unique=True, nullable=False)
 
-@app.route('/register-page')
-def register_page():
-    """Simple registration page"""
-    return '''
-    <!DOCTYPE html>
-    <html lang="en">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Register - SkillVerify</title>
-        <style>
-            * { margin: 0; padding: 0; box-sizing: border-box; }
-            body {
-                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', 'Roboto', sans-serif;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                min-height: 100vh;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                padding: 20px;
-            }
-            .container {
-                background: white;
-                padding: 50px;
-                border-radius: 24px;
-                box-shadow: 0 20px 60px rgba(0, 0, 0, 0.3);
-                max-width: 450px;
-                width: 100%;
-            }
-            h1 {
-                font-size: 32px;
-                margin-bottom: 10px;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                -webkit-background-clip: text;
-                -webkit-text-fill-color: transparent;
-            }
-            p { color: #666; margin-bottom: 30px; }
-            .form-group { margin-bottom: 20px; }
-            label {
-                display: block;
-                color: #333;
-                font-weight: 600;
-                margin-bottom: 8px;
-                font-size: 14px;
-            }
-            input {
-                width: 100%;
-                padding: 14px;
-                border: 2px solid #e0e0e0;
-                border-radius: 12px;
-                font-size: 15px;
-                transition: all 0.3s ease;
-            }
-            input:focus {
-                outline: none;
-                border-color: #667eea;
-                box-shadow: 0 0 0 3px rgba(102, 126, 234, 0.1);
-            }
-            button {
-                width: 100%;
-                padding: 16px;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                color: white;
-                border: none;
-                border-radius: 12px;
-                font-size: 16px;
-                font-weight: 600;
-                cursor: pointer;
-                transition: all 0.3s ease;
-                margin-top: 10px;
-            }
-            button:hover {
-                transform: translateY(-2px);
-                box-shadow: 0 10px 30px rgba(102, 126, 234, 0.4);
-            }
-            .link {
-                text-align: center;
-                margin-top: 20px;
-                color: #666;
-            }
-            .link a {
-                color: #667eea;
-                text-decoration: none;
-                font-weight: 600;
-            }
-            .message {
-                padding: 12px;
-                border-radius: 8px;
-                margin-bottom: 20px;
-                display: none;
-            }
-            .success {
-                background: #d4f4dd;
-                color: #22863a;
-                display: block;
-            }
-            .error {
-                background: #f8d7da;
-                color: #721c24;
-                display: block;
-            }
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h1>Create Account</h1>
-            <p>Join SkillVerify to start your journey</p>
-            
-            <div id="message" class="message"></div>
-            
-            <form id="registerForm">
-                <div class="form-group">
-                    <label>Full Name</label>
-                    <input type="text" id="name" placeholder="Enter your name" required>
-                </div>
-                <div class="form-group">
-                    <label>Email Address</label>
-                    <input type="email" id="email" placeholder="Enter your email" required>
-                </div>
-                <div class="form-group">
-                    <label>Password</label>
-                    <input type="password" id="password" placeholder="Create a password" required>
-                </div>
-                <button type="submit" id="submitBtn">Create Account</button>
-            </form>
-            
-            <div class="link">
-                Already have an account? <a href="/">Sign In</a>
-            </div>
-        </div>
 
-        <script>
-            document.getElementById('registerForm').addEventListener('submit', async (e) => {
-                e.preventDefault();
-                
-                const submitBtn = document.getElementById('submitBtn');
-                const message = document.getElementById('message');
-                
-                submitBtn.textContent = 'Creating Account...';
-                submitBtn.disabled = true;
-                
-                try {
-                    const response = await fetch('/api/register', {
-                        method: 'POST',
-                        headers: {'Content-Type': 'application/json'},
-                        body: JSON.stringify({
-                            name: document.getElementById('name').value,
-                            email: document.getElementById('email').value,
-                            password: document.getElementById('password').value
-                        })
-                    });
-                    
-                    const data = await response.json();
-                    
-                    if (data.success) {
-                        message.className = 'message success';
-                        message.textContent = 'Account created successfully! Redirecting...';
-                        setTimeout(() => window.location.href = '/', 2000);
-                    } else {
-                        message.className = 'message error';
-                        message.textContent = data.message;
-                        submitBtn.textContent = 'Create Account';
-                        submitBtn.disabled = false;
-                    }
-                } catch (error) {
-                    message.className = 'message error';
-                    message.textContent = 'An error occurred. Please try again.';
-                    submitBtn.textContent = 'Create Account';
-                    submitBtn.disabled = false;
-                }
-            });
-        </script>
-    </body>
-    </html>
-    '''
+class UserShardLayout(db.Model):
+    """The single current shard layout; no row means users are not sharded"""
+    id = db.Column(db.Integer, primary_key=True)
+    shards = db.Column(db.Integer, nullable=False)
+    generation = db.Column(db.Integer, nullable=False)
+    # Every survey id issued before this layout is at or below the floor
+    survey_id_floor = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
 
-# ============= API ROUTES =============
+class Job(db.Model):
+    """Durable record of a background job; see JobRunner"""
+    __table_args__ = (db.Index('ix_job_status_id', 'status', 'id'),)
+    
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='queued')
+    params = db.Column(db.Text, nullable=False, default='{}')
+    progress = db.Column(db.Float, nullable=False, default=0.0)
+    message = db.Column(db.String(200))
+    result = db.Column(db.Text)
+    error = db.Column(db.Text)
+    cancel_requested = db.Column(db.Boolean, nullable=False, default=False)
+    owner_pid = db.Column(db.Integer)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'params': redact_secrets(json.loads(self.params)),
+            'progress': round(self.progress, 4),
+            'message': self.message,
+            'result': json.loads(self.result) if self.result else None,
+            'error': self.error,
+            'cancel_requested': self.cancel_requested,
+            'attempts': self.attempts,
+            'created_at': self.created_at.isoformat(),
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
 
-@app.route('/api/register', methods=['POST'])
-def register():
-    """Register a new user"""
-    data = request.get_json()
+
+# Cold copy of SurveyResponse in the attached "archive" database. It lives in its
+# own MetaData so create_all() never touches it; see ensure_archive().
+archived_survey_responses = db.Table(
+    'survey_response', db.MetaData(),
+    db.Column('id', db.Integer, primary_key=True),
+    db.Column('user_id', db.Integer, nullable=False, index=True),
+    db.Column('question_set_id', db.Integer, nullable=False, default=1),
+    db.Column('answers', db.LargeBinary, nullable=False, default=b''),
+    db.Column('completed_at', db.DateTime, index=True),
+    db.Column('archived_at', db.DateTime),
+    schema='archive'
+)
+
+
+# ============= SURVEY ANSWER ENCODING =============
+
+MAX_OPTION_CODE = 255
+MAX_OPTION_LENGTH = 50
+
+# The career test's answer options (see templates/dashboard.html), most popular first
+CAREER_TEST_OPTIONS = (
+    ('innovation', 'helping', 'leadership', 'security'),
+    ('collaborative', 'dynamic', 'independent', 'structured'),
+    ('technical', 'analytical', 'creative', 'interpersonal'),
+    ('balanced', 'career-focused', 'flexible', 'life-first'),
+    ('systematic', 'research', 'collaborative-problem', 'intuitive'),
+)
+
+
+class SurveyCodebook:
+    """Per-worker cache of the survey_option dictionary and question set sizes"""
     
-    email = data.get('email')
-    password = data.get('password')
-    name = data.get('name', '')
+    def __init__(self):
+        self._codes = {}
+        self._values = {}
+        self._question_counts = {}
+        self._version = None
+        self._lock = threading.Lock()
     
-    if not email or not password:
-        return jsonify({'success': False, 'message': 'Email and password are required'}), 400
+    def reload(self):
+        # Own connection, so lookups never join (or lock) the request's transaction
+        with db.engine.connect() as conn:
+            version = self._current_version(conn)
+            options = conn.execute(db.select(
+                SurveyOption.question_set_id, SurveyOption.position, SurveyOption.code, SurveyOption.value
+            )).all()
+            counts = conn.execute(db.select(SurveyQuestionSet.id, SurveyQuestionSet.question_count)).all()
+        with self._lock:
+            self._codes = {(s, p, v): c for s, p, c, v in options}
+            self._values = {(s, p, c): v for s, p, c, v in options}
+            self._question_counts = dict(counts)
+            self._version = version
     
-    if User.query.filter_by(email=email).first():
-        return jsonify({'success': False, 'message': 'Email already registered'}), 400
+    def refresh(self):
+        """Reload only if survey_option or survey_question_set changed since the last load.
+        
+        A miss that survives this is a real miss, so bad input costs one version read
+        instead of a full reload. Until init_schema installs the counters, every call reloads.
+        """
+        with db.engine.connect() as conn:
+            version = self._current_version(conn)
+        if len(version) < len(CODEBOOK_TABLES) or version != self._version:
+            self.reload()
     
-    user = User(email=email, name=name)
-    user.set_password(password)
-    db.session.add(user)
-    db.session.commit()
+    @staticmethod
+    def _current_version(conn):
+        return tuple(conn.execute(
+            db.select(TableVersion.version).where(TableVersion.table_name.in_(CODEBOOK_TABLES))
+            .order_by(TableVersion.table_name)
+        ).scalars())
     
-    # Create default profile
-    profile = UserProfile(
-        user_id=user.id,
-        skill_readiness=0,
-        verified_skills=0,
-        total_xp=0,
-        certifications=0
-    )
-    db.session.add(profile)
-    db.session.commit()
-    
-    return jsonify({
-        'success': True,
-        'message': 'Registration successful',
-        'user': user.to_dict()
-    }), 201
-
-
-@app.route('/api/login', methods=['POST'])
-def login():
-    """Login user"""
-    data = request.get_json()
+    def question_count(self, question_set_id):
+        if question_set_id not in self._question_counts:
+            self.refresh()
+        return self._question_counts.get(question_set_id)
     
-    email = data.get('email')
-    password = data.get('password')
-    remember_me = data.get('rememberMe', False)
+    def max_question_count(self):
+        self.refresh()
+        return max(self._question_counts.values(), default=0)
     
-    if not email or not password:
-        return jsonify({'success': False, 'message': 'Email and password are required'}), 400
+    def encode(self, question_set_id, answers, register=False):
+        """Pack {position: value} into one byte per question.
+        
+        Answers must be one of the question's registered options. With register=True
+        (migrations, generated data) new values are registered instead, on a separate
+        connection, so call this before the session starts writing.
+        """
+        packed = bytearray(self.question_count(question_set_id))
+        for position in range(1, len(packed) + 1):
+            value = answers.get(position)
+            if value is not None:
+                if not isinstance(value, str):
+                    raise ValueError(f'The answer to question {position} must be a string')
+                packed[position - 1] = self.code_for(question_set_id, position, value, register)
+        return bytes(packed)
     
-    user = User.query.filter_by(email=email).first()
+    def code_for(self, question_set_id, position, value, register=False):
+        key = (question_set_id, position, value)
+        if key not in self._codes:
+            # Another worker may have registered it since we last loaded
+            self.refresh()
+        code = self._codes.get(key)
+        if code is None:
+            if not register:
+                raise ValueError(f'{value!r} is not an option for question {position}')
+            code = self._register(question_set_id, position, value)
+        return code
     
-    if not user or not user.check_password(password):
-        return jsonify({'success': False, 'message': 'Invalid email or password'}), 401
+    def register_options(self, question_set_id, options):
+        """Register each question's allowed answers ([[value, ...], ...] in question order)"""
+        for position, values in enumerate(options, start=1):
+            for value in values:
+                self.code_for(question_set_id, position, value, register=True)
     
-    session['user_id'] = user.id
-    session['email'] = user.email
+    def _register(self, question_set_id, position, value):
+        if len(value) > MAX_OPTION_LENGTH:
+            raise ValueError(f'Survey answers are limited to {MAX_OPTION_LENGTH} characters')
+        
+        # Single statement, so concurrent writers can't hand out the same code twice
+        with db.engine.begin() as conn:
+            conn.execute(db.text(
+                'INSERT OR IGNORE INTO survey_option (question_set_id, position, code, value) '
+                'SELECT :set_id, :position, COALESCE(MAX(code), 0) + 1, :value '
+                'FROM survey_option WHERE question_set_id = :set_id AND position = :position'
+            ), {'set_id': question_set_id, 'position': position, 'value': value})
+            code = conn.execute(db.select(SurveyOption.code).where(
+                SurveyOption.question_set_id == question_set_id,
+                SurveyOption.position == position,
+                SurveyOption.value == value
+            )).scalar()
+            if code > MAX_OPTION_CODE:
+                raise ValueError(f'Question {position} has more than {MAX_OPTION_CODE} distinct answers')
+        
+        with self._lock:
+            self._codes[(question_set_id, position, value)] = code
+            self._values[(question_set_id, position, code)] = value
+        return code
     
-    if remember_me:
-        session.permanent = True
+    def value_for(self, question_set_id, position, code):
+        if not code:
+            return None
+        key = (question_set_id, position, code)
+        if key not in self._values:
+            self.refresh()
+        return self._values.get(key)
     
-    return jsonify({
-        'success': True,
-        'message': 'Login successful',
-        'user': user.to_dict()
-    }), 200
+    def decode(self, question_set_id, packed, width=None):
+        """{'question_1': value, ...} for every question in the set (or width)"""
+        width = width or self.question_count(question_set_id) or len(packed or b'')
+        packed = packed or b''
+        return {
+            f'question_{position}': self.value_for(question_set_id, position, packed[position - 1])
+            if position <= len(packed) else None
+            for position in range(1, width + 1)
+        }
 
 
-@app.route('/api/logout', methods=['POST'])
-def logout():
-    """Logout user"""
-    session.clear()
-    return jsonify({'success': True, 'message': 'Logged out successfully'}), 200
+def get_codebook():
+    return current_app.extensions['survey_codebook']
 
 
-@app.route('/api/dashboard-data')
-def get_dashboard_data():
-    """Get dashboard data for logged-in user"""
-    user_id = session.get('user_id')
-    
-    if not user_id:
-        # Return default data if not logged in
-        return jsonify({
-            'success': True,
-            'user': None,
-            'stats': {
-                'skill_readiness': 87,
-                'verified_skills': 12,
-                'total_xp': 2450,
-                'certifications': 5
-            },
-            'challenges': [c.to_dict() for c in Challenge.query.all()]
-        }), 200
+def survey_answer_stats(question_set_id):
+    """Per-question answer counts, grouped on the packed byte in SQL"""
+    codebook = get_codebook()
+    table = SurveyResponse.__table__
+    stats = {}
     
-    user = User.query.get(user_id)
-    profile = UserProfile.query.filter_by(user_id=user_id).first()
-    challenges = Challenge.query.all()
-    
-    return jsonify({
-        'success': True,
-        'user': user.to_dict(),
-        'stats': profile.to_dict() if profile else {},
-        'challenges': [c.to_dict() for c in challenges]
-    }), 200
+    for position in range(1, (codebook.question_count(question_set_id) or 0) + 1):
+        code = db.func.substr(table.c.answers, position, 1).label('code')
+        counts = stats[f'question_{position}'] = {}
+        for user_db in user_sessions():
+            rows = user_db.execute(
+                db.select(code, db.func.count()).where(table.c.question_set_id == question_set_id).group_by(code)
+            ).all()
+            for packed, count in rows:
+                value = codebook.value_for(question_set_id, position, packed[0] if packed else 0) or 'unanswered'
+                counts[value] = counts.get(value, 0) + count
+    return stats
 
 
-@app.route('/api/submit-survey', methods=['POST'])
-def submit_survey():
-    """Submit career test survey"""
-    user_id = session.get('user_id')
-    
-    if not user_id:
-        return jsonify({'success': False, 'message': 'Please log in to submit survey'}), 401
+# ============= ADMISSION CONTROL =============
+
+class TokenBucketLimiter:
+    """In-memory token buckets keyed by client (IP address, account, ...)"""
     
-    data = request.get_json()
+    def __init__(self, name, tokens, per_seconds, max_keys=50000):
+        self.name = name
+        self.capacity = float(tokens)
+        self.refill_rate = tokens / float(per_seconds)
+        self.max_keys = max_keys
+        self.rejected = 0
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
     
-    survey = SurveyResponse(
-        user_id=user_id,
-        question_1=data.get('1'),
-        question_2=data.get('2'),
-        question_3=data.get('3'),
-        question_4=data.get('4'),
-        question_5=data.get('5')
-    )
-    db.session.add(survey)
-    db.session.commit()
+    def acquire(self, key):
+        """Take one token for key; returns 0 if allowed, else seconds to wait"""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated) * self.refill_rate)
+            
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0
+            else:
+                wait = (1 - tokens) / self.refill_rate
+                self.rejected += 1
+            
+            # Re-insert as most recently used and evict the idlest clients
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return wait
     
-    return jsonify({
-        'success': True,
-        'message': 'Survey submitted successfully',
-        'survey': survey.to_dict()
-    }), 201
+    def stats(self):
+        with self._lock:
+            return {'tracked_keys': len(self._buckets), 'rejected': self.rejected}
 
 
-@app.route('/api/update-profile', methods=['PUT'])
-def update_profile():
-    """Update user profile stats"""
-    user_id = session.get('user_id')
-    
-    if not user_id:
-        return jsonify({'success': False, 'message': 'Not authenticated'}), 401
-    
-    data = request.get_json()
-    profile = UserProfile.query.filter_by(user_id=user_id).first()
+class ConcurrencyLimiter:
+    """Bounded number of in-flight requests with a short, bounded wait queue"""
     
-    if not profile:
-        profile = UserProfile(user_id=user_id)
-        db.session.add(profile)
+    def __init__(self, name, limit, max_queue, queue_timeout):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+        self._slots = threading.BoundedSemaphore(limit)
+        self._lock = threading.Lock()
     
-    if 'skill_readiness' in data:
-        profile.skill_readiness = data['skill_readiness']
-    if 'verified_skills' in data:
-        profile.verified_skills = data['verified_skills']
-    if 'total_xp' in data:
-        profile.total_xp = data['total_xp']
-    if 'certifications' in data:
-        profile.certifications = data['certifications']
+    def acquire(self):
+        if self._slots.acquire(blocking=False):
+            with self._lock:
+                self.active += 1
+            return True
+        
+        with self._lock:
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                return False
+            self.waiting += 1
+        
+        acquired = self._slots.acquire(timeout=self.queue_timeout)
+        
+        with self._lock:
+            self.waiting -= 1
+            if acquired:
+                self.active += 1
+            else:
+                self.rejected += 1
+        return acquired
     
-    db.session.commit()
+    def release(self):
+        with self._lock:
+            self.active -= 1
+        self._slots.release()
     
-    return jsonify({
-        'success': True,
-        'message': 'Profile updated successfully',
-        'profile': profile.to_dict()
-    }), 200
+    def stats(self):
+        with self._lock:
+            return {
+                'limit': self.limit,
+                'active': self.active,
+                'queue_depth': self.waiting,
+                'max_queue': self.max_queue,
+                'rejected': self.rejected
+            }
 
 
-# ============= ADMIN ROUTES =============
+def init_admission_control(app):
+    """Build this app's limiters from its config (state is per worker process)"""
+    config = app.config
+    app.extensions['admission'] = {
+        'auth': ConcurrencyLimiter(
+            'auth', config['AUTH_CONCURRENCY'], config['AUTH_QUEUE_DEPTH'], config['ADMISSION_QUEUE_TIMEOUT']),
+        'admin': ConcurrencyLimiter(
+            'admin', config['ADMIN_CONCURRENCY'], config['ADMIN_QUEUE_DEPTH'], config['ADMISSION_QUEUE_TIMEOUT']),
+        'export': ConcurrencyLimiter(
+            'export', config['EXPORT_CONCURRENCY'], 0, config['ADMISSION_QUEUE_TIMEOUT']),
+        'login_ip': TokenBucketLimiter('login_ip', *config['LOGIN_RATE_PER_IP']),
+        'login_account': TokenBucketLimiter('login_account', *config['LOGIN_RATE_PER_ACCOUNT'])
+    }
 
-@app.route('/admin')
-def admin_dashboard():
-    """Admin dashboard HTML page"""
-    return '''
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Admin Dashboard - SkillVerify</title>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
 
-        body {
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', 'Roboto', sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-            padding: 40px 20px;
-        }
+def get_limiter(name):
+    return current_app.extensions['admission'][name]
 
-        .container {
-            max-width: 1400px;
-            margin: 0 auto;
-        }
 
-        .header {
-            background: white;
-            padding: 30px;
-            border-radius: 20px;
-            margin-bottom: 30px;
-            box-shadow: 0 10px 40px rgba(0, 0, 0, 0.1);
-        }
+def rejection_response(status, message, retry_after):
+    """Fast 429/503 with a Retry-After header"""
+    response = jsonify({'success': False, 'message': message})
+    response.status_code = status
+    response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
 
-        .header h1 {
-            font-size: 32px;
-            color: #1a1a1a;
-            margin-bottom: 10px;
-        }
 
-        .header p {
-            color: #666;
-            font-size: 16px;
-        }
+def admission_controlled(name):
+    """Decorator: shed load with a 503 once the route's slots and queue are full"""
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            limiter = get_limiter(name)
+            if not limiter.acquire():
+                return rejection_response(503, 'Server busy, please retry shortly', limiter.queue_timeout)
+            try:
+                response = current_app.make_response(view(*args, **kwargs))
+            except Exception:
+                limiter.release()
+                raise
+            
+            # Streamed bodies keep the slot until the last chunk has been sent
+            if response.is_streamed:
+                response.call_on_close(limiter.release)
+            else:
+                limiter.release()
+            return response
+        return wrapped
+    return decorator
 
-        .stats-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 20px;
-            margin-bottom: 30px;
-        }
 
-        .stat-box {
-            background: white;
-            padding: 25px;
-            border-radius: 16px;
-            box-shadow: 0 5px 20px rgba(0, 0, 0, 0.1);
-            text-align: center;
-            transition: transform 0.3s ease;
-        }
+# ============= SERIALIZATION =============
 
-        .stat-box:hover {
-            transform: translateY(-5px);
-        }
+def json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
 
-        .stat-number {
-            font-size: 36px;
-            font-weight: 700;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            -webkit-background-clip: text;
-            -webkit-text-fill-color: transparent;
-            margin-bottom: 8px;
-        }
 
-        .stat-label {
-            color: #666;
-            font-size: 14px;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }
+def dumps(obj):
+    """Encode straight to bytes, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, default=json_default, separators=(',', ':')).encode()
 
-        .tabs {
-            display: flex;
-            gap: 10px;
-            margin-bottom: 20px;
-            flex-wrap: wrap;
-        }
 
-        .tab {
-            padding: 12px 24px;
-            background: white;
-            border: none;
-            border-radius: 10px;
-            font-weight: 600;
-            cursor: pointer;
-            transition: all 0.3s ease;
-            color: #666;
-        }
+def json_response(payload, status=200):
+    return Response(dumps(payload), status=status, mimetype='application/json')
 
-        .tab.active {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            box-shadow: 0 5px 20px rgba(102, 126, 234, 0.4);
-        }
 
-        .tab:hover:not(.active) {
-            background: #f0f0f0;
-        }
+def inline_json(payload):
+    """JSON safe to place inside a <script> element of an HTML page"""
+    text = dumps(payload).decode()
+    for char, escaped in (('<', '\\u003c'), ('>', '\\u003e'), ('&', '\\u0026'),
+                          ('\u2028', '\\u2028'), ('\u2029', '\\u2029')):
+        text = text.replace(char, escaped)
+    return Markup(text)
 
-        .content-box {
-            background: white;
-            padding: 30px;
-            border-radius: 20px;
-            box-shadow: 0 10px 40px rgba(0, 0, 0, 0.1);
-            overflow-x: auto;
-        }
 
-        .tab-content {
-            display: none;
-        }
+def select_dicts(stmt, session=None):
+    """Run a column select and return plain dicts, skipping ORM hydration"""
+    result = (session or db.session).execute(stmt)
+    # Schema-qualified tables label columns with quoted_name, which orjson won't take as a key
+    keys = [str(key) for key in result.keys()]
+    return [dict(zip(keys, row)) for row in result]
 
-        .tab-content.active {
-            display: block;
-        }
 
-        table {
-            width: 100%;
-            border-collapse: collapse;
-            margin-top: 20px;
-            min-width: 800px;
-        }
+def stream_json_list(key, columns, batches, shape=None):
+    """Stream {"success": true, "<key>": [...]} encoding one cursor batch at a time"""
+    def generate():
+        yield b'{"success":true,"' + key.encode() + b'":['
+        first = True
+        for batch in batches:
+            rows = [dict(zip(columns, row)) for row in batch]
+            if shape is not None:
+                rows = [shape(row) for row in rows]
+            chunk = dumps(rows)[1:-1]
+            if not chunk:
+                continue
+            if not first:
+                yield b','
+            yield chunk
+            first = False
+        yield b']}'
+    
+    return Response(stream_with_context(generate()), mimetype='application/json')
 
-        thead {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-        }
 
-        th, td {
-            padding: 15px;
-            text-align: left;
-            border-bottom: 1px solid #eee;
-        }
+def challenge_select():
+    return db.select(
+        Challenge.id, Challenge.title, Challenge.company, Challenge.domain,
+        Challenge.difficulty, Challenge.deadline, Challenge.status
+    ).order_by(Challenge.id)
 
-        th {
-            font-weight: 600;
-            text-transform: uppercase;
-            font-size: 12px;
-            letter-spacing: 1px;
-        }
 
-        tbody tr {
-            transition: background 0.3s ease;
-        }
+CHALLENGE_FILTERS = ('domain', 'difficulty', 'company', 'status')
+CHALLENGE_SORTS = {
+    'id': (Challenge.id,),
+    'title': (Challenge.title, Challenge.id),
+    'deadline': (Challenge.deadline, Challenge.id)
+}
 
-        tbody tr:hover {
-            background: #f8f9ff;
-        }
 
-        .badge {
-            display: inline-block;
-            padding: 4px 12px;
-            border-radius: 20px;
-            font-size: 12px;
-            font-weight: 600;
-        }
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(dumps(values)).decode().rstrip('=')
 
-        .badge-success {
-            background: #d4f4dd;
-            color: #22863a;
-        }
 
-        .badge-info {
-            background: #d1ecf1;
-            color: #0c5460;
-        }
+def decode_cursor(cursor):
+    padded = cursor + '=' * (-len(cursor) % 4)
+    try:
+        return json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError:
+        raise ValueError('Invalid cursor')
 
-        .badge-warning {
-            background: #fff3cd;
-            color: #856404;
-        }
 
-        .btn {
-            padding: 8px 16px;
-            border: none;
-            border-radius: 8px;
-            cursor: pointer;
-            font-weight: 600;
-            transition: all 0.3s ease;
-            margin-right: 5px;
-            font-size: 13px;
-        }
+def decode_challenge_cursor(cursor, sort):
+    """The [sort value, id] (or [id]) a cursor resumes after, checked against the sort's column types"""
+    after = decode_cursor(cursor)
+    if not isinstance(after, list) or len(after) != len(CHALLENGE_SORTS[sort]):
+        raise ValueError('Invalid cursor')
+    *value, last_id = after
+    if type(last_id) is not int:
+        raise ValueError('Invalid cursor')
+    if sort == 'title' and not isinstance(value[0], str):
+        raise ValueError('Invalid cursor')
+    if sort == 'deadline':
+        try:
+            value[0] = datetime.fromisoformat(value[0])
+        except (TypeError, ValueError):
+            raise ValueError('Invalid cursor')
+    return [*value, last_id]
 
-        .btn-primary {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-        }
 
-        .btn-primary:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 5px 15px rgba(102, 126, 234, 0.4);
-        }
+def challenge_page(filters=None, sort='id', descending=False, cursor=None, limit=None,
+                   deadline_after=None, deadline_before=None, hide_expired=False):
+    """One keyset page of the catalog; returns (rows, next_cursor)"""
+    if sort not in CHALLENGE_SORTS:
+        raise ValueError(f'sort must be one of {", ".join(CHALLENGE_SORTS)}')
+    limit = limit or current_app.config['CHALLENGE_PAGE_SIZE']
+    
+    # (sort column, id) keeps the order total, so pages never skip or repeat rows
+    keys = CHALLENGE_SORTS[sort]
+    stmt = challenge_select().order_by(None)
+    for field, value in (filters or {}).items():
+        stmt = stmt.where(getattr(Challenge, field) == value)
+    
+    # Deadline bounds are range scans on ix_challenge_deadline_id (or a filter's _deadline_id index)
+    if sort == 'deadline':
+        stmt = stmt.where(Challenge.deadline.is_not(None))
+    if deadline_after is not None:
+        stmt = stmt.where(Challenge.deadline >= deadline_after)
+    if deadline_before is not None:
+        stmt = stmt.where(Challenge.deadline < deadline_before)
+    if hide_expired:
+        stmt = stmt.where(db.or_(Challenge.deadline.is_(None), Challenge.deadline >= datetime.utcnow()))
+    
+    if cursor is not None:
+        after = decode_challenge_cursor(cursor, sort)
+        position = db.tuple_(*keys)
+        stmt = stmt.where(position < db.tuple_(*after) if descending else position > db.tuple_(*after))
+    
+    stmt = stmt.order_by(*(key.desc() if descending else key for key in keys)).limit(limit + 1)
+    rows = select_dicts(stmt)
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1][key.key] for key in keys])
+    return rows, next_cursor
 
-        .btn-danger {
-            background: #ef4444;
-            color: white;
-        }
 
-        .btn-danger:hover {
-            background: #dc2626;
-        }
+def keyset_rows(stmt, key, after=None, limit=100, session=None):
+    """Up to limit rows past the unique key value `after`; returns (rows, more)"""
+    if after is not None:
+        stmt = stmt.where(key > after)
+    rows = select_dicts(stmt.order_by(None).order_by(key).limit(limit + 1), session)
+    return rows[:limit], len(rows) > limit
 
-        .search-box {
-            width: 100%;
-            padding: 12px 20px;
-            border: 2px solid #e0e0e0;
-            border-radius: 10px;
-            font-size: 15px;
-            margin-bottom: 20px;
-            transition: border-color 0.3s ease;
-        }
 
-        .search-box:focus {
-            outline: none;
-            border-color: #667eea;
-        }
+def admin_page_request():
+    """(cursor, limit) when the client asked for a page; None means stream everything"""
+    if 'limit' not in request.args and 'cursor' not in request.args:
+        return None
+    limit = min(int(request.args.get('limit', current_app.config['ADMIN_PAGE_SIZE'])),
+                current_app.config['ADMIN_MAX_PAGE_SIZE'])
+    if limit < 1:
+        raise ValueError('limit must be positive')
+    return request.args.get('cursor'), limit
 
-        .empty-state {
-            text-align: center;
-            padding: 60px 20px;
-            color: #999;
-        }
 
-        .loading {
-            text-align: center;
-            padding: 40px;
-        }
+def next_challenge_deadline():
+    """Earliest deadline still in the future (an index seek)"""
+    return db.session.execute(
+        db.select(db.func.min(Challenge.deadline)).where(Challenge.deadline > datetime.utcnow())
+    ).scalar()
 
-        .spinner {
-            border: 4px solid #f3f3f3;
-            border-top: 4px solid #667eea;
-            border-radius: 50%;
-            width: 40px;
-            height: 40px;
-            animation: spin 1s linear infinite;
-            margin: 0 auto;
-        }
 
-        @keyframes spin {
-            0% { transform: rotate(0deg); }
-            100% { transform: rotate(360deg); }
-        }
+class ChallengeListCache:
+    """Per-worker cache of challenge lists that expires when the next deadline passes"""
+    
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+    
+    def get_or_load(self, key, loader):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+        
+        value = loader()
+        expires_at = now + self.ttl
+        deadline = next_challenge_deadline()
+        if deadline is not None:
+            expires_at = min(expires_at, now + (deadline - datetime.utcnow()).total_seconds())
+        
+        with self._lock:
+            # Drop entries whose deadline or version has passed them by
+            self._entries = {k: e for k, e in self._entries.items() if e[0] > now}
+            self._entries[key] = (expires_at, value)
+        return value
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
 
-        .refresh-btn {
-            position: fixed;
-            bottom: 30px;
-            right: 30px;
-            width: 60px;
-            height: 60px;
-            border-radius: 50%;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            border: none;
-            font-size: 24px;
-            cursor: pointer;
-            box-shadow: 0 10px 30px rgba(102, 126, 234, 0.4);
-            transition: all 0.3s ease;
-        }
 
-        .refresh-btn:hover {
-            transform: scale(1.1) rotate(90deg);
+def cached_challenges(key, loader):
+    # Any committed challenge write (from any worker) moves to a fresh cache key
+    version = table_versions().get('challenge', 0)
+    return current_app.extensions['challenge_cache'].get_or_load((version, key), loader)
+
+
+# ============= CONDITIONAL GET =============
+
+CODEBOOK_TABLES = ('survey_option', 'survey_question_set')
+VERSIONED_TABLES = ('user', 'user_profile', 'survey_response', 'challenge', *CODEBOOK_TABLES)
+
+
+def ensure_version_triggers(engine=None, tables=VERSIONED_TABLES):
+    """Keep table_version in step with every insert/update/delete, from any process"""
+    with (engine or db.engine).begin() as conn:
+        for table in tables:
+            conn.execute(db.text(
+                'INSERT OR IGNORE INTO table_version (table_name, version) VALUES (:table, 0)'
+            ), {'table': table})
+            for operation in ('INSERT', 'UPDATE', 'DELETE'):
+                conn.execute(db.text(
+                    f'CREATE TRIGGER IF NOT EXISTS bump_{table}_{operation.lower()} '
+                    f'AFTER {operation} ON "{table}" BEGIN '
+                    f"UPDATE table_version SET version = version + 1 WHERE table_name = '{table}'; END"
+                ))
+
+
+def table_versions():
+    versions = dict(db.session.execute(db.select(TableVersion.table_name, TableVersion.version)).all())
+    if get_user_shards().count:
+        # Sharded tables count their writes in each shard's own table_version
+        versions.update(dict.fromkeys(SHARDED_TABLE_NAMES, 0))
+        for shard_session in user_sessions():
+            for table, version in shard_session.execute(
+                    db.select(TableVersion.table_name, TableVersion.version)
+                    .where(TableVersion.table_name.in_(SHARDED_TABLE_NAMES))):
+                versions[table] += version
+    return versions
+
+
+def compute_etag(tables, *extra):
+    """Strong ETag from the route, query string, table versions and session user"""
+    versions = table_versions()
+    parts = [request.full_path, str(session.get('user_id')), f'shards:{get_user_shards().generation}']
+    parts += [f'{table}:{versions.get(table, 0)}' for table in tables]
+    parts += [str(value) for value in extra]
+    return hashlib.sha1('|'.join(parts).encode()).hexdigest()
+
+
+def conditional_get(*tables, extra=None):
+    """Decorator: answer If-None-Match with a 304 before the view queries anything"""
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            etag = compute_etag(tables, *(extra() if extra else ()))
+            
+            if request.if_none_match.contains(etag):
+                response = Response(status=304)
+            else:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return wrapped
+    return decorator
+
+
+# ============= USER SHARDS =============
+
+# Per-user tables; with a recorded layout they live on shard files, keyed by user id
+SHARDED_TABLES = (User.__table__, UserProfile.__table__, SurveyResponse.__table__)
+SHARDED_TABLE_NAMES = tuple(table.name for table in SHARDED_TABLES)
+# Kept beside each user's profile, but outside table_version: they only change with user_profile
+XP_HISTORY_TABLES = (XpEvent.__table__, XpRollup.__table__)
+
+
+def create_shard_engine(path, archive_path):
+    engine = create_engine(f'sqlite:///{path}')
+    # Shards archive into the same cold database as the primary
+    event.listen(engine, 'connect', partial(attach_archive, archive_path))
+    event.listen(engine, 'connect', use_wal)
+    return engine
+
+
+class UserShards:
+    """Per-worker router from user id to shard file (user id % shard count).
+    
+    The layout is read from the primary database once per process; without one,
+    everything stays in the primary and the helpers below use db.session.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+        self.count = 0
+        self.generation = 0
+        self.survey_id_floor = 0
+        self.engines = []
+        self._loaded = False
+        self._lock = threading.Lock()
+    
+    def load(self):
+        if self._loaded:
+            return self
+        with self._lock:
+            if not self._loaded:
+                layout = db.session.get(UserShardLayout, 1)
+                if layout is not None:
+                    self.count = layout.shards
+                    self.generation = layout.generation
+                    self.survey_id_floor = layout.survey_id_floor
+                    self.engines = [self.create_engine(shard) for shard in range(layout.shards)]
+                self._loaded = True
+        return self
+    
+    def reset(self):
+        """Forget the loaded layout (after resharding in this process)"""
+        with self._lock:
+            self.dispose()
+            self.count = self.generation = self.survey_id_floor = 0
+            self.engines = []
+            self._loaded = False
+    
+    def path(self, generation, shard):
+        name = self.app.config['USER_SHARD_DATABASE'].format(generation=generation, shard=shard)
+        return os.path.join(self.app.instance_path, name)
+    
+    def create_engine(self, shard, generation=None):
+        archive_path = os.path.join(self.app.instance_path, self.app.config['ARCHIVE_DATABASE'])
+        return create_shard_engine(self.path(generation or self.generation, shard), archive_path)
+    
+    def shard_of(self, user_id):
+        return user_id % self.count if self.count else 0
+    
+    def session(self, shard):
+        """This app context's session on one shard (or its replica), closed at teardown"""
+        if not self.count:
+            return db.session
+        replica = g.get('read_replica')
+        key = (replica.id, shard) if replica is not None else shard
+        sessions = g.setdefault('user_shard_sessions', {})
+        if key not in sessions:
+            sessions[key] = Session(replica.shard_engines[shard] if replica is not None else self.engines[shard])
+        return sessions[key]
+    
+    def next_survey_id(self, shard):
+        """SQL for a new survey id on a shard; ids are congruent to the shard number,
+        so shards never hand out the same id"""
+        if not self.count:
+            return None
+        table = SurveyResponse.__table__
+        highest = db.func.max(db.func.coalesce(db.func.max(table.c.id), 0), self.survey_id_floor)
+        return db.select((highest // self.count + 1) * self.count + shard).scalar_subquery()
+    
+    def dispose(self, close=True):
+        for engine in self.engines:
+            engine.dispose(close=close)
+
+
+def get_user_shards():
+    return current_app.extensions['user_shards'].load()
+
+
+def close_user_shard_sessions(exc=None):
+    for shard_session in g.pop('user_shard_sessions', {}).values():
+        shard_session.close()
+
+
+def user_session(user_id):
+    """Session holding one user's rows"""
+    shards = get_user_shards()
+    return shards.session(shards.shard_of(user_id))
+
+
+def user_sessions():
+    """One session per shard, indexed by shard number (just db.session when unsharded)"""
+    shards = get_user_shards()
+    return [shards.session(shard) for shard in range(max(shards.count, 1))]
+
+
+def user_engines():
+    shards = get_user_shards()
+    replica = g.get('read_replica')
+    if replica is not None:
+        return replica.shard_engines if shards.count else [replica.engine]
+    return shards.engines if shards.count else [db.engine]
+
+
+def read_engine():
+    """Engine for reads from the primary database, or its replica where routed there"""
+    replica = g.get('read_replica')
+    return replica.engine if replica is not None else db.engine
+
+
+def on_shard(stmt, user_id_column, shard):
+    """Restrict a statement over a shared table (the archive) to one shard's users"""
+    count = get_user_shards().count
+    return stmt.where(user_id_column % count == shard) if count else stmt
+
+
+def group_by_shard(user_ids):
+    shards = get_user_shards()
+    groups = {}
+    for user_id in user_ids:
+        groups.setdefault(shards.shard_of(user_id), []).append(user_id)
+    return groups
+
+
+def find_user(email):
+    email = normalize_email(email)
+    if not get_user_shards().count:
+        return User.query.filter_by(email_normalized=email).first()
+    user_id = db.session.execute(db.select(UserDirectory.id).where(UserDirectory.email == email)).scalar()
+    return None if user_id is None else user_session(user_id).get(User, user_id)
+
+
+def existing_emails(emails, chunk_size=500):
+    """The normalized forms of `emails` that already belong to an account"""
+    column = UserDirectory.email if get_user_shards().count else User.email_normalized
+    wanted = sorted({normalize_email(email) for email in emails})
+    found = set()
+    for start in range(0, len(wanted), chunk_size):
+        chunk = wanted[start:start + chunk_size]
+        found.update(db.session.execute(db.select(column).where(column.in_(chunk))).scalars())
+    return found
+
+
+def allocate_user_id(email):
+    """Reserve a global user id in the directory; None (unsharded) lets SQLite pick"""
+    if not get_user_shards().count:
+        return None
+    
+    def allocate(session):
+        entry = UserDirectory(email=normalize_email(email))
+        session.add(entry)
+        session.flush()
+        return entry.id
+    return run_write(allocate)
+
+
+def allocate_user_ids(emails):
+    """allocate_user_id for many emails in one write: {normalized email: id}, leaving out
+    addresses that were registered meanwhile"""
+    emails = [normalize_email(email) for email in emails]
+    if not get_user_shards().count:
+        return dict.fromkeys(emails)
+    
+    def allocate(session):
+        user_ids = {}
+        for email in emails:
+            entry = UserDirectory(email=email)
+            try:
+                with session.begin_nested():
+                    session.add(entry)
+            except IntegrityError:
+                continue
+            user_ids[email] = entry.id
+        return user_ids
+    return run_write(allocate)
+
+
+def release_user_ids(user_ids):
+    if get_user_shards().count and user_ids:
+        directory = UserDirectory.__table__
+        run_write(lambda session: session.execute(directory.delete().where(directory.c.id.in_(list(user_ids)))))
+
+
+def scatter_keyset(build, key, after=None, limit=100):
+    """keyset_rows on every shard, merged on key; build(shard) returns the statement"""
+    rows, more = [], False
+    for shard, shard_session in enumerate(user_sessions()):
+        batch, shard_more = keyset_rows(build(shard), key, after, limit, shard_session)
+        rows += batch
+        more = more or shard_more
+    rows.sort(key=itemgetter(key.key))
+    return rows[:limit], more or len(rows) > limit
+
+
+def iter_user_batches(build, batch_size):
+    """Streamed batches from every shard, merged into one stream ordered on the first column"""
+    engines = user_engines()
+    if len(engines) == 1:
+        yield from iter_export_batches(build(0), batch_size)
+        return
+    
+    rows = heapq.merge(*(
+        itertools.chain.from_iterable(iter_export_batches(build(shard), batch_size, engine))
+        for shard, engine in enumerate(engines)
+    ), key=itemgetter(0))
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def create_shard_schema(engine):
+    db.metadata.create_all(engine, tables=[*SHARDED_TABLES, *XP_HISTORY_TABLES, TableVersion.__table__])
+
+
+def init_user_shards():
+    """Make sure every shard of the current layout has its tables, indexes and triggers"""
+    for engine in get_user_shards().engines:
+        create_shard_schema(engine)
+        create_missing_indexes(engine, [*SHARDED_TABLES, *XP_HISTORY_TABLES])
+        ensure_version_triggers(engine, SHARDED_TABLE_NAMES)
+        ensure_xp_history(engine)
+
+
+def reshard_users(shards, batch_size=5000, echo=print):
+    """Copy every user's rows into a new generation of shard files, then switch the layout.
+    
+    Writers must be stopped while this runs; workers load the new layout on restart.
+    The previous files (or the primary's user tables) are left in place for rollback.
+    """
+    if shards < 1:
+        raise ValueError('shards must be at least 1')
+    current = get_user_shards()
+    generation = current.generation + 1
+    paths = [current.path(generation, shard) for shard in range(shards)]
+    for path in paths:
+        if os.path.exists(path):
+            raise RuntimeError(f'{path} already exists')
+    
+    ensure_archive()
+    sources = user_engines()
+    survey_id_floor = max(
+        current.survey_id_floor,
+        db.session.execute(db.select(db.func.max(archived_survey_responses.c.id))).scalar() or 0,
+        *(user_db.execute(db.select(db.func.max(SurveyResponse.id))).scalar() or 0 for user_db in user_sessions())
+    )
+    
+    targets = [current.create_engine(shard, generation) for shard in range(shards)]
+    copied = {}
+    with ExitStack() as stack:
+        conns = [stack.enter_context(engine.connect()) for engine in targets]
+        for engine in targets:
+            create_shard_schema(engine)
+        
+        for table, key in ((User.__table__, 'id'), (UserProfile.__table__, 'user_id'),
+                           (SurveyResponse.__table__, 'user_id'), (XpEvent.__table__, 'user_id')):
+            # Profile and XP event ids are local to a shard; user and survey ids are global and kept.
+            # Rows go over in id order so each user's XP events keep their sequence.
+            local_ids = table in (UserProfile.__table__, XpEvent.__table__)
+            columns = [c for c in table.columns if not (local_ids and c.name == 'id')]
+            names = [c.name for c in columns]
+            at = names.index(key)
+            copied[table.name] = 0
+            for source in sources:
+                stmt = db.select(*columns).order_by(table.c.id)
+                for batch in iter_export_batches(stmt, batch_size, source):
+                    routed = {}
+                    for row in batch:
+                        routed.setdefault(row[at] % shards, []).append(dict(zip(names, row)))
+                    for shard, rows in routed.items():
+                        conns[shard].execute(table.insert(), rows)
+                    for conn in conns:
+                        conn.commit()
+                    copied[table.name] += len(batch)
+            echo(f'  {table.name}: {copied[table.name]:,} rows')
+    
+    for engine in targets:
+        ensure_version_triggers(engine, SHARDED_TABLE_NAMES)
+        # Rebuilds the rollups from the copied events, including each shard's everyone rows
+        ensure_xp_history(engine)
+        engine.dispose()
+    
+    if not current.count:
+        # First split: the directory takes over email lookups and id allocation
+        db.session.execute(db.text(
+            'INSERT OR IGNORE INTO user_directory (id, email) SELECT id, email_normalized FROM "user"'
+        ))
+    layout = db.session.get(UserShardLayout, 1) or UserShardLayout(id=1)
+    layout.shards = shards
+    layout.generation = generation
+    layout.survey_id_floor = survey_id_floor
+    layout.created_at = datetime.utcnow()
+    db.session.add(layout)
+    db.session.commit()
+    
+    close_user_shard_sessions()
+    current.reset()
+    return {'shards': shards, 'generation': generation, 'paths': paths, 'copied': copied}
+
+
+@bp.cli.command('reshard')
+@click.option('--shards', type=int, required=True, help='Number of shard files to spread users over')
+@click.option('--batch-size', type=int, default=5000, show_default=True)
+def reshard_command(shards, batch_size):
+    """Move users, profiles and surveys into a new set of shard files (stop writers first)"""
+    init_schema()
+    try:
+        result = reshard_users(shards, batch_size, echo=click.echo)
+    except (ValueError, RuntimeError) as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Generation {result['generation']}: users now live in {result['shards']} shard files")
+    for path in result['paths']:
+        click.echo(f'  {path}')
+    click.echo('Restart the app workers so they pick up the new layout.')
+
+
+# ============= WRITE QUEUE =============
+
+class WriteQueueBusy(Exception):
+    pass
+
+
+class WriteQueue:
+    """One writer thread for one database, committing queued operations in batches.
+    
+    Whatever is queued while a commit is in progress goes into the next transaction, so
+    under load many requests share one commit (and one fsync) and threads in a worker
+    never race each other for SQLite's write lock. Each operation runs in a SAVEPOINT:
+    one that raises (a duplicate email) is rolled back alone and its caller gets the
+    exception, while the rest only see their results once the batch has committed.
+    """
+    
+    def __init__(self, app, engine, name):
+        self.app = app
+        self.engine = engine
+        self.name = name
+        self.batch_size = app.config['WRITE_BATCH_SIZE']
+        self.depth = app.config['WRITE_QUEUE_DEPTH']
+        self.batches = 0
+        self.operations = 0
+        self._queue = None
+        self._pid = None
+        self._lock = threading.Lock()
+    
+    def submit(self, operation):
+        """Queue operation(session); returns a Future for its result"""
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    # A forked worker starts its own thread rather than inherit a dead one
+                    self._queue = queue.Queue(self.depth)
+                    threading.Thread(target=self._loop, args=(self._queue,),
+                                     name=f'writer-{self.name}', daemon=True).start()
+                    self._pid = os.getpid()
+        
+        future = Future()
+        try:
+            self._queue.put_nowait((operation, future))
+        except queue.Full:
+            raise WriteQueueBusy(f'{self.name} write queue is full')
+        return future
+    
+    def _loop(self, pending):
+        # The writer keeps its own connection, so it never waits on a pool that
+        # request threads (themselves waiting on the writer) have drained
+        conn = None
+        while True:
+            batch = [pending.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(pending.get_nowait())
+                except queue.Empty:
+                    break
+            with self.app.app_context():
+                try:
+                    if conn is None or conn.invalidated:
+                        conn = self.engine.connect()
+                    self._commit(conn, batch)
+                except Exception as e:
+                    self.app.logger.exception('Write batch on %s failed', self.name)
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                finally:
+                    db.session.remove()
+    
+    def _commit(self, conn, batch):
+        done = []
+        with Session(bind=conn, expire_on_commit=False) as session:
+            # Take the write lock up front; without an explicit BEGIN the first
+            # SAVEPOINT would open the transaction and its RELEASE would commit it
+            session.connection().exec_driver_sql('BEGIN IMMEDIATE')
+            for operation, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    with session.begin_nested():
+                        done.append((future, operation(session)))
+                except Exception as e:
+                    future.set_exception(e)
+            session.commit()
+        
+        for future, result in done:
+            future.set_result(result)
+        self.batches += 1
+        self.operations += len(batch)
+    
+    def stats(self):
+        return {
+            'queue_depth': self._queue.qsize() if self._queue else 0,
+            'batches': self.batches,
+            'operations': self.operations,
+            'average_batch': round(self.operations / self.batches, 2) if self.batches else 0
         }
 
-        .back-btn {
-            display: inline-block;
-            padding: 10px 20px;
-            background: white;
-            color: #667eea;
-            text-decoration: none;
-            border-radius: 10px;
-            font-weight: 600;
-            margin-bottom: 20px;
-            transition: all 0.3s ease;
+
+class WriteQueues:
+    """Per-app registry of write queues, one per database file"""
+    
+    def __init__(self, app):
+        self.app = app
+        self._queues = {}
+        self._lock = threading.Lock()
+    
+    def get(self, name, engine):
+        with self._lock:
+            if name not in self._queues:
+                self._queues[name] = WriteQueue(self.app, engine, name)
+            return self._queues[name]
+    
+    def stats(self):
+        with self._lock:
+            return {name: write_queue.stats() for name, write_queue in self._queues.items()}
+
+
+def run_write(operation, shard=None):
+    """Run operation(session) on the writer thread of the primary, or of one user shard,
+    and return its result once committed; exceptions it raises come back here.
+    
+    The caller must not hold a write transaction on the same database; its
+    sessions without pending changes are closed while it waits.
+    """
+    shards = get_user_shards()
+    if shard is None or not shards.count:
+        name, engine = 'primary', db.engine
+    else:
+        name, engine = f'users_g{shards.generation}_s{shard}', shards.engines[shard]
+    
+    future = current_app.extensions['write_queues'].get(name, engine).submit(operation)
+    
+    # Hand this request's read connections back to the pool while it waits, or
+    # enough parked requests would starve everyone else of connections. A session
+    # holding unflushed objects keeps them: closing it would silently drop them.
+    for read_session in (db.session, *g.get('user_shard_sessions', {}).values()):
+        if not (read_session.new or read_session.dirty or read_session.deleted):
+            read_session.close()
+    
+    try:
+        try:
+            return future.result(timeout=current_app.config['WRITE_TIMEOUT'])
+        except FutureTimeoutError:
+            if future.cancel():
+                raise WriteQueueBusy(f'{name} writes are backed up')
+            # Already running: it finishes with its batch
+            return future.result()
+    except OperationalError as e:
+        # Another process (a CLI tool, another worker) held the lock past the busy timeout
+        if 'locked' in str(e.orig) or 'busy' in str(e.orig):
+            raise WriteQueueBusy(f'{name} is locked by another writer') from e
+        raise
+
+
+def user_write(user_id, operation):
+    """run_write on the database holding one user's rows"""
+    shards = get_user_shards()
+    return run_write(operation, shards.shard_of(user_id))
+
+
+@bp.errorhandler(WriteQueueBusy)
+def write_queue_busy(e):
+    return rejection_response(503, 'Server busy, please retry', 1)
+
+
+# ============= READ REPLICA =============
+
+def create_replica_engine(path, archive_path):
+    # mode=ro: SQLite itself refuses any write that strays onto the replica
+    engine = create_engine(f'sqlite:///file:{path}?mode=ro&uri=true')
+    event.listen(engine, 'connect', partial(attach_archive, f'file:{archive_path}?mode=ro'))
+    return engine
+
+
+class ReplicaSnapshot:
+    """Read-only engines over one replica directory, laid out like the live databases"""
+    
+    def __init__(self, root, manifest):
+        self.id = manifest['id']
+        self.generation = manifest['generation']
+        self.built_at = datetime.fromisoformat(manifest['built_at'])
+        files = {name: os.path.join(root, filename) for name, filename in manifest['databases'].items()}
+        self.engine = create_replica_engine(files['main'], files['archive'])
+        self.shard_engines = [create_replica_engine(files[f'users_s{shard}'], files['archive'])
+                              for shard in range(manifest['shards'])]
+    
+    def age(self):
+        return (datetime.utcnow() - self.built_at).total_seconds()
+    
+    def dispose(self, close=True):
+        for engine in [self.engine, *self.shard_engines]:
+            engine.dispose(close=close)
+
+
+class ReadReplica:
+    """Per-worker handle on the current replica; reopens it after each refresh"""
+    
+    def __init__(self, app):
+        self.app = app
+        self.max_staleness = app.config['READ_REPLICA_MAX_STALENESS']
+        self.snapshot = None
+        self.reads = 0
+        self.fallbacks = 0
+        self._stamp = None
+        self._lock = threading.Lock()
+    
+    def manifest_path(self):
+        return os.path.join(self.app.instance_path, self.app.config['READ_REPLICA_DIR'], 'current.json')
+    
+    def load(self):
+        """The newest replica, reopened if a refresh has replaced it since the last call"""
+        path = self.manifest_path()
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        stamp = (stat.st_ino, stat.st_mtime_ns)
+        if stamp != self._stamp:
+            with self._lock:
+                if stamp != self._stamp:
+                    with open(path) as f:
+                        manifest = json.load(f)
+                    previous = self.snapshot
+                    self.snapshot = ReplicaSnapshot(os.path.join(os.path.dirname(path), manifest['id']), manifest)
+                    self._stamp = stamp
+                    if previous is not None:
+                        # Requests still reading it keep their connections until they finish
+                        previous.dispose()
+        return self.snapshot
+    
+    def current(self):
+        """The replica to read from; None while it is off, missing, too stale or
+        from before a reshard, and the reads go to the primary instead"""
+        if not self.max_staleness:
+            return None
+        snapshot = self.load()
+        if (snapshot is None or snapshot.age() > self.max_staleness
+                or snapshot.generation != get_user_shards().generation):
+            self.fallbacks += 1
+            return None
+        self.reads += 1
+        return snapshot
+    
+    def dispose(self, close=True):
+        if self.snapshot is not None:
+            self.snapshot.dispose(close=close)
+    
+    def stats(self):
+        snapshot = self.snapshot
+        return {
+            'max_staleness': self.max_staleness,
+            'id': snapshot.id if snapshot else None,
+            'age_seconds': round(snapshot.age(), 1) if snapshot else None,
+            'reads': self.reads,
+            'fallbacks': self.fallbacks
         }
 
-        .back-btn:hover {
-            background: #f0f0f0;
-            transform: translateX(-5px);
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <a href="/" class="back-btn">← Back to Dashboard</a>
+
+def replica_reads(view):
+    """Decorator: serve an admin read from the replica while it is fresh enough.
+    
+    The whole request is routed, streamed body included, so only use it on views
+    that never write.
+    """
+    @wraps(view)
+    def wrapped(*args, **kwargs):
+        g.read_replica = current_app.extensions['read_replica'].current()
+        return view(*args, **kwargs)
+    return wrapped
+
+
+@contextmanager
+def using_replica():
+    """Route this app context's reads to the replica for the duration of a block"""
+    previous = g.get('read_replica')
+    g.read_replica = current_app.extensions['read_replica'].current()
+    try:
+        yield g.read_replica
+    finally:
+        g.read_replica = previous
+
+
+# ============= MAIN ROUTES =============
+
+@bp.route('/')
+def index():
+    """Main dashboard page, with the dashboard payload inlined so first paint needs no API call"""
+    return render_template('dashboard.html', bootstrap_json=inline_json(dashboard_payload()))
+
+
+@bp.route('/register-page')
+def register_page():
+    """Simple registration page"""
+    return '''
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>Register - SkillVerify</title>
+        <style>
+            * { margin: 0; padding: 0; box-sizing: border-box; }
+            body {
+                font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', 'Roboto', sans-serif;
+                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                min-height: 100vh;
+                display: flex;
+                align-items: center;
+                justify-content: center;
+                padding: 20px;
+            }
+            .container {
+                background: white;
+                padding: 50px;
+                border-radius: 24px;
+                box-shadow: 0 20px 60px rgba(0, 0, 0, 0.3);
+                max-width: 450px;
+                width: 100%;
+            }
+            h1 {
+                font-size: 32px;
+                margin-bottom: 10px;
+                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                -webkit-background-clip: text;
+                -webkit-text-fill-color: transparent;
+            }
+            p { color: #666; margin-bottom: 30px; }
+            .form-group { margin-bottom: 20px; }
+            label {
+                display: block;
+                color: #333;
+                font-weight: 600;
+                margin-bottom: 8px;
+                font-size: 14px;
+            }
+            input {
+                width: 100%;
+                padding: 14px;
+                border: 2px solid #e0e0e0;
+                border-radius: 12px;
+                font-size: 15px;
+                transition: all 0.3s ease;
+            }
+            input:focus {
+                outline: none;
+                border-color: #667eea;
+                box-shadow: 0 0 0 3px rgba(102, 126, 234, 0.1);
+            }
+            button {
+                width: 100%;
+                padding: 16px;
+                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                color: white;
+                border: none;
+                border-radius: 12px;
+                font-size: 16px;
+                font-weight: 600;
+                cursor: pointer;
+                transition: all 0.3s ease;
+                margin-top: 10px;
+            }
+            button:hover {
+                transform: translateY(-2px);
+                box-shadow: 0 10px 30px rgba(102, 126, 234, 0.4);
+            }
+            .link {
+                text-align: center;
+                margin-top: 20px;
+                color: #666;
+            }
+            .link a {
+                color: #667eea;
+                text-decoration: none;
+                font-weight: 600;
+            }
+            .message {
+                padding: 12px;
+                border-radius: 8px;
+                margin-bottom: 20px;
+                display: none;
+            }
+            .success {
+                background: #d4f4dd;
+                color: #22863a;
+                display: block;
+            }
+            .error {
+                background: #f8d7da;
+                color: #721c24;
+                display: block;
+            }
+        </style>
+    </head>
+    <body>
+        <div class="container">
+            <h1>Create Account</h1>
+            <p>Join SkillVerify to start your journey</p>
+            
+            <div id="message" class="message"></div>
+            
+            <form id="registerForm">
+                <div class="form-group">
+                    <label>Full Name</label>
+                    <input type="text" id="name" placeholder="Enter your name" required>
+                </div>
+                <div class="form-group">
+                    <label>Email Address</label>
+                    <input type="email" id="email" placeholder="Enter your email" required>
+                </div>
+                <div class="form-group">
+                    <label>Password</label>
+                    <input type="password" id="password" placeholder="Create a password" required>
+                </div>
+                <button type="submit" id="submitBtn">Create Account</button>
+            </form>
+            
+            <div class="link">
+                Already have an account? <a href="/">Sign In</a>
+            </div>
+        </div>
+
+        <script>
+            document.getElementById('registerForm').addEventListener('submit', async (e) => {
+                e.preventDefault();
+                
+                const submitBtn = document.getElementById('submitBtn');
+                const message = document.getElementById('message');
+                
+                submitBtn.textContent = 'Creating Account...';
+                submitBtn.disabled = true;
+                
+                try {
+                    const response = await fetch('/api/register', {
+                        method: 'POST',
+                        headers: {'Content-Type': 'application/json'},
+                        body: JSON.stringify({
+                            name: document.getElementById('name').value,
+                            email: document.getElementById('email').value,
+                            password: document.getElementById('password').value
+                        })
+                    });
+                    
+                    const data = await response.json();
+                    
+                    if (data.success) {
+                        message.className = 'message success';
+                        message.textContent = 'Account created successfully! Redirecting...';
+                        setTimeout(() => window.location.href = '/', 2000);
+                    } else {
+                        message.className = 'message error';
+                        message.textContent = data.message;
+                        submitBtn.textContent = 'Create Account';
+                        submitBtn.disabled = false;
+                    }
+                } catch (error) {
+                    message.className = 'message error';
+                    message.textContent = 'An error occurred. Please try again.';
+                    submitBtn.textContent = 'Create Account';
+                    submitBtn.disabled = false;
+                }
+            });
+        </script>
+    </body>
+    </html>
+    '''
+
+
+# ============= API ROUTES =============
+
+@bp.route('/api/register', methods=['POST'])
+@admission_controlled('auth')
+def register():
+    """Register a new user"""
+    data = request.get_json()
+    
+    email = data.get('email')
+    password = data.get('password')
+    name = data.get('name', '')
+    
+    if not email or not password:
+        return jsonify({'success': False, 'message': 'Email and password are required'}), 400
+    if not isinstance(email, str) or not isinstance(password, str):
+        return jsonify({'success': False, 'message': 'Email and password must be strings'}), 400
+    
+    if find_user(email):
+        return jsonify({'success': False, 'message': 'Email already registered'}), 400
+    
+    # Hash here, not on the writer thread that every request's write waits for
+    password_hash = generate_password_hash(password)
+    
+    # The unique indexes settle a race between two registrations of the same address
+    try:
+        user_id = allocate_user_id(email)
+    except IntegrityError:
+        return jsonify({'success': False, 'message': 'Email already registered'}), 400
+    
+    def create(user_db):
+        user = User(id=user_id, email=email, name=name, password_hash=password_hash)
+        user_db.add(user)
+        user_db.flush()
+        # Create default profile
+        user_db.add(UserProfile(
+            user_id=user.id,
+            skill_readiness=0,
+            verified_skills=0,
+            total_xp=0,
+            certifications=0
+        ))
+        return user.to_dict()
+    
+    try:
+        user = user_write(user_id, create)
+    except Exception as e:
+        release_user_ids([user_id])
+        if isinstance(e, IntegrityError):
+            return jsonify({'success': False, 'message': 'Email already registered'}), 400
+        raise
+    
+    return jsonify({
+        'success': True,
+        'message': 'Registration successful',
+        'user': user
+    }), 201
+
+
+@bp.route('/api/login', methods=['POST'])
+def login():
+    """Login user"""
+    wait = get_limiter('login_ip').acquire(request.remote_addr)
+    if wait:
+        return rejection_response(429, 'Too many login attempts, please slow down', wait)
+    
+    data = request.get_json()
+    
+    email = data.get('email')
+    password = data.get('password')
+    remember_me = data.get('rememberMe', False)
+    
+    if not email or not password:
+        return jsonify({'success': False, 'message': 'Email and password are required'}), 400
+    if not isinstance(email, str) or not isinstance(password, str):
+        return jsonify({'success': False, 'message': 'Email and password must be strings'}), 400
+    
+    wait = get_limiter('login_account').acquire(normalize_email(email))
+    if wait:
+        return rejection_response(429, 'Too many login attempts for this account', wait)
+    
+    return authenticate(email, password, remember_me)
+
+
+@admission_controlled('auth')
+def authenticate(email, password, remember_me):
+    """Check credentials (password hashing is the expensive part) and start a session"""
+    user = find_user(email)
+    
+    if not user or not user.check_password(password):
+        return jsonify({'success': False, 'message': 'Invalid email or password'}), 401
+    
+    session['user_id'] = user.id
+    session['email'] = user.email
+    
+    if remember_me:
+        session.permanent = True
+    
+    return jsonify({
+        'success': True,
+        'message': 'Login successful',
+        'user': user.to_dict()
+    }), 200
+
+
+@bp.route('/api/logout', methods=['POST'])
+def logout():
+    """Logout user"""
+    session.clear()
+    return jsonify({'success': True, 'message': 'Logged out successfully'}), 200
+
+
+@bp.route('/api/dashboard-data')
+@conditional_get('user', 'user_profile', 'challenge', extra=lambda: (next_challenge_deadline(),))
+def get_dashboard_data():
+    """Get dashboard data for logged-in user"""
+    return json_response(dashboard_payload())
+
+
+def dashboard_payload():
+    user_id = session.get('user_id')
+    
+    if not user_id:
+        # Return default data if not logged in
+        return {
+            'success': True,
+            'user': None,
+            'stats': {
+                'skill_readiness': 87,
+                'verified_skills': 12,
+                'total_xp': 2450,
+                'certifications': 5
+            },
+            **dashboard_challenges()
+        }
+    
+    user_db = user_session(user_id)
+    user = user_db.execute(
+        db.select(User.id, User.email, User.name, User.created_at).where(User.id == user_id)
+    ).first()
+    profile = user_db.execute(
+        db.select(*(getattr(UserProfile, f) for f in PROFILE_COUNTERS)).where(UserProfile.user_id == user_id)
+    ).first()
+    
+    return {
+        'success': True,
+        'user': dict(user._mapping) if user else None,
+        'stats': dict(profile._mapping) if profile else dict.fromkeys(PROFILE_COUNTERS, 0),
+        **dashboard_challenges()
+    }
+
+
+def dashboard_challenges():
+    """First catalog page for the dashboard; the rest comes from /api/challenges"""
+    challenges, next_cursor = cached_challenges(
+        'dashboard', lambda: challenge_page(hide_expired=True))
+    return {'challenges': challenges, 'challenges_next_cursor': next_cursor}
+
+
+@bp.route('/api/challenges')
+def list_challenges():
+    """Filterable, keyset-paginated challenge catalog"""
+    filters = {f: request.args[f] for f in CHALLENGE_FILTERS if request.args.get(f)}
+    
+    try:
+        limit = min(int(request.args.get('limit', current_app.config['CHALLENGE_PAGE_SIZE'])),
+                    current_app.config['CHALLENGE_MAX_PAGE_SIZE'])
+        if limit < 1:
+            raise ValueError('limit must be positive')
+        challenges, next_cursor = challenge_page(
+            filters,
+            sort=request.args.get('sort', 'id'),
+            descending=request.args.get('order', 'asc') == 'desc',
+            cursor=request.args.get('cursor'),
+            limit=limit,
+            deadline_after=parse_date_arg('deadline_after'),
+            deadline_before=parse_date_arg('deadline_before'),
+            hide_expired=request.args.get('hide_expired') in ('1', 'true')
+        )
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'message': str(e) or 'Invalid query'}), 400
+    
+    return json_response({
+        'success': True,
+        'challenges': challenges,
+        'next_cursor': next_cursor
+    })
+
+
+@bp.route('/api/challenges/closing-soon')
+def closing_soon_challenges():
+    """Challenges whose deadline falls within the next ?days= (default 7), soonest first"""
+    try:
+        days = int(request.args.get('days', 7))
+        if not 0 < days <= 365:
+            raise ValueError
+    except ValueError:
+        return jsonify({'success': False, 'message': 'days must be between 1 and 365'}), 400
+    
+    def load():
+        now = datetime.utcnow()
+        challenges, _ = challenge_page(
+            sort='deadline',
+            deadline_after=now,
+            deadline_before=now + timedelta(days=days),
+            limit=current_app.config['CHALLENGE_MAX_PAGE_SIZE']
+        )
+        return challenges
+    
+    return json_response({
+        'success': True,
+        'challenges': cached_challenges(('closing-soon', days), load)
+    })
+
+
+@bp.route('/api/submit-survey', methods=['POST'])
+def submit_survey():
+    """Submit career test survey"""
+    user_id = session.get('user_id')
+    
+    if not user_id:
+        return jsonify({'success': False, 'message': 'Please log in to submit survey'}), 401
+    
+    data = request.get_json() or {}
+    codebook = get_codebook()
+    question_set_id = data.get('question_set', current_app.config['SURVEY_QUESTION_SET'])
+    
+    if not isinstance(question_set_id, int) or codebook.question_count(question_set_id) is None:
+        return jsonify({'success': False, 'message': 'Unknown question set'}), 400
+    
+    try:
+        answers = codebook.encode(question_set_id, {
+            int(key): value for key, value in data.items() if key.isdigit()
+        })
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    
+    shards = get_user_shards()
+    
+    def record(user_db):
+        survey = SurveyResponse(
+            id=shards.next_survey_id(shards.shard_of(user_id)),
+            user_id=user_id,
+            question_set_id=question_set_id,
+            answers=answers
+        )
+        user_db.add(survey)
+        user_db.flush()
+        return survey.to_dict()
+    
+    return jsonify({
+        'success': True,
+        'message': 'Survey submitted successfully',
+        'survey': user_write(user_id, record)
+    }), 201
+
+
+PROFILE_COUNTERS = ('skill_readiness', 'verified_skills', 'total_xp', 'certifications')
+
+
+def is_integer(value):
+    """A JSON integer: not a bool, a float or a numeric string"""
+    return type(value) is int
+
+
+def parse_profile_value(value):
+    """Parse a profile field into (is_delta, amount); '+50' / '-10' are deltas"""
+    if isinstance(value, str):
+        value = value.strip()
+        if value[:1] in ('+', '-') and value[1:].isascii() and value[1:].isdigit():
+            return True, int(value)
+        raise ValueError('Profile deltas must look like "+N" or "-N"')
+    if not is_integer(value):
+        raise ValueError('Profile values must be integers')
+    return False, value
+
+
+@bp.route('/api/update-profile', methods=['PUT'])
+def update_profile():
+    """Update user profile stats (absolute values or '+N'/'-N' deltas)"""
+    user_id = session.get('user_id')
+    
+    if not user_id:
+        return jsonify({'success': False, 'message': 'Not authenticated'}), 401
+    
+    data = request.get_json() or {}
+    values = {}
+    
+    try:
+        for field in PROFILE_COUNTERS:
+            if field in data:
+                is_delta, amount = parse_profile_value(data[field])
+                column = getattr(UserProfile, field)
+                values[field] = column + amount if is_delta else amount
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'message': 'Profile values must be integers or "+N"/"-N" deltas'}), 400
+    
+    def update(user_db):
+        query = user_db.query(UserProfile).filter_by(user_id=user_id)
+        
+        # Single UPDATE ... SET x = x + ? so concurrent awards never lose updates
+        updated = query.update(values, synchronize_session=False) if values else query.count()
+        
+        if not updated:
+            user_db.add(UserProfile(
+                user_id=user_id,
+                skill_readiness=0,
+                verified_skills=0,
+                total_xp=0,
+                certifications=0
+            ))
+            user_db.flush()
+            if values:
+                query.update(values, synchronize_session=False)
+        
+        # The batch shares one session, so reread rather than trust its identity map
+        return query.populate_existing().first().to_dict()
+    
+    return jsonify({
+        'success': True,
+        'message': 'Profile updated successfully',
+        'profile': user_write(user_id, update)
+    }), 200
+
+
+# ============= ADMIN ROUTES =============
+
+@bp.route('/admin')
+def admin_dashboard():
+    """Admin dashboard HTML page"""
+    return '''
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Admin Dashboard - SkillVerify</title>
+    <style>
+        * {
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }
+
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', 'Roboto', sans-serif;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            min-height: 100vh;
+            padding: 40px 20px;
+        }
+
+        .container {
+            max-width: 1400px;
+            margin: 0 auto;
+        }
+
+        .header {
+            background: white;
+            padding: 30px;
+            border-radius: 20px;
+            margin-bottom: 30px;
+            box-shadow: 0 10px 40px rgba(0, 0, 0, 0.1);
+        }
+
+        .header h1 {
+            font-size: 32px;
+            color: #1a1a1a;
+            margin-bottom: 10px;
+        }
+
+        .header p {
+            color: #666;
+            font-size: 16px;
+        }
+
+        .stats-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+            gap: 20px;
+            margin-bottom: 30px;
+        }
+
+        .stat-box {
+            background: white;
+            padding: 25px;
+            border-radius: 16px;
+            box-shadow: 0 5px 20px rgba(0, 0, 0, 0.1);
+            text-align: center;
+            transition: transform 0.3s ease;
+        }
+
+        .stat-box:hover {
+            transform: translateY(-5px);
+        }
+
+        .stat-number {
+            font-size: 36px;
+            font-weight: 700;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            -webkit-background-clip: text;
+            -webkit-text-fill-color: transparent;
+            margin-bottom: 8px;
+        }
+
+        .stat-label {
+            color: #666;
+            font-size: 14px;
+            text-transform: uppercase;
+            letter-spacing: 1px;
+        }
+
+        .tabs {
+            display: flex;
+            gap: 10px;
+            margin-bottom: 20px;
+            flex-wrap: wrap;
+        }
+
+        .tab {
+            padding: 12px 24px;
+            background: white;
+            border: none;
+            border-radius: 10px;
+            font-weight: 600;
+            cursor: pointer;
+            transition: all 0.3s ease;
+            color: #666;
+        }
+
+        .tab.active {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            box-shadow: 0 5px 20px rgba(102, 126, 234, 0.4);
+        }
+
+        .tab:hover:not(.active) {
+            background: #f0f0f0;
+        }
+
+        .content-box {
+            background: white;
+            padding: 30px;
+            border-radius: 20px;
+            box-shadow: 0 10px 40px rgba(0, 0, 0, 0.1);
+            overflow-x: auto;
+        }
+
+        .tab-content {
+            display: none;
+        }
+
+        .tab-content.active {
+            display: block;
+        }
+
+        table {
+            width: 100%;
+            border-collapse: collapse;
+            margin-top: 20px;
+            min-width: 800px;
+        }
+
+        thead {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+        }
+
+        th, td {
+            padding: 15px;
+            text-align: left;
+            border-bottom: 1px solid #eee;
+        }
+
+        th {
+            font-weight: 600;
+            text-transform: uppercase;
+            font-size: 12px;
+            letter-spacing: 1px;
+        }
+
+        tbody tr {
+            transition: background 0.3s ease;
+        }
+
+        tbody tr:hover {
+            background: #f8f9ff;
+        }
+
+        .table-viewport {
+            max-height: 600px;
+            overflow: auto;
+            margin-top: 20px;
+        }
+
+        .table-viewport table {
+            margin-top: 0;
+        }
+
+        .table-viewport thead th {
+            position: sticky;
+            top: 0;
+            background: #6a5acd;
+        }
+
+        .table-viewport td {
+            white-space: nowrap;
+            overflow: hidden;
+            text-overflow: ellipsis;
+            max-width: 260px;
+        }
+
+        .table-status {
+            text-align: center;
+            padding: 10px;
+            color: #999;
+            font-size: 13px;
+        }
+
+        .badge {
+            display: inline-block;
+            padding: 4px 12px;
+            border-radius: 20px;
+            font-size: 12px;
+            font-weight: 600;
+        }
+
+        .badge-success {
+            background: #d4f4dd;
+            color: #22863a;
+        }
+
+        .badge-info {
+            background: #d1ecf1;
+            color: #0c5460;
+        }
+
+        .badge-warning {
+            background: #fff3cd;
+            color: #856404;
+        }
+
+        .btn {
+            padding: 8px 16px;
+            border: none;
+            border-radius: 8px;
+            cursor: pointer;
+            font-weight: 600;
+            transition: all 0.3s ease;
+            margin-right: 5px;
+            font-size: 13px;
+        }
+
+        .btn-primary {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+        }
+
+        .btn-primary:hover {
+            transform: translateY(-2px);
+            box-shadow: 0 5px 15px rgba(102, 126, 234, 0.4);
+        }
+
+        .btn-danger {
+            background: #ef4444;
+            color: white;
+        }
+
+        .btn-danger:hover {
+            background: #dc2626;
+        }
+
+        .search-box {
+            width: 100%;
+            padding: 12px 20px;
+            border: 2px solid #e0e0e0;
+            border-radius: 10px;
+            font-size: 15px;
+            margin-bottom: 20px;
+            transition: border-color 0.3s ease;
+        }
+
+        .search-box:focus {
+            outline: none;
+            border-color: #667eea;
+        }
+
+        .empty-state {
+            text-align: center;
+            padding: 60px 20px;
+            color: #999;
+        }
+
+        .loading {
+            text-align: center;
+            padding: 40px;
+        }
+
+        .spinner {
+            border: 4px solid #f3f3f3;
+            border-top: 4px solid #667eea;
+            border-radius: 50%;
+            width: 40px;
+            height: 40px;
+            animation: spin 1s linear infinite;
+            margin: 0 auto;
+        }
+
+        @keyframes spin {
+            0% { transform: rotate(0deg); }
+            100% { transform: rotate(360deg); }
+        }
+
+        .refresh-btn {
+            position: fixed;
+            bottom: 30px;
+            right: 30px;
+            width: 60px;
+            height: 60px;
+            border-radius: 50%;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            border: none;
+            font-size: 24px;
+            cursor: pointer;
+            box-shadow: 0 10px 30px rgba(102, 126, 234, 0.4);
+            transition: all 0.3s ease;
+        }
+
+        .refresh-btn:hover {
+            transform: scale(1.1) rotate(90deg);
+        }
+
+        .back-btn {
+            display: inline-block;
+            padding: 10px 20px;
+            background: white;
+            color: #667eea;
+            text-decoration: none;
+            border-radius: 10px;
+            font-weight: 600;
+            margin-bottom: 20px;
+            transition: all 0.3s ease;
+        }
+
+        .back-btn:hover {
+            background: #f0f0f0;
+            transform: translateX(-5px);
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <a href="/" class="back-btn">← Back to Dashboard</a>
+        
+        <div class="header">
+            <h1>🔧 Admin Dashboard</h1>
+            <p>Manage users, view statistics, and monitor system activity</p>
+        </div>
+
+        <div class="stats-grid">
+            <div class="stat-box">
+                <div class="stat-number" id="totalUsers">0</div>
+                <div class="stat-label">Total Users</div>
+            </div>
+            <div class="stat-box">
+                <div class="stat-number" id="totalSurveys">0</div>
+                <div class="stat-label">Surveys Completed</div>
+            </div>
+            <div class="stat-box">
+                <div class="stat-number" id="totalChallenges">0</div>
+                <div class="stat-label">Active Challenges</div>
+            </div>
+            <div class="stat-box">
+                <div class="stat-number" id="avgSkill">0%</div>
+                <div class="stat-label">Avg Skill Readiness</div>
+            </div>
+        </div>
+
+        <div class="tabs">
+            <button class="tab active" onclick="switchTab('users')">👥 Users</button>
+            <button class="tab" onclick="switchTab('surveys')">📋 Surveys</button>
+            <button class="tab" onclick="switchTab('challenges')">🎯 Challenges</button>
+        </div>
+
+        <div class="content-box">
+            <div class="tab-content active" id="users-tab">
+                <input type="text" class="search-box" id="searchUsers" placeholder="🔍 Search users by email or name...">
+                <div id="usersContent">
+                    <div class="loading">
+                        <div class="spinner"></div>
+                        <p>Loading users...</p>
+                    </div>
+                </div>
+            </div>
+
+            <div class="tab-content" id="surveys-tab">
+                <input type="text" class="search-box" id="searchSurveys" placeholder="🔍 Search surveys by user email...">
+                <div id="surveysContent">
+                    <div class="loading">
+                        <div class="spinner"></div>
+                        <p>Loading surveys...</p>
+                    </div>
+                </div>
+            </div>
+
+            <div class="tab-content" id="challenges-tab">
+                <div id="challengesContent">
+                    <div class="loading">
+                        <div class="spinner"></div>
+                        <p>Loading challenges...</p>
+                    </div>
+                </div>
+            </div>
+        </div>
+    </div>
+
+    <button class="refresh-btn" onclick="loadAllData()" title="Refresh Data">↻</button>
+
+    <script>
+        // Renders only the rows in view; pages are fetched from the server as the user scrolls.
+        // At most maxPages stay in memory: the ones farthest from view are dropped and
+        // fetched again from their cursor when scrolled back to.
+        class VirtualTable {
+            constructor(container, {url, key, columns, emptyHtml, pageSize = 100, overscan = 10, maxPages = 10}) {
+                this.container = container;
+                this.url = url;
+                this.key = key;
+                this.columns = columns;
+                this.emptyHtml = emptyHtml;
+                this.pageSize = pageSize;
+                this.overscan = overscan;
+                this.maxPages = maxPages;
+                this.rowHeight = 56;
+                this.params = {};
+                this.generation = 0;
+                this.frame = null;
+            }
+
+            reset(params = this.params) {
+                this.params = params;
+                // pages[n] holds page n's rows, or null once dropped; cursors[n] fetches it again
+                this.pages = [];
+                this.cursors = [null];
+                this.rowCount = 0;
+                this.exhausted = false;
+                this.loading = new Set();
+                this.generation++;
+                this.build();
+                return this.fetchPage(0);
+            }
+
+            build() {
+                this.container.innerHTML = '';
+                this.viewport = document.createElement('div');
+                this.viewport.className = 'table-viewport';
+                const table = document.createElement('table');
+                const headRow = table.createTHead().insertRow();
+                this.columns.forEach(column => {
+                    const th = document.createElement('th');
+                    th.textContent = column.label;
+                    headRow.appendChild(th);
+                });
+                this.body = table.createTBody();
+                this.viewport.appendChild(table);
+                this.status = document.createElement('div');
+                this.status.className = 'table-status';
+                this.container.append(this.viewport, this.status);
+                this.viewport.addEventListener('scroll', () => {
+                    if (this.frame === null) {
+                        this.frame = requestAnimationFrame(() => {
+                            this.frame = null;
+                            this.render();
+                        });
+                    }
+                });
+            }
+
+            async fetchPage(n) {
+                if (this.loading.has(n) || n >= this.cursors.length) return;
+                const newest = n === this.pages.length;
+                this.loading.add(n);
+                this.status.textContent = 'Loading...';
+                const generation = this.generation;
+                const query = new URLSearchParams({...this.params, limit: this.pageSize});
+                if (this.cursors[n]) query.set('cursor', this.cursors[n]);
+
+                try {
+                    const response = await fetch(`${this.url}?${query}`);
+                    const data = await response.json();
+                    if (generation !== this.generation) return;
+                    if (!data.success) throw new Error(data.message);
+                    this.pages[n] = data[this.key];
+                    if (newest) {
+                        this.rowCount = n * this.pageSize + data[this.key].length;
+                        this.exhausted = !data.next_cursor;
+                        if (data.next_cursor) this.cursors.push(data.next_cursor);
+                    }
+                    this.evict();
+                } catch (error) {
+                    if (generation !== this.generation) return;
+                    console.error(`Error loading ${this.key}:`, error);
+                    if (newest) this.exhausted = true;
+                    if (this.rowCount === 0) {
+                        this.container.innerHTML = `<div class="empty-state">Error loading ${this.key}</div>`;
+                        return;
+                    }
+                } finally {
+                    if (generation === this.generation) this.loading.delete(n);
+                }
+
+                if (this.rowCount === 0) {
+                    this.container.innerHTML = this.emptyHtml;
+                    return;
+                }
+                this.status.textContent = this.exhausted
+                    ? `${this.rowCount.toLocaleString()} ${this.key}`
+                    : `${this.rowCount.toLocaleString()}+ ${this.key}, scroll for more`;
+                this.render();
+            }
+
+            evict() {
+                const middle = (this.viewport.scrollTop + this.viewport.clientHeight / 2) / this.rowHeight;
+                const center = Math.floor(middle / this.pageSize);
+                const held = this.pages.map((rows, n) => rows ? n : -1).filter(n => n >= 0)
+                    .sort((a, b) => Math.abs(b - center) - Math.abs(a - center));
+                held.slice(0, Math.max(0, held.length - this.maxPages)).forEach(n => { this.pages[n] = null; });
+            }
+
+            render() {
+                const top = this.viewport.scrollTop;
+                const visible = Math.ceil(this.viewport.clientHeight / this.rowHeight);
+                const start = Math.max(0, Math.floor(top / this.rowHeight) - this.overscan);
+                const end = Math.min(this.rowCount, start + visible + 2 * this.overscan);
+
+                const fragment = document.createDocumentFragment();
+                fragment.appendChild(this.spacer(start * this.rowHeight));
+                for (let i = start; i < end; i++) {
+                    const page = this.pages[Math.floor(i / this.pageSize)];
+                    const row = page && page[i % this.pageSize];
+                    if (!row) {
+                        // Dropped page on its way back: hold the row's place
+                        fragment.appendChild(this.spacer(this.rowHeight));
+                        continue;
+                    }
+                    const tr = document.createElement('tr');
+                    this.columns.forEach(column => {
+                        const td = tr.insertCell();
+                        const value = column.render(row);
+                        if (value instanceof Node) td.appendChild(value);
+                        else td.textContent = value;
+                    });
+                    fragment.appendChild(tr);
+                }
+                fragment.appendChild(this.spacer((this.rowCount - end) * this.rowHeight));
+                this.body.replaceChildren(fragment);
+
+                // Measure the real row height once rows are on screen
+                const sample = this.body.rows[1];
+                if (sample && sample.offsetHeight && sample.offsetHeight !== this.rowHeight) {
+                    this.rowHeight = sample.offsetHeight;
+                }
+                for (let n = Math.floor(start / this.pageSize); n * this.pageSize < end; n++) {
+                    if (!this.pages[n]) this.fetchPage(n);
+                }
+                if (!this.exhausted && end >= this.rowCount - this.overscan) this.fetchPage(this.pages.length);
+            }
+
+            spacer(height) {
+                const tr = document.createElement('tr');
+                tr.style.height = `${height}px`;
+                return tr;
+            }
+
+            find(id) {
+                return (this.pages || []).flatMap(rows => rows || []).find(row => row.id === id);
+            }
+        }
+
+        function badge(text, className) {
+            const span = document.createElement('span');
+            span.className = `badge ${className}`;
+            span.textContent = text;
+            return span;
+        }
+
+        function button(text, className, onClick) {
+            const element = document.createElement('button');
+            element.className = `btn ${className}`;
+            element.textContent = text;
+            element.addEventListener('click', onClick);
+            return element;
+        }
+
+        // API timestamps are naive UTC; without a zone Date() would read them as local time
+        function utcDate(iso) {
+            return new Date(/(Z|[+-]\\d\\d:\\d\\d)$/.test(iso) ? iso : iso + 'Z');
+        }
+
+        function formatDeadline(deadline) {
+            if (!deadline) return 'Open';
+            return utcDate(deadline).toLocaleDateString('en-US', {month: 'short', day: 'numeric', year: 'numeric'});
+        }
+
+        const usersTable = new VirtualTable(document.getElementById('usersContent'), {
+            url: '/api/admin/users',
+            key: 'users',
+            emptyHtml: '<div class="empty-state"><p>No users found. <a href="/register-page">Register a user</a></p></div>',
+            columns: [
+                {label: 'ID', render: user => badge(`#${user.id}`, 'badge-info')},
+                {label: 'Email', render: user => user.email},
+                {label: 'Name', render: user => user.name || 'N/A'},
+                {label: 'Skill Readiness', render: user => badge(`${(user.profile || {}).skill_readiness || 0}%`, 'badge-success')},
+                {label: 'Verified Skills', render: user => (user.profile || {}).verified_skills || 0},
+                {label: 'Total XP', render: user => (user.profile || {}).total_xp || 0},
+                {label: 'Joined', render: user => utcDate(user.created_at).toLocaleDateString()},
+                {label: 'Actions', render: user => {
+                    const actions = document.createDocumentFragment();
+                    actions.append(
+                        button('View', 'btn-primary', () => viewUserDetails(user.id)), ' ',
+                        button('Delete', 'btn-danger', () => deleteUser(user.id))
+                    );
+                    return actions;
+                }}
+            ]
+        });
+
+        const surveysTable = new VirtualTable(document.getElementById('surveysContent'), {
+            url: '/api/admin/surveys',
+            key: 'surveys',
+            emptyHtml: '<div class="empty-state"><p>No surveys completed yet</p></div>',
+            columns: [
+                {label: 'ID', render: survey => badge(`#${survey.id}`, 'badge-info')},
+                {label: 'User Email', render: survey => survey.user_email || 'Unknown'},
+                ...[1, 2, 3, 4, 5].map(n => ({label: `Q${n}`, render: survey => survey[`question_${n}`] || 'N/A'})),
+                {label: 'Completed', render: survey => utcDate(survey.completed_at).toLocaleDateString()}
+            ]
+        });
+
+        const difficultyClasses = {Easy: 'badge-success', Hard: 'badge-warning'};
+        const challengesTable = new VirtualTable(document.getElementById('challengesContent'), {
+            url: '/api/admin/challenges',
+            key: 'challenges',
+            emptyHtml: '<div class="empty-state"><p>No challenges available</p></div>',
+            columns: [
+                {label: 'ID', render: challenge => badge(`#${challenge.id}`, 'badge-info')},
+                {label: 'Title', render: challenge => challenge.title},
+                {label: 'Company', render: challenge => challenge.company},
+                {label: 'Domain', render: challenge => challenge.domain},
+                {label: 'Difficulty', render: challenge => badge(challenge.difficulty, difficultyClasses[challenge.difficulty] || 'badge-info')},
+                {label: 'Deadline', render: challenge => formatDeadline(challenge.deadline)},
+                {label: 'Status', render: challenge => challenge.status}
+            ]
+        });
+
+        function switchTab(tabName) {
+            document.querySelectorAll('.tab').forEach(t => t.classList.remove('active'));
+            document.querySelectorAll('.tab-content').forEach(c => c.classList.remove('active'));
+            
+            event.target.classList.add('active');
+            document.getElementById(tabName + '-tab').classList.add('active');
+            // Hidden viewports have no height, so draw the newly visible one again
+            ({users: usersTable, surveys: surveysTable, challenges: challengesTable})[tabName].render();
+        }
+
+        async function loadAllData() {
+            await Promise.all([
+                usersTable.reset(),
+                surveysTable.reset(),
+                challengesTable.reset(),
+                loadStats()
+            ]);
+        }
+
+        async function loadStats() {
+            try {
+                const response = await fetch('/api/admin/stats');
+                const data = await response.json();
+                
+                document.getElementById('totalUsers').textContent = data.total_users || 0;
+                document.getElementById('totalSurveys').textContent = data.total_surveys || 0;
+                document.getElementById('totalChallenges').textContent = data.total_challenges || 0;
+                document.getElementById('avgSkill').textContent = (data.avg_skill_readiness || 0) + '%';
+            } catch (error) {
+                console.error('Error loading stats:', error);
+            }
+        }
+
+        function viewUserDetails(userId) {
+            const user = usersTable.find(userId);
+            if (!user) return;
+            
+            alert(`User Details:\\n\\nEmail: ${user.email}\\nName: ${user.name || 'N/A'}\\nID: ${user.id}\\nJoined: ${utcDate(user.created_at).toLocaleDateString()}`);
+        }
+
+        async function deleteUser(userId) {
+            if (!confirm('Are you sure you want to delete this user?')) return;
+            
+            try {
+                const response = await fetch(`/api/admin/users/${userId}`, {
+                    method: 'DELETE'
+                });
+                const data = await response.json();
+                
+                if (data.success) {
+                    alert('User deleted successfully');
+                    loadAllData();
+                } else {
+                    alert('Error deleting user: ' + data.message);
+                }
+            } catch (error) {
+                console.error('Error deleting user:', error);
+                alert('Error deleting user');
+            }
+        }
+
+        // Searches run on the server so they cover every row, not just the loaded pages
+        function searchOnInput(inputId, table) {
+            let timer = null;
+            document.getElementById(inputId).addEventListener('input', (e) => {
+                clearTimeout(timer);
+                timer = setTimeout(() => {
+                    const query = e.target.value.trim();
+                    table.reset(query ? {q: query} : {});
+                }, 250);
+            });
+        }
+
+        searchOnInput('searchUsers', usersTable);
+        searchOnInput('searchSurveys', surveysTable);
+
+        loadAllData();
+        setInterval(loadStats, 30000);
+    </script>
+</body>
+</html>
+    '''
+
+
+@bp.route('/api/admin/users')
+@replica_reads
+@conditional_get('user', 'user_profile')
+@admission_controlled('admin')
+def admin_get_users():
+    """Get users with profiles; ?limit=/&cursor= return one keyset page, ?q= searches email and name"""
+    stmt = db.select(
+        User.id, User.email, User.name, User.created_at, UserProfile.id.label('profile_id'),
+        *(getattr(UserProfile, f) for f in PROFILE_COUNTERS)
+    ).outerjoin(UserProfile, UserProfile.user_id == User.id).order_by(User.id)
+    if request.args.get('q'):
+        query = request.args['q']
+        stmt = stmt.where(db.or_(User.email.contains(query, autoescape=True),
+                                 User.name.contains(query, autoescape=True)))
+    
+    def shape(row):
+        profile_id = row.pop('profile_id')
+        profile = {f: row.pop(f) for f in PROFILE_COUNTERS}
+        row['profile'] = profile if profile_id is not None else {}
+        return row
+    
+    try:
+        page = admin_page_request()
+        if page is not None:
+            cursor, limit = page
+            after = decode_cursor(cursor) if cursor else None
+            if after is not None and type(after) is not int:
+                raise ValueError('Invalid cursor')
+            rows, more = scatter_keyset(lambda shard: stmt, User.id, after, limit)
+            return json_response({
+                'success': True,
+                'users': [shape(row) for row in rows],
+                'next_cursor': encode_cursor(rows[-1]['id']) if more else None
+            })
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'message': str(e) or 'Invalid query'}), 400
+    
+    columns = list(stmt.selected_columns.keys())
+    batches = iter_user_batches(lambda shard: stmt, current_app.config['EXPORT_BATCH_SIZE'])
+    return stream_json_list('users', columns, batches, shape)
+
+
+@bp.route('/api/admin/surveys')
+@replica_reads
+@admission_controlled('admin')
+def admin_get_surveys():
+    """Get survey responses; ?from=/&to= dates reach into the archive when needed.
+    
+    ?limit=/&cursor= return one keyset page, ?q= searches the user's email.
+    """
+    try:
+        start = parse_date_arg('from')
+        end = parse_date_arg('to')
+    except ValueError:
+        return jsonify({'success': False, 'message': 'from/to must be ISO dates'}), 400
+    query = request.args.get('q')
+    
+    # Only a date range reaches into the archive, and only if it can hold matches
+    tables = [SurveyResponse.__table__]
+    if (start is not None or end is not None) and archive_overlaps(start, end):
+        tables.append(archived_survey_responses)
+    
+    codebook = get_codebook()
+    
+    def shape(row):
+        row['question_set'] = row.pop('question_set_id')
+        row.update(codebook.decode(row['question_set'], row.pop('answers')))
+        return row
+    
+    try:
+        page = admin_page_request()
+        if page is not None:
+            return survey_page(tables, start, end, query, *page, shape)
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'message': str(e) or 'Invalid query'}), 400
+    
+    def batches():
+        for table in tables:
+            yield from iter_user_batches(lambda shard: survey_list_select(table, start, end, query, shard),
+                                         current_app.config['EXPORT_BATCH_SIZE'])
+    
+    columns = list(survey_list_select(tables[0], start, end).selected_columns.keys())
+    return stream_json_list('surveys', columns, batches(), shape)
+
+
+def survey_list_select(table, start=None, end=None, query=None, shard=None):
+    """Survey list rows with the user's email; `shard` limits the shared archive to that shard's users"""
+    stmt = db.select(
+        table.c.id, table.c.question_set_id, table.c.answers, table.c.completed_at,
+        db.func.coalesce(User.email, 'Unknown').label('user_email')
+    ).outerjoin(User, User.id == table.c.user_id).order_by(table.c.id)
+    if start is not None:
+        stmt = stmt.where(table.c.completed_at >= start)
+    if end is not None:
+        stmt = stmt.where(table.c.completed_at < end)
+    if query:
+        stmt = stmt.where(User.email.contains(query, autoescape=True))
+    if shard is not None and table is archived_survey_responses:
+        stmt = on_shard(stmt, table.c.user_id, shard)
+    return stmt
+
+
+def decode_survey_cursor(cursor, table_count):
+    """(table index, last id or None) from a survey page cursor"""
+    after = decode_cursor(cursor)
+    if not isinstance(after, list) or len(after) != 2:
+        raise ValueError('Invalid cursor')
+    position, last_id = after
+    if type(position) is not int or not 0 <= position < table_count:
+        raise ValueError('Invalid cursor')
+    if last_id is not None and type(last_id) is not int:
+        raise ValueError('Invalid cursor')
+    return position, last_id
+
+
+def survey_page(tables, start, end, query, cursor, limit, shape):
+    """One page walking the hot table, then the archive; the cursor is [table index, last id]"""
+    position, after = decode_survey_cursor(cursor, len(tables)) if cursor else (0, None)
+    
+    rows, next_cursor = [], None
+    while position < len(tables):
+        table = tables[position]
+        batch, more = scatter_keyset(lambda shard: survey_list_select(table, start, end, query, shard),
+                                     table.c.id, after, limit - len(rows))
+        rows += batch
+        if more:
+            next_cursor = encode_cursor([position, rows[-1]['id']])
+            break
+        position, after = position + 1, None
+        if len(rows) == limit:
+            if position < len(tables):
+                next_cursor = encode_cursor([position, None])
+            break
+    
+    return json_response({'success': True, 'surveys': [shape(row) for row in rows], 'next_cursor': next_cursor})
+
+
+@bp.route('/api/admin/challenges')
+@replica_reads
+@conditional_get('challenge')
+@admission_controlled('admin')
+def admin_get_challenges():
+    """Get all challenges; ?limit=/&cursor= return one keyset page"""
+    try:
+        page = admin_page_request()
+        if page is not None:
+            challenges, next_cursor = challenge_page(cursor=page[0], limit=page[1])
+            return json_response({'success': True, 'challenges': challenges, 'next_cursor': next_cursor})
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'message': str(e) or 'Invalid query'}), 400
+    
+    stmt = challenge_select()
+    columns = list(stmt.selected_columns.keys())
+    batches = iter_export_batches(stmt, current_app.config['EXPORT_BATCH_SIZE'])
+    return stream_json_list('challenges', columns, batches)
+
+
+@bp.route('/api/admin/stats')
+@replica_reads
+@conditional_get('user', 'user_profile', 'survey_response', 'challenge')
+@admission_controlled('admin')
+def admin_get_stats():
+    """Get overall statistics"""
+    return json_response({'success': True, **compute_admin_stats()})
+
+
+def compute_admin_stats():
+    users = surveys = profiles = skill_total = 0
+    for user_db in user_sessions():
+        users += user_db.execute(db.select(db.func.count()).select_from(User)).scalar()
+        surveys += user_db.execute(db.select(db.func.count()).select_from(SurveyResponse)).scalar()
+        count, total = user_db.execute(
+            db.select(db.func.count(UserProfile.skill_readiness), db.func.sum(UserProfile.skill_readiness))
+        ).one()
+        profiles += count
+        skill_total += total or 0
+    return {
+        'total_users': users,
+        'total_surveys': surveys,
+        'total_challenges': Challenge.query.count(),
+        'avg_skill_readiness': round(skill_total / profiles, 1) if profiles else 0
+    }
+
+
+@bp.route('/api/admin/users/<int:user_id>', methods=['DELETE'])
+@admission_controlled('admin')
+def admin_delete_user(user_id):
+    """Delete a user"""
+    def delete(user_db):
+        user = user_db.get(User, user_id)
+        if user:
+            user_db.delete(user)
+        return user is not None
+    
+    if not user_write(user_id, delete):
+        return jsonify({'success': False, 'message': 'User not found'}), 404
+    
+    release_user_ids([user_id])
+    
+    return jsonify({'success': True, 'message': 'User deleted successfully'}), 200
+
+
+@bp.route('/api/admin/users/exists', methods=['POST'])
+@admission_controlled('admin')
+def admin_users_exist():
+    """Which of a batch of email addresses already have an account (compared normalized)"""
+    data = request.get_json(silent=True) or {}
+    emails = data.get('emails')
+    limit = current_app.config['USER_EXISTS_MAX_EMAILS']
+    
+    if not isinstance(emails, list) or not all(isinstance(email, str) for email in emails):
+        return jsonify({'success': False, 'message': 'emails must be a list of strings'}), 400
+    if len(emails) > limit:
+        return jsonify({'success': False, 'message': f'At most {limit} emails per request'}), 400
+    
+    found = existing_emails(emails)
+    exists = {email: normalize_email(email) in found for email in emails}
+    return json_response({'success': True, 'exists': exists, 'existing': sum(exists.values())})
+
+
+@bp.route('/api/admin/profile-increments', methods=['POST'])
+@admission_controlled('admin')
+def admin_increment_profiles():
+    """Apply profile stat deltas for many users in one transaction"""
+    data = request.get_json() or {}
+    increments = data.get('increments')
+    
+    if not isinstance(increments, list) or not increments:
+        return jsonify({'success': False, 'message': 'increments must be a non-empty list'}), 400
+    
+    # Collapse repeated awards for the same user into one row
+    totals = {}
+    try:
+        for item in increments:
+            user_id = item['user_id']
+            if not is_integer(user_id) or not all(is_integer(item[f]) for f in PROFILE_COUNTERS if f in item):
+                raise ValueError
+            row = totals.setdefault(user_id, dict.fromkeys(PROFILE_COUNTERS, 0))
+            for field in PROFILE_COUNTERS:
+                if field in item:
+                    row[field] += item[field]
+    except (KeyError, TypeError, ValueError):
+        return jsonify({'success': False, 'message': 'Each increment needs a user_id and integer deltas'}), 400
+    
+    table = UserProfile.__table__
+    stmt = table.update().where(table.c.user_id == db.bindparam('target_user_id')).values({
+        field: table.c[field] + db.bindparam('delta_' + field) for field in PROFILE_COUNTERS
+    })
+    # One executemany per shard on its writer: no read-modify-write, committed with its batch
+    updated = 0
+    for shard, user_ids in group_by_shard(totals).items():
+        params = [
+            {'target_user_id': user_id, **{'delta_' + f: totals[user_id][f] for f in PROFILE_COUNTERS}}
+            for user_id in user_ids
+        ]
+        updated += run_write(lambda user_db, params=params: user_db.execute(stmt, params).rowcount, shard)
+    
+    return jsonify({
+        'success': True,
+        'message': 'Increments applied',
+        'users': len(totals),
+        'updated': updated
+    }), 200
+
+
+@bp.route('/api/admin/admission')
+def admin_get_admission():
+    """Concurrency queue depth and rejection counters (never throttled)"""
+    return jsonify({
+        'success': True,
+        'concurrency': {name: get_limiter(name).stats() for name in ('auth', 'admin', 'export')},
+        'rate_limits': {name: get_limiter(name).stats() for name in ('login_ip', 'login_account')},
+        'write_queues': current_app.extensions['write_queues'].stats(),
+        'read_replica': current_app.extensions['read_replica'].stats()
+    }), 200
+
+
+@bp.route('/api/admin/survey-question-sets')
+@admission_controlled('admin')
+def admin_get_question_sets():
+    """List survey question set versions"""
+    question_sets = SurveyQuestionSet.query.order_by(SurveyQuestionSet.id).all()
+    return jsonify({
+        'success': True,
+        'current': current_app.config['SURVEY_QUESTION_SET'],
+        'question_sets': [q.to_dict() for q in question_sets]
+    }), 200
+
+
+def valid_question_options(options, question_count):
+    return isinstance(options, list) and len(options) == question_count and all(
+        isinstance(values, list) and 0 < len(values) <= MAX_OPTION_CODE and len(set(values)) == len(values)
+        and all(isinstance(value, str) and 0 < len(value) <= MAX_OPTION_LENGTH for value in values)
+        for values in options
+    )
+
+
+@bp.route('/api/admin/survey-question-sets', methods=['POST'])
+@admission_controlled('admin')
+def admin_create_question_set():
+    """Create a new question set version of any length, with each question's answer options"""
+    data = request.get_json() or {}
+    question_count = data.get('question_count')
+    options = data.get('options')
+    
+    if not isinstance(question_count, int) or question_count < 1:
+        return jsonify({'success': False, 'message': 'question_count must be a positive integer'}), 400
+    if not valid_question_options(options, question_count):
+        return jsonify({'success': False, 'message': (
+            f'options must list every question\'s answers: 1 to {MAX_OPTION_CODE} distinct strings '
+            f'of up to {MAX_OPTION_LENGTH} characters each'
+        )}), 400
+    
+    question_set = SurveyQuestionSet(name=data.get('name'), question_count=question_count)
+    db.session.add(question_set)
+    db.session.commit()
+    get_codebook().reload()
+    get_codebook().register_options(question_set.id, options)
+    
+    return jsonify({
+        'success': True,
+        'message': 'Question set created',
+        'question_set': question_set.to_dict()
+    }), 201
+
+
+@bp.route('/api/admin/surveys/answer-stats')
+@replica_reads
+@admission_controlled('admin')
+def admin_get_answer_stats():
+    """Answer distribution per question for one question set"""
+    try:
+        question_set_id = int(request.args.get('question_set', current_app.config['SURVEY_QUESTION_SET']))
+    except ValueError:
+        return jsonify({'success': False, 'message': 'question_set must be an integer'}), 400
+    
+    return json_response({
+        'success': True,
+        'question_set': question_set_id,
+        'answers': survey_answer_stats(question_set_id)
+    })
+
+
+# ============= XP HISTORY =============
+
+# Timestamps in SQLAlchemy's SQLite DateTime format, so trigger-written values
+# compare correctly with bound datetimes
+XP_NOW = "strftime('%Y-%m-%d %H:%M:%f000', 'now')"
+XP_BUCKETS = {
+    'hour': "substr({0}, 1, 13) || ':00:00.000000'",
+    'day': "substr({0}, 1, 10) || ' 00:00:00.000000'",
+}
+XP_PERIODS = {'hour': timedelta(hours=1), 'day': timedelta(days=1)}
+
+
+def xp_trigger_names():
+    return ['xp_event_rollup', 'xp_event_append_only',
+            *(f'xp_log_{metric}_{operation}' for metric in PROFILE_COUNTERS for operation in ('insert', 'update'))]
+
+
+def drop_xp_triggers(conn):
+    for name in xp_trigger_names():
+        conn.exec_driver_sql(f'DROP TRIGGER IF EXISTS {name}')
+
+
+def create_xp_triggers(conn):
+    """Log every profile counter change and fold it into the rollups in the same transaction"""
+    for metric in PROFILE_COUNTERS:
+        conn.exec_driver_sql(
+            f'CREATE TRIGGER IF NOT EXISTS xp_log_{metric}_insert AFTER INSERT ON user_profile '
+            f'WHEN COALESCE(NEW.{metric}, 0) != 0 BEGIN '
+            f'INSERT INTO xp_event (user_id, metric, delta, value, created_at) '
+            f"VALUES (NEW.user_id, '{metric}', NEW.{metric}, NEW.{metric}, {XP_NOW}); END"
+        )
+        conn.exec_driver_sql(
+            f'CREATE TRIGGER IF NOT EXISTS xp_log_{metric}_update AFTER UPDATE OF {metric} ON user_profile '
+            f'WHEN NEW.{metric} IS NOT OLD.{metric} BEGIN '
+            f'INSERT INTO xp_event (user_id, metric, delta, value, created_at) '
+            f"VALUES (NEW.user_id, '{metric}', COALESCE(NEW.{metric}, 0) - COALESCE(OLD.{metric}, 0), "
+            f'NEW.{metric}, {XP_NOW}); END'
+        )
+    
+    rows = []
+    for period, bucket in XP_BUCKETS.items():
+        bucket = bucket.format('NEW.created_at')
+        rows.append(f"('{period}', NEW.user_id, NEW.metric, {bucket}, NEW.delta, 1, NEW.value)")
+        rows.append(f"('{period}', 0, NEW.metric, {bucket}, NEW.delta, 1, NULL)")
+    conn.exec_driver_sql(
+        'CREATE TRIGGER IF NOT EXISTS xp_event_rollup AFTER INSERT ON xp_event BEGIN '
+        'INSERT INTO xp_rollup (period, user_id, metric, bucket, delta, events, value) '
+        f'VALUES {", ".join(rows)} '
+        'ON CONFLICT (period, user_id, metric, bucket) DO UPDATE SET '
+        'delta = delta + excluded.delta, events = events + 1, value = excluded.value; END'
+    )
+    conn.exec_driver_sql(
+        'CREATE TRIGGER IF NOT EXISTS xp_event_append_only BEFORE UPDATE ON xp_event BEGIN '
+        "SELECT RAISE(ABORT, 'xp_event is append-only'); END"
+    )
+
+
+def seed_xp_events(conn):
+    """One baseline event per non-zero counter that has no history yet; returns events added"""
+    seeded = 0
+    for metric in PROFILE_COUNTERS:
+        seeded += conn.exec_driver_sql(
+            f'INSERT INTO xp_event (user_id, metric, delta, value, created_at) '
+            f"SELECT p.user_id, '{metric}', p.{metric}, p.{metric}, {XP_NOW} FROM user_profile p "
+            f'WHERE COALESCE(p.{metric}, 0) != 0 AND NOT EXISTS ('
+            f"SELECT 1 FROM xp_event e WHERE e.user_id = p.user_id AND e.metric = '{metric}')"
+        ).rowcount
+    return seeded
+
+
+def rebuild_xp_rollups(conn):
+    """Recompute every rollup from the event log in one set-based pass"""
+    conn.exec_driver_sql('DELETE FROM xp_rollup')
+    for period, bucket in XP_BUCKETS.items():
+        bucket = bucket.format('created_at')
+        # SQLite takes the bare "value" column from the row that supplies max(id)
+        conn.exec_driver_sql(
+            'INSERT INTO xp_rollup (period, user_id, metric, bucket, delta, events, value) '
+            f"SELECT '{period}', user_id, metric, bucket, delta, events, value FROM ("
+            f'SELECT user_id, metric, {bucket} AS bucket, SUM(delta) AS delta, COUNT(*) AS events, '
+            'value, MAX(id) FROM xp_event GROUP BY user_id, metric, bucket)'
+        )
+        conn.exec_driver_sql(
+            'INSERT INTO xp_rollup (period, user_id, metric, bucket, delta, events, value) '
+            f"SELECT '{period}', 0, metric, {bucket} AS bucket, SUM(delta), COUNT(*), NULL "
+            'FROM xp_event GROUP BY metric, bucket'
+        )
+
+
+def ensure_xp_history(engine=None):
+    """Install the XP triggers on one database, first seeding baselines and rebuilding rollups.
+    
+    A no-op once the triggers exist; returns the number of baseline events seeded.
+    """
+    with (engine or db.engine).begin() as conn:
+        if conn.exec_driver_sql(
+                "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'xp_event_rollup'").first():
+            return 0
+        seeded = seed_xp_events(conn)
+        rebuild_xp_rollups(conn)
+        create_xp_triggers(conn)
+    return seeded
+
+
+def xp_bucket(value, period):
+    value = value.replace(minute=0, second=0, microsecond=0)
+    return value.replace(hour=0) if period == 'day' else value
+
+
+@bp.route('/api/xp-history')
+@conditional_get('user_profile', extra=lambda: (xp_bucket(datetime.utcnow(), 'hour'),))
+def xp_history():
+    """Profile counter over time, served from the hourly/daily rollups.
+    
+    ?metric= (default total_xp), ?period=hour|day, ?start=/?end= ISO datetimes and
+    ?scope=user (the logged-in user) or global (everyone's combined changes).
+    """
+    scope = request.args.get('scope', 'user')
+    metric = request.args.get('metric', 'total_xp')
+    period = request.args.get('period', 'day')
+    user_id = session.get('user_id')
+    
+    if scope not in ('user', 'global'):
+        return jsonify({'success': False, 'message': 'scope must be user or global'}), 400
+    if scope == 'user' and not user_id:
+        return jsonify({'success': False, 'message': 'Please log in to view your history'}), 401
+    if metric not in PROFILE_COUNTERS:
+        return jsonify({'success': False, 'message': f'metric must be one of {", ".join(PROFILE_COUNTERS)}'}), 400
+    if period not in XP_PERIODS:
+        return jsonify({'success': False, 'message': 'period must be hour or day'}), 400
+    
+    step = XP_PERIODS[period]
+    try:
+        end = parse_date_arg('end') or xp_bucket(datetime.utcnow(), period) + step
+        start = xp_bucket(parse_date_arg('start') or end - step * current_app.config['XP_HISTORY_DEFAULT_BUCKETS'],
+                          period)
+    except ValueError:
+        return jsonify({'success': False, 'message': 'start and end must be ISO dates'}), 400
+    if end <= start:
+        return jsonify({'success': False, 'message': 'end must be after start'}), 400
+    if (end - start) / step > current_app.config['XP_HISTORY_MAX_BUCKETS']:
+        return jsonify({'success': False, 'message': 'Range too long for this period'}), 400
+    
+    rollup = XpRollup.__table__
+    matches = (rollup.c.period == period, rollup.c.metric == metric)
+    stmt = (db.select(rollup.c.bucket, rollup.c.delta, rollup.c.events, rollup.c.value)
+            .where(*matches, rollup.c.bucket >= start, rollup.c.bucket < end).order_by(rollup.c.bucket))
+    
+    if scope == 'user':
+        user_db = user_session(user_id)
+        points = [dict(row._mapping) for row in user_db.execute(stmt.where(rollup.c.user_id == user_id))]
+        # The value going into the range, for drawing a running total
+        baseline = user_db.execute(
+            db.select(rollup.c.value).where(*matches, rollup.c.user_id == user_id, rollup.c.bucket < start)
+            .order_by(rollup.c.bucket.desc()).limit(1)
+        ).scalar() or 0
+    else:
+        # Each shard rolls up its own users; add the buckets together
+        merged = {}
+        for shard_session in user_sessions():
+            for bucket, delta, events, _ in shard_session.execute(stmt.where(rollup.c.user_id == 0)):
+                point = merged.setdefault(bucket, {'bucket': bucket, 'delta': 0, 'events': 0})
+                point['delta'] += delta
+                point['events'] += events
+        points = [merged[bucket] for bucket in sorted(merged)]
+        baseline = None
+    
+    return json_response({
+        'success': True,
+        'scope': scope,
+        'metric': metric,
+        'period': period,
+        'start': start,
+        'end': end,
+        'baseline': baseline,
+        'points': points
+    })
+
+
+# ============= ANALYTICS =============
+
+# Cohorts are Monday-based UTC weeks, numbered from the week holding the Unix epoch
+COHORT_EPOCH = datetime(1969, 12, 29)
+COHORT_EPOCH_OFFSET = 3 * 86400
+SECONDS_PER_WEEK = 7 * 86400
+
+
+def cohort_week(value):
+    return (value - COHORT_EPOCH) // timedelta(weeks=1)
+
+
+def cohort_start(week):
+    return COHORT_EPOCH + timedelta(weeks=week)
+
+
+def epoch_seconds(column):
+    return db.cast(db.func.strftime('%s', column), db.Integer)
+
+
+def fetch_columns(build, batch_size):
+    """Every shard's rows for build(shard), as one int64 NumPy array per selected column"""
+    chunks = [
+        np.array(batch, dtype=np.int64)
+        for shard, engine in enumerate(user_engines())
+        for batch in iter_export_batches(build(shard), batch_size, engine)
+    ]
+    if not chunks:
+        return tuple(np.empty((len(build(0).selected_columns), 0), dtype=np.int64))
+    return tuple(np.concatenate(chunks).T)
+
+
+class CohortCache:
+    """Per-worker cache of computed cohort rows, each kept for ttl seconds"""
+    
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+    
+    def get_many(self, keys):
+        now = time.monotonic()
+        with self._lock:
+            entries = [(key, self._entries.get(key)) for key in keys]
+        return {key: entry[1] for key, entry in entries if entry is not None and entry[0] > now}
+    
+    def put_many(self, rows):
+        now = time.monotonic()
+        with self._lock:
+            self._entries = {k: e for k, e in self._entries.items() if e[0] > now}
+            self._entries.update((key, (now + self.ttl, row)) for key, row in rows.items())
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def compute_cohorts(first, last, weeks, ready_threshold):
+    """Funnel, survey completion and mean skill_readiness for cohort weeks first..last.
+    
+    Users, surveys and skill_readiness events are pulled as integer columns and grouped
+    with bincount, so the work is a few scans and array passes however large the cohorts.
+    Week k of a cohort is the k-th calendar week after its signup week.
+    """
+    batch_size = current_app.config['EXPORT_BATCH_SIZE']
+    count = last - first + 1
+    signed_up = (User.created_at >= cohort_start(first), User.created_at < cohort_start(last + 1))
+    
+    def week_of(seconds):
+        return (seconds + COHORT_EPOCH_OFFSET) // SECONDS_PER_WEEK
+    
+    def cumulative(cohorts, offsets, weights=None):
+        """Running per-cohort totals over weeks 0..weeks-1 after signup"""
+        within = offsets < weeks
+        cells = np.bincount(cohorts[within] * weeks + offsets[within],
+                            None if weights is None else weights[within], minlength=count * weeks)
+        return cells.reshape(count, weeks).cumsum(axis=1)
+    
+    user_ids, created, total_xp, readiness = fetch_columns(lambda shard: db.select(
+        User.id, epoch_seconds(User.created_at),
+        db.func.coalesce(UserProfile.total_xp, 0), db.func.coalesce(UserProfile.skill_readiness, 0)
+    ).outerjoin(UserProfile, UserProfile.user_id == User.id).where(*signed_up), batch_size)
+    user_cohort = week_of(created) - first
+    sizes = np.bincount(user_cohort, minlength=count)
+    
+    def completions(shard):
+        archived = archived_survey_responses
+        return db.union_all(*(
+            db.select(table.c.user_id, epoch_seconds(User.created_at), epoch_seconds(table.c.completed_at))
+            .join(User, User.id == table.c.user_id).where(*signed_up, table.c.completed_at.isnot(None))
+            for table in (SurveyResponse.__table__, archived)
+        ))
+    
+    # Each user's first completed survey, live or archived
+    survey_users, survey_created, completed = fetch_columns(completions, batch_size)
+    order = np.lexsort((completed, survey_users))
+    firsts = order[np.unique(survey_users[order], return_index=True)[1]]
+    completion = cumulative(week_of(survey_created[firsts]) - first,
+                            np.maximum(week_of(completed[firsts]) - week_of(survey_created[firsts]), 0))
+    
+    # skill_readiness starts at 0, so the running sum of its deltas is each cohort's total
+    event_created, event_at, delta = fetch_columns(lambda shard: db.select(
+        epoch_seconds(User.created_at), epoch_seconds(XpEvent.created_at), XpEvent.delta
+    ).join(User, User.id == XpEvent.user_id).where(XpEvent.metric == 'skill_readiness', *signed_up), batch_size)
+    readiness_total = cumulative(week_of(event_created) - first,
+                                 np.maximum(week_of(event_at) - week_of(event_created), 0), delta)
+    
+    # Funnel stages narrow: each one also requires the stages before it
+    surveyed = np.isin(user_ids, survey_users[firsts])
+    earned = surveyed & (total_xp > 0)
+    ready = earned & (readiness >= ready_threshold)
+    funnel = {
+        'signed_up': sizes,
+        'completed_survey': np.bincount(user_cohort[surveyed], minlength=count),
+        'earned_xp': np.bincount(user_cohort[earned], minlength=count),
+        'ready': np.bincount(user_cohort[ready], minlength=count),
+    }
+    
+    divisor = np.maximum(sizes, 1)[:, None]
+    completion_share = np.round(completion / divisor, 4).tolist()
+    mean_readiness = np.round(readiness_total / divisor, 1).tolist()
+    # Weeks that have not happened yet stay empty
+    observed = cohort_week(datetime.utcnow()) - first
+    
+    rows = {}
+    for cohort in range(count):
+        seen = max(0, min(weeks, observed - cohort + 1))
+        rows[first + cohort] = {
+            'cohort': cohort_start(first + cohort).date().isoformat(),
+            'users': int(sizes[cohort]),
+            'funnel': {stage: int(values[cohort]) for stage, values in funnel.items()},
+            'survey_completion': completion_share[cohort][:seen] + [None] * (weeks - seen),
+            'skill_readiness': mean_readiness[cohort][:seen] + [None] * (weeks - seen),
+        }
+    return rows
+
+
+def cohort_report(first, last, weeks, ready_threshold):
+    """Cohort rows for weeks first..last, computing only those not already cached"""
+    cache = current_app.extensions['cohort_cache']
+    keys = {week: (week, weeks, ready_threshold) for week in range(first, last + 1)}
+    rows = cache.get_many(keys.values())
+    missing = [week for week, key in keys.items() if key not in rows]
+    if missing:
+        computed = compute_cohorts(min(missing), max(missing), weeks, ready_threshold)
+        computed = {keys[week]: row for week, row in computed.items()}
+        cache.put_many(computed)
+        rows.update(computed)
+    return [rows[keys[week]] for week in range(first, last + 1)]
+
+
+@bp.route('/api/admin/analytics/cohorts')
+@replica_reads
+@admission_controlled('admin')
+def admin_get_cohorts():
+    """Weekly signup cohorts with their survey funnel and week-by-week progress.
+    
+    ?start=/?end= dates pick the cohorts (default: the latest ANALYTICS_DEFAULT_COHORTS
+    weeks); ?weeks= is how many weeks after signup to follow each cohort.
+    """
+    if np is None:
+        return jsonify({'success': False, 'message': 'Cohort analytics require numpy'}), 501
+    
+    config = current_app.config
+    try:
+        end = parse_date_arg('end') or datetime.utcnow()
+        start = parse_date_arg('start') or end - timedelta(weeks=config['ANALYTICS_DEFAULT_COHORTS'] - 1)
+        weeks = int(request.args.get('weeks', config['ANALYTICS_COHORT_WEEKS']))
+    except ValueError:
+        return jsonify({'success': False, 'message': 'start and end must be ISO dates, weeks an integer'}), 400
+    
+    first, last = cohort_week(start), cohort_week(end)
+    if last < first:
+        return jsonify({'success': False, 'message': 'end must not be before start'}), 400
+    if last - first + 1 > config['ANALYTICS_MAX_COHORTS'] or not 1 <= weeks <= config['ANALYTICS_MAX_COHORTS']:
+        return jsonify({
+            'success': False,
+            'message': f"At most {config['ANALYTICS_MAX_COHORTS']} cohorts and weeks per report"
+        }), 400
+    
+    started = time.perf_counter()
+    cohorts = cohort_report(first, last, weeks, config['ANALYTICS_READY_THRESHOLD'])
+    return json_response({
+        'success': True,
+        'weeks': weeks,
+        'ready_threshold': config['ANALYTICS_READY_THRESHOLD'],
+        'cohorts': [row for row in cohorts if row['users']],
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 1)
+    })
+
+
+# ============= ARCHIVAL =============
+
+def parse_date_arg(name):
+    """Parse an optional ISO date/datetime query argument as naive UTC, like the stored values"""
+    value = request.args.get(name)
+    return naive_utc(datetime.fromisoformat(value)) if value else None
+
+
+def naive_utc(value):
+    """Drop the offset from an aware datetime after converting it to UTC"""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def ensure_archive():
+    """Create the archive table and its indexes inside the attached database"""
+    archived_survey_responses.create(db.engine, checkfirst=True)
+
+
+def archive_overlaps(start, end):
+    """True if the archive holds anything in [start, end); either bound may be open"""
+    oldest, newest = db.session.execute(db.select(
+        db.func.min(archived_survey_responses.c.completed_at),
+        db.func.max(archived_survey_responses.c.completed_at)
+    )).one()
+    if newest is None:
+        return False
+    return (start is None or newest >= start) and (end is None or oldest < end)
+
+
+def archive_surveys(older_than_days=None, batch_size=None, pause=None, progress=None):
+    """Move old survey responses to the archive in short, separate transactions"""
+    older_than_days = current_app.config['ARCHIVE_AFTER_DAYS'] if older_than_days is None else older_than_days
+    batch_size = batch_size or current_app.config['ARCHIVE_BATCH_SIZE']
+    pause = current_app.config['ARCHIVE_BATCH_PAUSE'] if pause is None else pause
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    
+    ensure_archive()
+    hot = SurveyResponse.__table__
+    columns = [c.name for c in hot.columns]
+    moved = 0
+    total = sum(
+        user_db.execute(db.select(db.func.count()).select_from(hot).where(hot.c.completed_at < cutoff)).scalar()
+        for user_db in user_sessions()
+    ) if progress else 0
+    
+    def copy_batch(user_db):
+        ids = user_db.execute(
+            db.select(hot.c.id).where(hot.c.completed_at < cutoff).order_by(hot.c.id).limit(batch_size)
+        ).scalars().all()
+        if ids:
+            now = datetime.utcnow()
+            user_db.execute(
+                archived_survey_responses.insert().prefix_with('OR REPLACE').from_select(
+                    columns + ['archived_at'],
+                    db.select(*hot.c, db.literal(now, db.DateTime)).where(hot.c.id.in_(ids))
+                )
+            )
+        return ids
+    
+    # Every shard attaches the same archive database, so each one moves its own rows
+    for shard in range(max(get_user_shards().count, 1)):
+        while True:
+            # Copy, then delete, as two queued writes: under WAL one transaction spanning
+            # both files could lose rows in a crash, while a copy without its delete is
+            # just replaced by the next run (OR REPLACE)
+            ids = run_write(copy_batch, shard)
+            if not ids:
+                break
+            run_write(lambda user_db, ids=ids: user_db.execute(hot.delete().where(hot.c.id.in_(ids))), shard)
+            
+            moved += len(ids)
+            if progress:
+                progress(moved / max(total, moved), f'Archived {moved} of {total}')
+            if len(ids) < batch_size:
+                break
+            time.sleep(pause)
+    
+    return {'archived': moved, 'cutoff': cutoff.isoformat()}
+
+
+@bp.route('/api/admin/archive', methods=['GET'])
+@replica_reads
+@admission_controlled('admin')
+def admin_get_archive():
+    """Hot vs archived survey counts"""
+    ensure_archive()
+    archived = archived_survey_responses
+    return jsonify({
+        'success': True,
+        'hot_surveys': sum(user_db.execute(db.select(db.func.count()).select_from(SurveyResponse)).scalar()
+                           for user_db in user_sessions()),
+        'archived_surveys': db.session.execute(db.select(db.func.count()).select_from(archived)).scalar(),
+        'oldest_archived': export_value(db.session.execute(db.select(db.func.min(archived.c.completed_at))).scalar()),
+        'newest_archived': export_value(db.session.execute(db.select(db.func.max(archived.c.completed_at))).scalar()),
+        'archive_after_days': current_app.config['ARCHIVE_AFTER_DAYS']
+    }), 200
+
+
+@bp.route('/api/admin/archive', methods=['POST'])
+@admission_controlled('admin')
+def admin_run_archive():
+    """Queue archival of survey responses older than older_than_days (default from config)"""
+    data = request.get_json(silent=True) or {}
+    
+    try:
+        older_than_days = int(data.get('older_than_days', current_app.config['ARCHIVE_AFTER_DAYS']))
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'message': 'older_than_days must be an integer'}), 400
+    
+    try:
+        job = enqueue_job('archive-surveys', {'older_than_days': older_than_days})
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    return jsonify({'success': True, 'message': 'Archive job queued', 'job': job.to_dict()}), 202
+
+
+@bp.cli.command('archive-surveys')
+@click.option('--older-than-days', type=int, default=None)
+@click.option('--batch-size', type=int, default=None)
+def archive_surveys_command(older_than_days, batch_size):
+    """Move old survey responses into the archive database"""
+    result = archive_surveys(older_than_days=older_than_days, batch_size=batch_size)
+    click.echo(f"Archived {result['archived']} survey responses older than {result['cutoff']}")
+
+
+# ============= EXPORTS =============
+
+EXPORT_FORMATS = ('csv', 'ndjson', 'parquet')
+
+
+def survey_export_query():
+    return db.select(
+        SurveyResponse.id,
+        SurveyResponse.user_id,
+        User.email.label('user_email'),
+        User.name.label('user_name'),
+        SurveyResponse.question_set_id,
+        SurveyResponse.answers,
+        SurveyResponse.completed_at
+    ).join(User, User.id == SurveyResponse.user_id).order_by(SurveyResponse.id)
+
+
+def user_export_query():
+    return db.select(
+        User.id,
+        User.email,
+        User.name,
+        User.created_at,
+        UserProfile.skill_readiness,
+        UserProfile.verified_skills,
+        UserProfile.total_xp,
+        UserProfile.certifications
+    ).outerjoin(UserProfile, UserProfile.user_id == User.id).order_by(User.id)
+
+
+EXPORT_QUERIES = {
+    'surveys': survey_export_query,
+    'users': user_export_query
+}
+
+
+def prepare_export(kind, batch_size):
+    """(stmt, columns, batches) for an export; survey answers are decoded per batch"""
+    stmt = EXPORT_QUERIES[kind]()
+    columns = list(stmt.selected_columns.keys())
+    batches = iter_user_batches(lambda shard: stmt, batch_size)
+    if kind != 'surveys':
+        return stmt, columns, batches
+    
+    codebook = get_codebook()
+    width = codebook.max_question_count()
+    at = columns.index('question_set_id')
+    
+    def decoded(batches):
+        for batch in batches:
+            yield [
+                row[:at + 1] + tuple(codebook.decode(row[at], row[at + 1], width).values()) + row[at + 2:]
+                for row in batch
+            ]
+    
+    columns = columns[:at + 1] + [f'question_{i}' for i in range(1, width + 1)] + columns[at + 2:]
+    return stmt, columns, decoded(batches)
+
+
+def iter_export_batches(stmt, batch_size, engine=None):
+    """Yield lists of row tuples from a server-side cursor, one batch at a time"""
+    with (engine or read_engine()).connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(stmt)
+        for partition in result.partitions():
+            yield [tuple(row) for row in partition]
+
+
+def export_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def iter_csv(columns, batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for batch in batches:
+        writer.writerows([[export_value(v) for v in row] for row in batch])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def iter_ndjson(columns, batches):
+    for batch in batches:
+        yield ''.join(
+            json.dumps(dict(zip(columns, (export_value(v) for v in row)))) + '\n'
+            for row in batch
+        )
+
+
+def arrow_schema(stmt, columns):
+    """Map the selected SQLAlchemy column types onto an Arrow schema (derived columns are strings)"""
+    types = {column.name: column.type for column in stmt.selected_columns}
+    fields = []
+    for name in columns:
+        if isinstance(types.get(name), db.Integer):
+            arrow_type = pa.int64()
+        elif isinstance(types.get(name), db.DateTime):
+            arrow_type = pa.timestamp('us')
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+def write_parquet(stmt, columns, batches, fileobj):
+    """Write batches as Parquet row groups so only one batch is held in memory"""
+    schema = arrow_schema(stmt, columns)
+    with pq.ParquetWriter(fileobj, schema, compression='zstd') as writer:
+        for batch in batches:
+            arrays = [pa.array(list(values), type=field.type)
+                      for values, field in zip(zip(*batch), schema)]
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+
+
+@bp.route('/api/admin/export/<kind>')
+@replica_reads
+def admin_export(kind):
+    """Stream surveys or users as CSV, NDJSON or Parquet"""
+    fmt = request.args.get('format', 'csv')
+    
+    if kind not in EXPORT_QUERIES:
+        return jsonify({'success': False, 'message': 'Unknown export'}), 404
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'success': False, 'message': 'format must be csv, ndjson or parquet'}), 400
+    if fmt == 'parquet' and pq is None:
+        return jsonify({'success': False, 'message': 'Parquet export requires pyarrow'}), 501
+    export_limiter = get_limiter('export')
+    if not export_limiter.acquire():
+        return rejection_response(503, 'Too many exports running, please retry shortly', export_limiter.queue_timeout)
+    
+    try:
+        stmt, columns, batches = prepare_export(kind, current_app.config['EXPORT_BATCH_SIZE'])
+        filename = f'{kind}-{datetime.utcnow():%Y%m%d%H%M%S}.{fmt}'
+        
+        if fmt == 'parquet':
+            # Parquet needs a seekable footer, so spool to disk and stream the file
+            spool = tempfile.TemporaryFile()
+            write_parquet(stmt, columns, batches, spool)
+            spool.seek(0)
+            response = send_file(spool, mimetype='application/vnd.apache.parquet',
+                                 as_attachment=True, download_name=filename)
+        else:
+            chunks = iter_csv(columns, batches) if fmt == 'csv' else iter_ndjson(columns, batches)
+            mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+            response = Response(stream_with_context(chunks), mimetype=mimetype)
+            response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+    except Exception:
+        export_limiter.release()
+        raise
+    
+    # Hold the export slot until the last chunk has been sent
+    response.call_on_close(export_limiter.release)
+    return response
+
+
+@bp.cli.command('export')
+@click.argument('kind', type=click.Choice(list(EXPORT_QUERIES)))
+@click.option('--format', 'fmt', type=click.Choice(EXPORT_FORMATS), default='csv')
+@click.option('--output', '-o', default='-', help='Output file (default: stdout)')
+@click.option('--batch-size', default=None, type=int)
+def export_command(kind, fmt, output, batch_size):
+    """Stream surveys or users to a CSV, NDJSON or Parquet file"""
+    stmt, columns, batches = prepare_export(kind, batch_size or current_app.config['EXPORT_BATCH_SIZE'])
+    
+    if fmt == 'parquet':
+        if pq is None:
+            raise click.ClickException('Parquet export requires pyarrow')
+        if output == '-':
+            raise click.ClickException('Parquet export needs --output')
+        with open(output, 'wb') as f:
+            write_parquet(stmt, columns, batches, f)
+        return
+    
+    chunks = iter_csv(columns, batches) if fmt == 'csv' else iter_ndjson(columns, batches)
+    with click.open_file(output, 'w', encoding='utf-8') as f:
+        for chunk in chunks:
+            f.write(chunk)
+
+
+# ============= BACKGROUND JOBS =============
+
+JOB_HANDLERS = {}
+JOB_PARAM_CHECKS = {}
+
+
+def job_handler(kind, check=None):
+    """Register fn(ctx, **params) as the handler for a job kind.
+    
+    check(params) -> params validates (raising ValueError) and may rewrite a job's
+    params, defaults filled in, before it is queued.
+    """
+    def decorator(fn):
+        JOB_HANDLERS[kind] = fn
+        if check is not None:
+            JOB_PARAM_CHECKS[kind] = check
+        return fn
+    return decorator
+
+
+def positive_int(value):
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobContext:
+    """Handed to job handlers for progress reporting and cooperative cancellation"""
+    
+    def __init__(self, job_id, cancel_event):
+        self.job_id = job_id
+        self._cancel = cancel_event
+        self._last_report = 0.0
+    
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+    
+    def progress(self, fraction, message=None):
+        """Record progress (throttled) and raise JobCancelled if cancel was requested.
+        
+        Writes on its own connection, so handlers should commit their batch first.
+        """
+        if self._cancel.is_set():
+            raise JobCancelled()
+        
+        now = time.monotonic()
+        if now - self._last_report < 0.5 and fraction < 1:
+            return
+        self._last_report = now
+        
+        table = Job.__table__
+        with db.engine.begin() as conn:
+            conn.execute(table.update().where(table.c.id == self.job_id).values(
+                progress=min(max(fraction, 0.0), 1.0),
+                message=message[:200] if message else None,
+                heartbeat_at=datetime.utcnow()
+            ))
+    
+    def replace_params(self, params):
+        """Overwrite the job's stored params, e.g. once secrets in them have been used"""
+        table = Job.__table__
+        with db.engine.begin() as conn:
+            conn.execute(table.update().where(table.c.id == self.job_id).values(params=json.dumps(params)))
+
+
+class JobRunner:
+    """Per-worker thread pool that claims queued jobs from the job table"""
+    
+    def __init__(self, app):
+        self.app = app
+        self.workers = app.config['JOB_WORKERS']
+        self.poll_interval = app.config['JOB_POLL_INTERVAL']
+        self.stale_after = app.config['JOB_STALE_AFTER']
+        self.backup_interval = app.config['BACKUP_INTERVAL']
+        # Refresh twice per staleness window so a replica is always there to read
+        staleness = app.config['READ_REPLICA_MAX_STALENESS']
+        self.replica_interval = staleness / 2 if staleness else None
+        self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix='job')
+        self._running = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name='job-poller', daemon=True)
+            self._thread.start()
+    
+    def notify(self):
+        self._wake.set()
+    
+    def _loop(self):
+        while True:
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            try:
+                with self.app.app_context():
+                    self.poll()
+            except Exception:
+                self.app.logger.exception('Job poller failed')
+    
+    def poll(self):
+        table = Job.__table__
+        now = datetime.utcnow()
+        
+        with self._lock:
+            running = dict(self._running)
+        
+        with db.engine.begin() as conn:
+            if running:
+                # Heartbeat our jobs and pick up cancel requests from any worker
+                conn.execute(table.update().where(table.c.id.in_(running)).values(heartbeat_at=now))
+                cancelled = conn.execute(db.select(table.c.id).where(
+                    table.c.id.in_(running), table.c.cancel_requested.is_(True)
+                )).scalars().all()
+                for job_id in cancelled:
+                    running[job_id].set()
+            
+            # Jobs whose worker died (restart, crash) go back on the queue
+            conn.execute(table.update().where(
+                table.c.status == 'running',
+                table.c.heartbeat_at < now - timedelta(seconds=self.stale_after)
+            ).values(status='queued', owner_pid=None))
+            
+            if self.backup_interval:
+                schedule_job(conn, 'backup', now, self.backup_interval)
+            if self.replica_interval:
+                schedule_job(conn, 'refresh-replica', now, self.replica_interval)
+            
+            free = self.workers - len(running)
+            if free <= 0:
+                return
+            queued = conn.execute(db.select(table.c.id).where(
+                table.c.status == 'queued'
+            ).order_by(table.c.id).limit(free)).scalars().all()
+            
+            claimed = []
+            for job_id in queued:
+                # Conditional UPDATE is the claim: exactly one worker process wins
+                if conn.execute(table.update().where(
+                    table.c.id == job_id, table.c.status == 'queued'
+                ).values(
+                    status='running', owner_pid=os.getpid(), started_at=now,
+                    heartbeat_at=now, attempts=table.c.attempts + 1
+                )).rowcount:
+                    claimed.append(job_id)
+        
+        # Start them once committed: a job scheduled above is not visible to other connections before
+        for job_id in claimed:
+            cancel = threading.Event()
+            with self._lock:
+                self._running[job_id] = cancel
+            self.executor.submit(self._run, job_id, cancel)
+    
+    def _run(self, job_id, cancel):
+        with self.app.app_context():
+            try:
+                job = db.session.get(Job, job_id)
+                handler = JOB_HANDLERS[job.kind]
+                params = json.loads(job.params)
+                db.session.commit()
+                
+                result = handler(JobContext(job_id, cancel), **params)
+                finish_job(job_id, 'succeeded', result=result)
+            except JobCancelled:
+                db.session.rollback()
+                finish_job(job_id, 'cancelled')
+            except Exception as e:
+                db.session.rollback()
+                self.app.logger.exception('Job %s failed', job_id)
+                finish_job(job_id, 'failed', error=''.join(traceback.format_exception_only(e)).strip())
+            finally:
+                db.session.remove()
+                with self._lock:
+                    self._running.pop(job_id, None)
+                self._wake.set()
+    
+    def stats(self):
+        with self._lock:
+            return {'workers': self.workers, 'running': sorted(self._running)}
+
+
+def redact_secrets(value):
+    """Mask passwords and their hashes in job params (bulk imports carry them until imported)"""
+    if isinstance(value, dict):
+        return {k: '***' if k in ('password', 'password_hash') else redact_secrets(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [redact_secrets(v) for v in value]
+    return value
+
+
+def finish_job(job_id, status, result=None, error=None):
+    table = Job.__table__
+    values = {'status': status, 'finished_at': datetime.utcnow(), 'error': error}
+    if status == 'succeeded':
+        values.update(progress=1.0, result=dumps(result).decode())
+    with db.engine.begin() as conn:
+        params = conn.execute(db.select(table.c.params).where(table.c.id == job_id)).scalar()
+        values['params'] = json.dumps(redact_secrets(json.loads(params or '{}')))
+        conn.execute(table.update().where(table.c.id == job_id).values(**values))
+
+
+def enqueue_job(kind, params=None):
+    """Persist a queued job and wake this worker's runner (any worker may claim it).
+    
+    Params that the handler would reject raise ValueError here, not in the runner.
+    """
+    if not isinstance(kind, str) or kind not in JOB_HANDLERS:
+        raise ValueError(f'Unknown job kind: {kind}')
+    try:
+        bound = inspect.signature(JOB_HANDLERS[kind]).bind(None, **(params or {}))
+    except TypeError as e:
+        raise ValueError(f'Invalid params for {kind}: {e}')
+    bound.apply_defaults()
+    params = dict(list(bound.arguments.items())[1:])
+    if kind in JOB_PARAM_CHECKS:
+        params = JOB_PARAM_CHECKS[kind](params)
+    
+    job = Job(kind=kind, params=json.dumps(params))
+    db.session.add(job)
+    db.session.commit()
+    
+    runner = current_app.extensions.get('job_runner')
+    if runner is not None:
+        runner.notify()
+    return job
+
+
+def schedule_job(conn, kind, now, interval):
+    """Queue a job of this kind unless one is pending or was queued within the interval.
+    
+    A single INSERT ... SELECT, so job runners in several workers never double up.
+    """
+    table = Job.__table__
+    recent = db.select(table.c.id).where(table.c.kind == kind, db.or_(
+        table.c.status.in_(('queued', 'running')),
+        table.c.created_at > now - timedelta(seconds=interval)
+    ))
+    conn.execute(table.insert().from_select(
+        ['kind', 'status', 'params', 'progress', 'cancel_requested', 'attempts', 'created_at'],
+        db.select(db.literal(kind), db.literal('queued'), db.literal('{}'), db.literal(0.0),
+                  db.literal(False), db.literal(0), db.literal(now)).where(~recent.exists())
+    ))
+
+
+def start_job_runner(app):
+    """Start this process's job runner; call after fork, never in the prefork master"""
+    runner = app.extensions.get('job_runner')
+    if runner is None:
+        runner = app.extensions['job_runner'] = JobRunner(app)
+    runner.start()
+    return runner
+
+
+def job_export_dir():
+    path = os.path.join(current_app.instance_path, current_app.config['JOB_EXPORT_DIR'])
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+@job_handler('recompute-stats')
+def recompute_stats_job(ctx):
+    with using_replica():
+        stats = compute_admin_stats()
+        ctx.progress(0.5, 'Counting survey answers')
+        stats['answers'] = survey_answer_stats(current_app.config['SURVEY_QUESTION_SET'])
+    return stats
+
+
+def check_archive_job(params):
+    days = params['older_than_days']
+    if days is not None and (isinstance(days, bool) or not isinstance(days, int) or days < 0):
+        raise ValueError('older_than_days must be a non-negative integer')
+    return params
+
+
+@job_handler('archive-surveys', check=check_archive_job)
+def archive_surveys_job(ctx, older_than_days=None):
+    return archive_surveys(older_than_days=older_than_days, progress=ctx.progress)
+
+
+def check_export_job(params):
+    if params['kind'] not in EXPORT_QUERIES:
+        raise ValueError(f'kind must be one of {", ".join(EXPORT_QUERIES)}')
+    if params['format'] not in EXPORT_FORMATS:
+        raise ValueError(f'format must be one of {", ".join(EXPORT_FORMATS)}')
+    if params['format'] == 'parquet' and pq is None:
+        raise ValueError('Parquet export requires pyarrow')
+    return params
+
+
+@job_handler('export', check=check_export_job)
+def export_job(ctx, kind, format='csv'):
+    filename = f'job-{ctx.job_id}-{kind}.{format}'
+    path = os.path.join(job_export_dir(), filename)
+    with using_replica():
+        total = sum(
+            user_db.execute(db.select(db.func.count()).select_from(EXPORT_QUERIES[kind]().subquery())).scalar()
+            for user_db in user_sessions()
+        )
+        stmt, columns, batches = prepare_export(kind, current_app.config['EXPORT_BATCH_SIZE'])
+        
+        def tracked(batches):
+            done = 0
+            for batch in batches:
+                done += len(batch)
+                ctx.progress(done / max(total, 1), f'Exported {done} of {total} rows')
+                yield batch
+        
+        if format == 'parquet':
+            if pq is None:
+                raise RuntimeError('Parquet export requires pyarrow')
+            with open(path, 'wb') as f:
+                write_parquet(stmt, columns, tracked(batches), f)
+        else:
+            chunks = iter_csv(columns, tracked(batches)) if format == 'csv' else iter_ndjson(columns, tracked(batches))
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+    
+    return {'filename': filename, 'rows': total}
+
+
+def check_delete_users_job(params):
+    if not isinstance(params['user_ids'], list) or not all(positive_int(i) for i in params['user_ids']):
+        raise ValueError('user_ids must be a list of user ids')
+    if not positive_int(params['batch_size']):
+        raise ValueError('batch_size must be a positive integer')
+    return params
+
+
+@job_handler('delete-users', check=check_delete_users_job)
+def delete_users_job(ctx, user_ids, batch_size=500):
+    """Delete users with their profiles and surveys, one committed batch at a time"""
+    user_ids = sorted({int(user_id) for user_id in user_ids})
+    deleted = 0
+    
+    def delete(user_db, shard_ids):
+        user_db.execute(SurveyResponse.__table__.delete().where(SurveyResponse.user_id.in_(shard_ids)))
+        user_db.execute(UserProfile.__table__.delete().where(UserProfile.user_id.in_(shard_ids)))
+        return user_db.execute(User.__table__.delete().where(User.id.in_(shard_ids))).rowcount
+    
+    for start in range(0, len(user_ids), batch_size):
+        batch = user_ids[start:start + batch_size]
+        for shard, shard_ids in group_by_shard(batch).items():
+            deleted += run_write(partial(delete, shard_ids=shard_ids), shard)
+        release_user_ids(batch)
+        ctx.progress((start + len(batch)) / len(user_ids), f'Deleted {deleted} users')
+    
+    return {'deleted': deleted, 'requested': len(user_ids)}
+
+
+def check_import_users_job(params):
+    if not isinstance(params['users'], list) or not all(isinstance(u, dict) for u in params['users']):
+        raise ValueError('users must be a list of objects')
+    if not positive_int(params['batch_size']):
+        raise ValueError('batch_size must be a positive integer')
+    
+    # Shape only: hashing thousands of passwords is the job's work, not the request's
+    users = []
+    for item in params['users']:
+        email, password, name = item.get('email'), item.get('password'), item.get('name', '')
+        if not all(isinstance(v, str) for v in (email or '', password or '', name)):
+            raise ValueError('email, password and name must be strings')
+        users.append({'email': email, 'name': name, 'password': password})
+    return {**params, 'users': users}
+
+
+@job_handler('import-users', check=check_import_users_job)
+def import_users_job(ctx, users, batch_size=100):
+    """Create users (and empty profiles) from [{email, password, name}], skipping existing emails.
+    
+    Each batch's passwords are hashed as it starts, and the stored params are
+    rewritten after it, so raw passwords only stay in the job row until imported.
+    """
+    shards = get_user_shards()
+    created = skipped = 0
+    
+    for start in range(0, len(users), batch_size):
+        batch = users[start:start + batch_size]
+        for item in batch:
+            # A rerun after a crash finds the batches already done hashed
+            password = item.pop('password', None)
+            if password:
+                item['password_hash'] = generate_password_hash(password)
+        emails = [u.get('email') for u in batch if u.get('email')]
+        existing = existing_emails(emails)
+        fresh = {}
+        
+        for item in batch:
+            email = item.get('email')
+            if not email or not item.get('password_hash') or normalize_email(email) in existing:
+                skipped += 1
+                continue
+            existing.add(normalize_email(email))
+            fresh[normalize_email(email)] = item
+        
+        # One directory write reserves the batch's ids, then one write per shard adds its rows
+        user_ids = allocate_user_ids(fresh)
+        by_shard = {}
+        for email, user_id in user_ids.items():
+            by_shard.setdefault(shards.shard_of(user_id), []).append((user_id, fresh[email]))
+        
+        for shard, rows in by_shard.items():
+            def create(user_db, rows=rows):
+                rejected = []
+                for user_id, item in rows:
+                    user = User(id=user_id, email=item['email'], name=item.get('name', ''),
+                                password_hash=item['password_hash'])
+                    user.profile = UserProfile(skill_readiness=0, verified_skills=0, total_xp=0, certifications=0)
+                    # Registered meanwhile: skip the row, keep the rest of the batch
+                    try:
+                        with user_db.begin_nested():
+                            user_db.add(user)
+                    except IntegrityError:
+                        rejected.append(user_id)
+                return rejected
+            
+            rejected = run_write(create, shard)
+            release_user_ids([user_id for user_id in rejected if user_id is not None])
+            created += len(rows) - len(rejected)
+            skipped += len(rejected)
+        skipped += len(fresh) - len(user_ids)
+        ctx.replace_params({'users': users, 'batch_size': batch_size})
+        ctx.progress((start + len(batch)) / len(users), f'Imported {created} users')
+    
+    return {'created': created, 'skipped': skipped}
+
+
+@bp.route('/api/admin/jobs', methods=['POST'])
+@admission_controlled('admin')
+def admin_create_job():
+    """Queue a background job: {"kind": ..., "params": {...}}"""
+    data = request.get_json(silent=True) or {}
+    params = data.get('params') or {}
+    
+    if not isinstance(params, dict):
+        return jsonify({'success': False, 'message': 'params must be an object'}), 400
+    try:
+        job = enqueue_job(data.get('kind'), params)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    
+    return jsonify({'success': True, 'message': 'Job queued', 'job': job.to_dict()}), 202
+
+
+@bp.route('/api/admin/jobs')
+@admission_controlled('admin')
+def admin_get_jobs():
+    """Recent jobs, newest first"""
+    jobs = Job.query.order_by(Job.id.desc()).limit(100).all()
+    runner = current_app.extensions.get('job_runner')
+    return jsonify({
+        'success': True,
+        'jobs': [job.to_dict() for job in jobs],
+        'runner': runner.stats() if runner else None
+    }), 200
+
+
+@bp.route('/api/admin/jobs/<int:job_id>')
+@admission_controlled('admin')
+def admin_get_job(job_id):
+    """Job status, progress and result"""
+    job = db.session.get(Job, job_id)
+    if not job:
+        return jsonify({'success': False, 'message': 'Job not found'}), 404
+    return jsonify({'success': True, 'job': job.to_dict()}), 200
+
+
+@bp.route('/api/admin/jobs/<int:job_id>/cancel', methods=['POST'])
+@admission_controlled('admin')
+def admin_cancel_job(job_id):
+    """Cancel a queued job now, or ask a running one to stop at its next progress report"""
+    table = Job.__table__
+    db.session.execute(table.update().where(table.c.id == job_id, table.c.status == 'queued').values(
+        status='cancelled', cancel_requested=True, finished_at=datetime.utcnow()
+    ))
+    db.session.execute(table.update().where(table.c.id == job_id, table.c.status == 'running').values(
+        cancel_requested=True
+    ))
+    db.session.commit()
+    
+    job = db.session.get(Job, job_id)
+    if not job:
+        return jsonify({'success': False, 'message': 'Job not found'}), 404
+    
+    runner = current_app.extensions.get('job_runner')
+    if runner is not None:
+        runner.notify()
+    return jsonify({'success': True, 'message': 'Cancellation requested', 'job': job.to_dict()}), 200
+
+
+@bp.route('/api/admin/jobs/<int:job_id>/download')
+@admission_controlled('admin')
+def admin_download_job_result(job_id):
+    """Download the file produced by a finished export job"""
+    job = db.session.get(Job, job_id)
+    result = json.loads(job.result) if job and job.result else {}
+    
+    if not job or job.status != 'succeeded' or 'filename' not in result:
+        return jsonify({'success': False, 'message': 'No file for this job'}), 404
+    return send_file(os.path.join(job_export_dir(), result['filename']), as_attachment=True)
+
+
+@bp.route('/api/admin/users/bulk-delete', methods=['POST'])
+@admission_controlled('admin')
+def admin_bulk_delete_users():
+    """Queue deletion of many users: {"user_ids": [...]}"""
+    user_ids = (request.get_json(silent=True) or {}).get('user_ids')
+    
+    try:
+        job = enqueue_job('delete-users', {'user_ids': user_ids})
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    return jsonify({'success': True, 'message': 'Delete job queued', 'job': job.to_dict()}), 202
+
+
+@bp.route('/api/admin/users/import', methods=['POST'])
+@admission_controlled('admin')
+def admin_import_users():
+    """Queue a bulk user import: {"users": [{"email", "password", "name"}, ...]}"""
+    users = (request.get_json(silent=True) or {}).get('users')
+    
+    try:
+        job = enqueue_job('import-users', {'users': users})
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    return jsonify({'success': True, 'message': 'Import job queued', 'job': job.to_dict()}), 202
+
+
+# ============= BACKUPS =============
+
+def backup_dir(*parts):
+    path = os.path.join(current_app.instance_path, current_app.config['BACKUP_DIR'], *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def backup_sources():
+    """(name, path) of every database file holding app data: primary, archive, user shards"""
+    with db.engine.connect() as conn:
+        sources = [(name, path) for _, name, path in conn.exec_driver_sql('PRAGMA database_list') if path]
+    shards = get_user_shards()
+    sources += [(f'users_s{shard}', shards.path(shards.generation, shard)) for shard in range(shards.count)]
+    return [(name, path) for name, path in sources if os.path.exists(path)]
+
+
+class BackupRestarted(Exception):
+    pass
+
+
+def copy_database(path, target, progress=None):
+    """Online copy of one SQLite file with the backup API; returns how often it restarted.
+    
+    Each step holds the source's read lock only briefly, so writers carry on between
+    steps. A write from another connection sends the copy back to the start, so each
+    restart takes four times bigger steps; after BACKUP_MAX_RESTARTS the last attempt
+    copies the whole file in one step, holding writers off just for that long.
+    """
+    config = current_app.config
+    pages = config['BACKUP_PAGES_PER_STEP']
+    
+    for restarts in itertools.count():
+        last = {'remaining': None}
         
-        <div class="header">
-            <h1>🔧 Admin Dashboard</h1>
-            <p>Manage users, view statistics, and monitor system activity</p>
-        </div>
+        def step(status, remaining, total):
+            if last['remaining'] is not None and remaining > last['remaining']:
+                raise BackupRestarted()
+            last['remaining'] = remaining
+            if progress:
+                progress(1 - remaining / total if total else 1.0)
+            if remaining:
+                # The backup API only sleeps when the source is busy; let writers in regardless
+                time.sleep(config['BACKUP_STEP_PAUSE'])
+        
+        try:
+            with closing(sqlite3.connect(path)) as source, closing(sqlite3.connect(target)) as copy:
+                source.backup(copy, pages=pages, progress=step, sleep=config['BACKUP_STEP_PAUSE'])
+                # The copy inherits WAL mode; a self-contained file opens read-only anywhere
+                copy.execute('PRAGMA journal_mode=DELETE')
+            return restarts
+        except BackupRestarted:
+            pages = -1 if restarts + 1 >= config['BACKUP_MAX_RESTARTS'] else pages * 4
 
-        <div class="stats-grid">
-            <div class="stat-box">
-                <div class="stat-number" id="totalUsers">0</div>
-                <div class="stat-label">Total Users</div>
-            </div>
-            <div class="stat-box">
-                <div class="stat-number" id="totalSurveys">0</div>
-                <div class="stat-label">Surveys Completed</div>
-            </div>
-            <div class="stat-box">
-                <div class="stat-number" id="totalChallenges">0</div>
-                <div class="stat-label">Active Challenges</div>
-            </div>
-            <div class="stat-box">
-                <div class="stat-number" id="avgSkill">0%</div>
-                <div class="stat-label">Avg Skill Readiness</div>
-            </div>
-        </div>
 
-        <div class="tabs">
-            <button class="tab active" onclick="switchTab('users')">👥 Users</button>
-            <button class="tab" onclick="switchTab('surveys')">📋 Surveys</button>
-            <button class="tab" onclick="switchTab('challenges')">🎯 Challenges</button>
-        </div>
+def table_counts(path):
+    with closing(sqlite3.connect(f'file:{path}?mode=ro', uri=True)) as conn:
+        tables = [name for name, in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name")]
+        return {table: conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0] for table in tables}
 
-        <div class="content-box">
-            <div class="tab-content active" id="users-tab">
-                <input type="text" class="search-box" id="searchUsers" placeholder="🔍 Search users by email or name...">
-                <div id="usersContent">
-                    <div class="loading">
-                        <div class="spinner"></div>
-                        <p>Loading users...</p>
-                    </div>
-                </div>
-            </div>
 
-            <div class="tab-content" id="surveys-tab">
-                <input type="text" class="search-box" id="searchSurveys" placeholder="🔍 Search surveys...">
-                <div id="surveysContent">
-                    <div class="loading">
-                        <div class="spinner"></div>
-                        <p>Loading surveys...</p>
-                    </div>
-                </div>
-            </div>
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(partial(f.read, 1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
 
-            <div class="tab-content" id="challenges-tab">
-                <div id="challengesContent">
-                    <div class="loading">
-                        <div class="spinner"></div>
-                        <p>Loading challenges...</p>
-                    </div>
-                </div>
-            </div>
-        </div>
-    </div>
 
-    <button class="refresh-btn" onclick="loadAllData()" title="Refresh Data">↻</button>
+def store_backup_chunks(path):
+    """Gzip a database copy into the chunk store, one object per BACKUP_CHUNK_SIZE bytes.
+    
+    SQLite rewrites pages in place, so between two snapshots most chunks hash the
+    same and only the changed ones are written; 'object' is the whole file's hash.
+    """
+    root = backup_dir('chunks')
+    whole = hashlib.sha256()
+    chunks, compressed_size, stored_size, new_chunks = [], 0, 0, 0
+    
+    with open(path, 'rb') as src:
+        for data in iter(partial(src.read, current_app.config['BACKUP_CHUNK_SIZE']), b''):
+            whole.update(data)
+            sha256 = hashlib.sha256(data).hexdigest()
+            target = os.path.join(root, f'{sha256}.gz')
+            if not os.path.exists(target):
+                with tempfile.NamedTemporaryFile(dir=root, delete=False) as tmp:
+                    tmp.write(gzip.compress(data, mtime=0))
+                os.replace(tmp.name, target)
+                stored_size += os.path.getsize(target)
+                new_chunks += 1
+            compressed_size += os.path.getsize(target)
+            chunks.append(sha256)
+    
+    return {
+        'object': whole.hexdigest(),
+        'chunks': chunks,
+        'size': os.path.getsize(path),
+        'compressed_size': compressed_size,
+        'stored_size': stored_size,
+        'new_chunks': new_chunks,
+        'reused': not new_chunks
+    }
 
-    <script>
-        let allUsers = [];
-        let allSurveys = [];
-        let allChallenges = [];
 
-        function switchTab(tabName) {
-            document.querySelectorAll('.tab').forEach(t => t.classList.remove('active'));
-            document.querySelectorAll('.tab-content').forEach(c => c.classList.remove('active'));
-            
-            event.target.classList.add('active');
-            document.getElementById(tabName + '-tab').classList.add('active');
-        }
+def list_snapshots():
+    """Snapshot manifests, oldest first"""
+    root = backup_dir('snapshots')
+    manifests = []
+    for name in sorted(os.listdir(root)):
+        if name.endswith('.json'):
+            with open(os.path.join(root, name)) as f:
+                manifests.append(json.load(f))
+    return manifests
 
-        async function loadAllData() {
-            await Promise.all([
-                loadUsers(),
-                loadSurveys(),
-                loadChallenges(),
-                loadStats()
-            ]);
-        }
 
-        async function loadUsers() {
-            try {
-                const response = await fetch('/api/admin/users');
-                const data = await response.json();
-                allUsers = data.users || [];
-                displayUsers(allUsers);
-            } catch (error) {
-                console.error('Error loading users:', error);
-                document.getElementById('usersContent').innerHTML = '<div class="empty-state">Error loading users</div>';
-            }
-        }
+def load_snapshot(snapshot_id=None):
+    """One snapshot's manifest; the newest when snapshot_id is None"""
+    snapshots = list_snapshots()
+    for manifest in reversed(snapshots):
+        if snapshot_id in (None, manifest['id']):
+            return manifest
+    raise LookupError(f'No backup snapshot {snapshot_id}' if snapshot_id else 'No backup snapshots yet')
+
+
+def prune_snapshots(keep):
+    """Drop all but the newest `keep` snapshots and any chunk or object none of the rest uses"""
+    snapshots = list_snapshots()
+    for manifest in snapshots[:-keep]:
+        os.remove(os.path.join(backup_dir('snapshots'), f"{manifest['id']}.json"))
+    
+    entries = [entry for manifest in snapshots[-keep:] for entry in manifest['databases'].values()]
+    used = {
+        'chunks': ({sha256 for entry in entries for sha256 in entry.get('chunks', ())}, '.gz'),
+        # Whole-file objects of snapshots taken before chunking
+        'objects': ({entry['object'] for entry in entries if 'chunks' not in entry}, '.db.gz')
+    }
+    for folder, (hashes, suffix) in used.items():
+        for name in os.listdir(backup_dir(folder)):
+            if name.endswith(suffix) and name[:-len(suffix)] not in hashes:
+                os.remove(os.path.join(backup_dir(folder), name))
 
-        function displayUsers(users) {
-            const content = document.getElementById('usersContent');
+
+def backup_databases(progress=None):
+    """Snapshot every database without stopping writers; returns the manifest.
+    
+    Databases are copied one after another, so a snapshot is consistent per file,
+    not across files. Every page is still read, but only chunks that no kept
+    snapshot already holds are written to the store.
+    """
+    sources = backup_sources()
+    created = datetime.utcnow()
+    snapshot_id = created.strftime('%Y%m%dT%H%M%S%fZ')
+    started = time.perf_counter()
+    manifest = {'id': snapshot_id, 'created_at': created.isoformat(), 'databases': {}}
+    
+    with tempfile.TemporaryDirectory(dir=backup_dir()) as scratch:
+        for index, (name, path) in enumerate(sources):
+            def step(fraction, index=index, name=name):
+                if progress:
+                    progress((index + fraction) / len(sources), f'Copying {name}')
             
-            if (users.length === 0) {
-                content.innerHTML = '<div class="empty-state"><p>No users found. <a href="/register-page">Register a user</a></p></div>';
-                return;
+            copy = os.path.join(scratch, f'{name}.db')
+            restarts = copy_database(path, copy, step)
+            manifest['databases'][name] = {
+                'source': path,
+                'restarts': restarts,
+                'tables': table_counts(copy),
+                **store_backup_chunks(copy)
             }
+            os.remove(copy)
+    
+    manifest['elapsed_seconds'] = round(time.perf_counter() - started, 3)
+    target = os.path.join(backup_dir('snapshots'), f'{snapshot_id}.json')
+    with open(target + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(target + '.tmp', target)
+    prune_snapshots(current_app.config['BACKUP_KEEP'])
+    return manifest
 
-            let html = '<table><thead><tr><th>ID</th><th>Email</th><th>Name</th><th>Skill Readiness</th><th>Verified Skills</th><th>Total XP</th><th>Joined</th><th>Actions</th></tr></thead><tbody>';
 
-            users.forEach(user => {
-                const profile = user.profile || {};
-                const date = new Date(user.created_at).toLocaleDateString();
-                
-                html += `
-                    <tr>
-                        <td><span class="badge badge-info">#${user.id}</span></td>
-                        <td>${user.email}</td>
-                        <td>${user.name || 'N/A'}</td>
-                        <td><span class="badge badge-success">${profile.skill_readiness || 0}%</span></td>
-                        <td>${profile.verified_skills || 0}</td>
-                        <td>${profile.total_xp || 0}</td>
-                        <td>${date}</td>
-                        <td>
-                            <button class="btn btn-primary" onclick="viewUserDetails(${user.id})">View</button>
-                            <button class="btn btn-danger" onclick="deleteUser(${user.id})">Delete</button>
-                        </td>
-                    </tr>
-                `;
-            });
+def restore_snapshot(manifest, target_dir):
+    """Unpack a snapshot's files into target_dir (never over the live databases)"""
+    os.makedirs(target_dir, exist_ok=True)
+    live = {os.path.realpath(path) for _, path in backup_sources()}
+    restored = {}
+    for name, entry in manifest['databases'].items():
+        path = os.path.join(target_dir, os.path.basename(entry['source']))
+        if os.path.realpath(path) in live:
+            raise RuntimeError(f'Refusing to overwrite the live database {path}')
+        if 'chunks' in entry:
+            parts = [os.path.join(backup_dir('chunks'), f'{sha256}.gz') for sha256 in entry['chunks']]
+        else:
+            parts = [os.path.join(backup_dir('objects'), f"{entry['object']}.db.gz")]
+        with open(path, 'wb') as f:
+            for part in parts:
+                with gzip.open(part, 'rb') as gz:
+                    shutil.copyfileobj(gz, f, 1 << 20)
+        restored[name] = path
+    return restored
 
-            html += '</tbody></table>';
-            content.innerHTML = html;
-        }
 
-        async function loadSurveys() {
-            try {
-                const response = await fetch('/api/admin/surveys');
-                const data = await response.json();
-                allSurveys = data.surveys || [];
-                displaySurveys(allSurveys);
-            } catch (error) {
-                console.error('Error loading surveys:', error);
-                document.getElementById('surveysContent').innerHTML = '<div class="empty-state">Error loading surveys</div>';
+def verify_snapshot(snapshot_id=None):
+    """Restore a snapshot to a scratch directory and check every file really opens intact"""
+    manifest = load_snapshot(snapshot_id)
+    report = {'id': manifest['id'], 'ok': True, 'databases': {}}
+    with tempfile.TemporaryDirectory(dir=backup_dir()) as scratch:
+        for name, path in restore_snapshot(manifest, scratch).items():
+            entry = manifest['databases'][name]
+            with closing(sqlite3.connect(f'file:{path}?mode=ro', uri=True)) as conn:
+                integrity = conn.execute('PRAGMA integrity_check(1)').fetchone()[0]
+            checks = {
+                'hash_matches': file_sha256(path) == entry['object'],
+                'integrity': integrity,
+                'counts_match': table_counts(path) == entry['tables']
             }
+            checks['ok'] = checks['hash_matches'] and integrity == 'ok' and checks['counts_match']
+            report['databases'][name] = checks
+            report['ok'] = report['ok'] and checks['ok']
+    return report
+
+
+@job_handler('backup')
+def backup_job(ctx):
+    manifest = backup_databases(progress=ctx.progress)
+    return {
+        'id': manifest['id'],
+        'databases': {
+            name: {key: entry[key] for key in ('size', 'compressed_size', 'stored_size', 'new_chunks', 'reused')}
+            for name, entry in manifest['databases'].items()
         }
+    }
 
-        function displaySurveys(surveys) {
-            const content = document.getElementById('surveysContent');
-            
-            if (surveys.length === 0) {
-                content.innerHTML = '<div class="empty-state"><p>No surveys completed yet</p></div>';
-                return;
-            }
 
-            let html = '<table><thead><tr><th>ID</th><th>User Email</th><th>Q1</th><th>Q2</th><th>Q3</th><th>Q4</th><th>Q5</th><th>Completed</th></tr></thead><tbody>';
+@bp.route('/api/admin/backups')
+@admission_controlled('admin')
+def admin_get_backups():
+    """Backup snapshots, newest first; queue one with POST /api/admin/jobs {"kind": "backup"}"""
+    snapshots = [{
+        'id': manifest['id'],
+        'created_at': manifest['created_at'],
+        'elapsed_seconds': manifest['elapsed_seconds'],
+        'size': sum(entry['size'] for entry in manifest['databases'].values()),
+        'compressed_size': sum(entry['compressed_size'] for entry in manifest['databases'].values()),
+        # What this snapshot added to the store (snapshots from before chunking: whole objects)
+        'stored_size': sum(entry.get('stored_size', 0 if entry['reused'] else entry['compressed_size'])
+                           for entry in manifest['databases'].values()),
+        'databases': sorted(manifest['databases'])
+    } for manifest in reversed(list_snapshots())]
+    return jsonify({'success': True, 'snapshots': snapshots})
 
-            surveys.forEach(survey => {
-                const date = new Date(survey.completed_at).toLocaleDateString();
-                
-                html += `
-                    <tr>
-                        <td><span class="badge badge-info">#${survey.id}</span></td>
-                        <td>${survey.user_email || 'Unknown'}</td>
-                        <td>${survey.question_1 || 'N/A'}</td>
-                        <td>${survey.question_2 || 'N/A'}</td>
-                        <td>${survey.question_3 || 'N/A'}</td>
-                        <td>${survey.question_4 || 'N/A'}</td>
-                        <td>${survey.question_5 || 'N/A'}</td>
-                        <td>${date}</td>
-                    </tr>
-                `;
-            });
 
-            html += '</tbody></table>';
-            content.innerHTML = html;
-        }
+@bp.cli.command('backup')
+def backup_command():
+    """Snapshot every database into the backup store while the app keeps running"""
+    manifest = backup_databases()
+    for name, entry in manifest['databases'].items():
+        note = 'unchanged, reused' if entry['reused'] else (
+            f"{entry['new_chunks']} of {len(entry['chunks'])} chunks new, {entry['stored_size']:,} bytes gzipped")
+        click.echo(f"  {name}: {entry['size']:,} bytes ({note})")
+    click.echo(f"Snapshot {manifest['id']} written in {manifest['elapsed_seconds']}s")
 
-        async function loadChallenges() {
-            try {
-                const response = await fetch('/api/admin/challenges');
-                const data = await response.json();
-                allChallenges = data.challenges || [];
-                displayChallenges(allChallenges);
-            } catch (error) {
-                console.error('Error loading challenges:', error);
-                document.getElementById('challengesContent').innerHTML = '<div class="empty-state">Error loading challenges</div>';
-            }
-        }
 
-        function displayChallenges(challenges) {
-            const content = document.getElementById('challengesContent');
-            
-            if (challenges.length === 0) {
-                content.innerHTML = '<div class="empty-state"><p>No challenges available</p></div>';
-                return;
-            }
+@bp.cli.command('verify-backup')
+@click.option('--snapshot', 'snapshot_id', help='Snapshot id (default: the newest)')
+def verify_backup_command(snapshot_id):
+    """Restore a snapshot to a scratch directory and check integrity and row counts"""
+    try:
+        report = verify_snapshot(snapshot_id)
+    except LookupError as e:
+        raise click.ClickException(str(e))
+    for name, checks in report['databases'].items():
+        click.echo(f"  {name}: {'ok' if checks['ok'] else 'FAILED'} "
+                   f"(integrity: {checks['integrity']}, hash matches: {checks['hash_matches']}, "
+                   f"row counts match: {checks['counts_match']})")
+    if not report['ok']:
+        raise click.ClickException(f"Snapshot {report['id']} failed verification")
+    click.echo(f"Snapshot {report['id']} restores cleanly")
 
-            let html = '<table><thead><tr><th>ID</th><th>Title</th><th>Company</th><th>Domain</th><th>Difficulty</th><th>Deadline</th><th>Status</th></tr></thead><tbody>';
 
-            challenges.forEach(challenge => {
-                let difficultyClass = 'badge-info';
-                if (challenge.difficulty === 'Easy') difficultyClass = 'badge-success';
-                if (challenge.difficulty === 'Hard') difficultyClass = 'badge-warning';
-                
-                html += `
-                    <tr>
-                        <td><span class="badge badge-info">#${challenge.id}</span></td>
-                        <td>${challenge.title}</td>
-                        <td>${challenge.company}</td>
-                        <td>${challenge.domain}</td>
-                        <td><span class="badge ${difficultyClass}">${challenge.difficulty}</span></td>
-                        <td>${challenge.deadline}</td>
-                        <td>${challenge.status}</td>
-                    </tr>
-                `;
-            });
+@bp.cli.command('restore-backup')
+@click.option('--snapshot', 'snapshot_id', help='Snapshot id (default: the newest)')
+@click.option('--into', 'target_dir', required=True, type=click.Path(file_okay=False),
+              help='Directory to write the restored database files to')
+def restore_backup_command(snapshot_id, target_dir):
+    """Unpack a snapshot's database files into a directory"""
+    try:
+        restored = restore_snapshot(load_snapshot(snapshot_id), target_dir)
+    except (LookupError, RuntimeError) as e:
+        raise click.ClickException(str(e))
+    for name, path in restored.items():
+        click.echo(f'  {name}: {path}')
+    click.echo('Stop the app, then move these files over the live ones to complete the restore.')
 
-            html += '</tbody></table>';
-            content.innerHTML = html;
-        }
 
-        async function loadStats() {
-            try {
-                const response = await fetch('/api/admin/stats');
-                const data = await response.json();
-                
-                document.getElementById('totalUsers').textContent = data.total_users || 0;
-                document.getElementById('totalSurveys').textContent = data.total_surveys || 0;
-                document.getElementById('totalChallenges').textContent = data.total_challenges || 0;
-                document.getElementById('avgSkill').textContent = (data.avg_skill_readiness || 0) + '%';
-            } catch (error) {
-                console.error('Error loading stats:', error);
-            }
-        }
+# ============= REPLICA REFRESH =============
 
-        function viewUserDetails(userId) {
-            const user = allUsers.find(u => u.id === userId);
-            if (!user) return;
-            
-            alert(`User Details:\\n\\nEmail: ${user.email}\\nName: ${user.name || 'N/A'}\\nID: ${user.id}\\nJoined: ${new Date(user.created_at).toLocaleDateString()}`);
-        }
+def replica_dir():
+    path = os.path.join(current_app.instance_path, current_app.config['READ_REPLICA_DIR'])
+    os.makedirs(path, exist_ok=True)
+    return path
 
-        async function deleteUser(userId) {
-            if (!confirm('Are you sure you want to delete this user?')) return;
+
+def refresh_replica(progress=None):
+    """Copy every database into a new replica directory and make it the current one.
+    
+    The copies use the online backup API, so writers carry on meanwhile. As with
+    backups, each file is consistent on its own; its age counts from the start.
+    """
+    sources = backup_sources()
+    shards = get_user_shards()
+    built = datetime.utcnow()
+    replica_id = built.strftime('%Y%m%dT%H%M%S%fZ')
+    started = time.perf_counter()
+    root = replica_dir()
+    target = os.path.join(root, replica_id)
+    os.makedirs(target)
+    manifest = {
+        'id': replica_id,
+        'built_at': built.isoformat(),
+        'generation': shards.generation,
+        'shards': shards.count,
+        'databases': {}
+    }
+    
+    for index, (name, path) in enumerate(sources):
+        def step(fraction, index=index, name=name):
+            if progress:
+                progress((index + fraction) / len(sources), f'Copying {name}')
+        
+        copy_database(path, os.path.join(target, f'{name}.db'), step)
+        manifest['databases'][name] = f'{name}.db'
+    
+    manifest['elapsed_seconds'] = round(time.perf_counter() - started, 3)
+    current = os.path.join(root, 'current.json')
+    previous = replica_id
+    if os.path.exists(current):
+        with open(current) as f:
+            previous = min(previous, json.load(f)['id'])
+    with open(current + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(current + '.tmp', current)
+    
+    # Other workers may still be reading the previous replica; anything older can go
+    for name in os.listdir(root):
+        if name < previous and os.path.isdir(os.path.join(root, name)):
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+    return manifest
+
+
+@job_handler('refresh-replica')
+def refresh_replica_job(ctx):
+    manifest = refresh_replica(progress=ctx.progress)
+    return {'id': manifest['id'], 'elapsed_seconds': manifest['elapsed_seconds']}
+
+
+@bp.cli.command('refresh-replica')
+def refresh_replica_command():
+    """Copy every database into a new read replica for admin and reporting reads"""
+    manifest = refresh_replica()
+    click.echo(f"Replica {manifest['id']} of {', '.join(manifest['databases'])} "
+               f"written in {manifest['elapsed_seconds']}s")
+
+
+# ============= SYNTHETIC DATA =============
+
+SYNTHETIC_DOMAINS = ('Web Development', 'Machine Learning', 'Frontend Development', 'Data Engineering',
+                     'Cloud Infrastructure', 'Mobile Development', 'Cybersecurity', 'DevOps')
+SYNTHETIC_COMPANIES = ('TechCorp Inc.', 'DataMinds AI', 'DesignHub', 'CloudNine', 'SecureStack',
+                       'Appify', 'PipelineWorks', 'QuantLeap')
+SYNTHETIC_TOPICS = ('API', 'Dashboard', 'Pipeline', 'Component Library', 'Microservice', 'Classifier',
+                    'Search Engine', 'Auth Flow', 'Monitoring Stack', 'Recommendation System')
+SYNTHETIC_STATUSES = ('Start Challenge', 'Continue Challenge', 'View Details')
+
+
+def db_timestamp(value):
+    """Format a datetime the way SQLAlchemy's SQLite DateTime stores it"""
+    return value.isoformat(' ', 'microseconds')
+
+
+def drop_version_triggers(conn):
+    for table in VERSIONED_TABLES:
+        for operation in ('insert', 'update', 'delete'):
+            conn.exec_driver_sql(f'DROP TRIGGER IF EXISTS bump_{table}_{operation}')
+
+
+def generate_synthetic_data(users, challenges, survey_rate=0.6, days=730, seed=42, batch_size=20000, echo=print):
+    """Bulk-load deterministic, realistically distributed rows; returns row counts"""
+    rng = random.Random(seed)
+    now = datetime.utcnow().replace(microsecond=0)
+    
+    # Hashing is the slow part of registration; a handful of real hashes is plenty.
+    # User N logs in with password "synthetic-{N % 8}".
+    password_hashes = [generate_password_hash(f'synthetic-{i}') for i in range(8)]
+    # Register option codes before any bulk transaction holds the write lock
+    codebook = get_codebook()
+    encoded = [
+        [codebook.code_for(1, position, value, register=True) for value in options]
+        for position, options in enumerate(CAREER_TEST_OPTIONS, start=1)
+    ]
+    option_weights = (0.4, 0.3, 0.2, 0.1)
+    
+    shards = get_user_shards()
+    count = max(shards.count, 1)
+    with ExitStack() as stack:
+        conns = [stack.enter_context(engine.connect()) for engine in user_engines()]
+        main = stack.enter_context(db.engine.connect()) if shards.count else conns[0]
+        every = [main, *conns] if shards.count else conns
+        
+        # Sharded ids come from the directory; survey ids follow UserShards.next_survey_id
+        id_table = 'user_directory' if shards.count else '"user"'
+        first_user = main.exec_driver_sql(f'SELECT COALESCE(MAX(id), 0) FROM {id_table}').scalar() + 1
+        next_survey_ids = []
+        for shard, conn in enumerate(conns):
+            highest = conn.exec_driver_sql('SELECT COALESCE(MAX(id), 0) FROM survey_response').scalar()
+            next_survey_ids.append((max(highest, shards.survey_id_floor) // count + 1) * count + shard)
+        
+        synchronous = main.exec_driver_sql('PRAGMA synchronous').scalar()
+        counts = {'users': 0, 'surveys': 0, 'challenges': 0}
+        try:
+            for conn in every:
+                conn.exec_driver_sql('PRAGMA synchronous = OFF')
+                drop_version_triggers(conn)
+                if conn in conns:
+                    drop_xp_triggers(conn)
+                conn.commit()
             
-            try {
-                const response = await fetch(`/api/admin/users/${userId}`, {
-                    method: 'DELETE'
-                });
-                const data = await response.json();
+            for start in range(first_user, first_user + users, batch_size):
+                user_rows, profile_rows, survey_rows = ([[] for _ in conns] for _ in range(3))
+                directory_rows = []
+                for user_id in range(start, min(start + batch_size, first_user + users)):
+                    shard = shards.shard_of(user_id)
+                    email = f'synthetic{user_id}@example.test'
+                    # Signups skew recent: triangular peaks at "now"
+                    created = now - timedelta(seconds=int(rng.triangular(0, days, 0) * 86400))
+                    directory_rows.append((user_id, email))
+                    user_rows[shard].append((user_id, email, email, password_hashes[user_id % 8],
+                                             f'Synthetic User {user_id}', db_timestamp(created)))
+                    readiness = min(100, max(0, int(rng.gauss(55, 20))))
+                    profile_rows[shard].append((user_id, readiness, int(rng.expovariate(1 / 4)),
+                                                int(rng.lognormvariate(6.5, 1.0)), int(rng.expovariate(1 / 1.5))))
+                    
+                    if rng.random() < survey_rate:
+                        for _ in range(1 + (rng.random() < 0.15)):
+                            answers = bytes(
+                                0 if rng.random() < 0.03 else rng.choices(codes, option_weights)[0]
+                                for codes in encoded
+                            )
+                            completed = created + timedelta(seconds=int(rng.expovariate(1 / 3) * 86400))
+                            survey_rows[shard].append((next_survey_ids[shard], user_id, 1, answers,
+                                                       db_timestamp(min(completed, now))))
+                            next_survey_ids[shard] += count
                 
-                if (data.success) {
-                    alert('User deleted successfully');
-                    loadAllData();
-                } else {
-                    alert('Error deleting user: ' + data.message);
-                }
-            } catch (error) {
-                console.error('Error deleting user:', error);
-                alert('Error deleting user');
-            }
-        }
+                if shards.count:
+                    main.exec_driver_sql('INSERT INTO user_directory (id, email) VALUES (?, ?)', directory_rows)
+                for shard, conn in enumerate(conns):
+                    if not user_rows[shard]:
+                        continue
+                    conn.exec_driver_sql(
+                        'INSERT INTO "user" (id, email, email_normalized, password_hash, name, created_at) '
+                        'VALUES (?, ?, ?, ?, ?, ?)',
+                        user_rows[shard])
+                    conn.exec_driver_sql(
+                        'INSERT INTO user_profile (user_id, skill_readiness, verified_skills, total_xp, '
+                        'certifications) VALUES (?, ?, ?, ?, ?)', profile_rows[shard])
+                    if survey_rows[shard]:
+                        conn.exec_driver_sql(
+                            'INSERT INTO survey_response (id, user_id, question_set_id, answers, completed_at) '
+                            'VALUES (?, ?, ?, ?, ?)', survey_rows[shard])
+                for conn in every:
+                    conn.commit()
+                counts['users'] += len(directory_rows)
+                counts['surveys'] += sum(map(len, survey_rows))
+                echo(f'  users: {counts["users"]:,}/{users:,}')
+            
+            for start in range(0, challenges, batch_size):
+                challenge_rows = []
+                for _ in range(start, min(start + batch_size, challenges)):
+                    domain = rng.choice(SYNTHETIC_DOMAINS)
+                    deadline = now + timedelta(days=rng.randint(-60, 120))
+                    challenge_rows.append((
+                        f'{domain} {rng.choice(SYNTHETIC_TOPICS)} Challenge', rng.choice(SYNTHETIC_COMPANIES),
+                        domain, rng.choices(('Easy', 'Medium', 'Hard'), (0.3, 0.5, 0.2))[0],
+                        db_timestamp(deadline.replace(hour=23, minute=59, second=59)), rng.choice(SYNTHETIC_STATUSES)
+                    ))
+                main.exec_driver_sql(
+                    'INSERT INTO challenge (title, company, domain, difficulty, deadline_at, status) '
+                    'VALUES (?, ?, ?, ?, ?, ?)', challenge_rows)
+                main.commit()
+                counts['challenges'] += len(challenge_rows)
+                echo(f'  challenges: {counts["challenges"]:,}/{challenges:,}')
+        finally:
+            for conn in every:
+                conn.rollback()
+                conn.exec_driver_sql(f'PRAGMA synchronous = {int(synchronous)}')
+            # Even after a failed load: the batches committed so far are real rows
+            restore_generated_triggers(shards)
+    return counts
 
-        document.getElementById('searchUsers').addEventListener('input', (e) => {
-            const query = e.target.value.toLowerCase();
-            const filtered = allUsers.filter(u => 
-                u.email.toLowerCase().includes(query) || 
-                (u.name && u.name.toLowerCase().includes(query))
-            );
-            displayUsers(filtered);
-        });
 
-        document.getElementById('searchSurveys').addEventListener('input', (e) => {
-            const query = e.target.value.toLowerCase();
-            const filtered = allSurveys.filter(s => 
-                (s.user_email && s.user_email.toLowerCase().includes(query)) ||
-                Object.values(s).some(v => String(v).toLowerCase().includes(query))
-            );
-            displaySurveys(filtered);
-        });
+def restore_generated_triggers(shards):
+    """Put generate-data's triggers back and bump every version once for the whole load.
+    
+    The new profiles get baseline XP events and the rollups are rebuilt in one pass.
+    """
+    ensure_version_triggers()
+    for engine in shards.engines:
+        ensure_version_triggers(engine, SHARDED_TABLE_NAMES)
+    for engine in user_engines():
+        ensure_xp_history(engine)
+    for engine in [db.engine, *shards.engines]:
+        with engine.begin() as conn:
+            conn.execute(TableVersion.__table__.update().values(version=TableVersion.version + 1))
 
-        loadAllData();
-        setInterval(loadStats, 30000);
-    </script>
-</body>
-</html>
-    '''
 
+@bp.cli.command('generate-data')
+@click.option('--users', type=int, default=100000, show_default=True)
+@click.option('--challenges', type=int, default=10000, show_default=True)
+@click.option('--survey-rate', type=float, default=0.6, show_default=True,
+              help='Share of users who completed the career test')
+@click.option('--days', type=int, default=730, show_default=True, help='Signup history to spread users over')
+@click.option('--seed', type=int, default=42, show_default=True)
+@click.option('--batch-size', type=int, default=20000, show_default=True)
+def generate_data_command(users, challenges, survey_rate, days, seed, batch_size):
+    """Fill the database with deterministic synthetic data for scale testing"""
+    init_schema()
+    started = time.perf_counter()
+    counts = generate_synthetic_data(users, challenges, survey_rate, days, seed, batch_size, echo=click.echo)
+    click.echo(f"Generated {counts['users']:,} users, {counts['surveys']:,} surveys and "
+               f"{counts['challenges']:,} challenges in {time.perf_counter() - started:.1f}s")
 
-@app.route('/api/admin/users')
-def admin_get_users():
-    """Get all users with profiles"""
-    users = User.query.all()
-    users_data = []
-    
-    for user in users:
-        user_dict = user.to_dict()
-        profile = UserProfile.query.filter_by(user_id=user.id).first()
-        user_dict['profile'] = profile.to_dict() if profile else {}
-        users_data.append(user_dict)
+
+# ============= INITIALIZATION =============
+
+def create_missing_indexes(engine=None, tables=None):
+    """create_all() skips existing tables, so add indexes declared since they were created"""
+    for table in tables or db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine or db.engine, checkfirst=True)
+
+
+DEADLINE_FORMATS = ('%b %d, %Y', '%B %d, %Y', '%Y-%m-%d', '%m/%d/%Y')
+
+
+def parse_legacy_deadline(text):
+    """'Jan 25, 2026' -> end of that day; None if unparseable"""
+    text = (text or '').strip()
+    for fmt in DEADLINE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).replace(hour=23, minute=59, second=59)
+        except ValueError:
+            continue
+    try:
+        return naive_utc(datetime.fromisoformat(text))
+    except ValueError:
+        return None
+
+
+def migrate_challenge_deadlines():
+    """Add challenge.deadline_at and backfill it from the old free-text deadline"""
+    columns = {c['name'] for c in db.inspect(db.engine).get_columns('challenge')}
     
-    return jsonify({'success': True, 'users': users_data}), 200
+    with db.engine.begin() as conn:
+        if 'deadline_at' not in columns:
+            conn.execute(db.text('ALTER TABLE challenge ADD COLUMN deadline_at DATETIME'))
+        if 'deadline' not in columns:
+            return
+        
+        legacy = conn.execute(db.text(
+            'SELECT id, deadline FROM challenge WHERE deadline_at IS NULL AND deadline IS NOT NULL'
+        )).all()
+        params = [{'id': row.id, 'deadline_at': parse_legacy_deadline(row.deadline)} for row in legacy]
+        params = [p for p in params if p['deadline_at'] is not None]
+        if not legacy:
+            return
+        if params:
+            table = Challenge.__table__
+            conn.execute(
+                table.update().where(table.c.id == db.bindparam('challenge_id')).values(deadline_at=db.bindparam('deadline_at')),
+                [{'challenge_id': p['id'], 'deadline_at': p['deadline_at']} for p in params]
+            )
+        print(f"✅ Backfilled {len(params)} of {len(legacy)} challenge deadlines")
 
 
-@app.route('/api/admin/surveys')
-def admin_get_surveys():
-    """Get all survey responses"""
-    surveys = SurveyResponse.query.all()
-    surveys_data = []
+def ensure_default_question_set():
+    """The five-question career test that predates versioned question sets"""
+    if db.session.get(SurveyQuestionSet, 1) is None:
+        db.session.add(SurveyQuestionSet(id=1, name='Career test', question_count=5))
+        db.session.commit()
+    # Answers are limited to registered options; older databases only have the ones used so far
+    get_codebook().register_options(1, CAREER_TEST_OPTIONS)
+
+
+LEGACY_SURVEY_COLUMNS = ('question_1', 'question_2', 'question_3', 'question_4', 'question_5')
+
+
+def migrate_survey_answers(batch_size=1000):
+    """Pack the old question_1..question_5 strings into answers, hot and archived"""
+    codebook = get_codebook()
+    legacy = ', '.join(LEGACY_SURVEY_COLUMNS)
+    pending = ' OR '.join(f'{c} IS NOT NULL' for c in LEGACY_SURVEY_COLUMNS)
+    cleared = ', '.join(f'{c} = NULL' for c in LEGACY_SURVEY_COLUMNS)
     
-    for survey in surveys:
-        survey_dict = survey.to_dict()
-        user = User.query.get(survey.user_id)
-        survey_dict['user_email'] = user.email if user else 'Unknown'
-        surveys_data.append(survey_dict)
+    for schema in (None, 'archive'):
+        table = f'{schema}.survey_response' if schema else 'survey_response'
+        columns = {c['name'] for c in db.inspect(db.engine).get_columns('survey_response', schema=schema)}
+        
+        if 'answers' not in columns:
+            with db.engine.begin() as conn:
+                conn.execute(db.text(f'ALTER TABLE {table} ADD COLUMN question_set_id INTEGER NOT NULL DEFAULT 1'))
+                conn.execute(db.text(f"ALTER TABLE {table} ADD COLUMN answers BLOB NOT NULL DEFAULT x''"))
+        if 'question_1' not in columns:
+            continue
+        
+        migrated = 0
+        while True:
+            with db.engine.connect() as conn:
+                rows = conn.execute(db.text(
+                    f'SELECT id, {legacy} FROM {table} WHERE {pending} LIMIT :limit'
+                ), {'limit': batch_size}).all()
+            if not rows:
+                break
+            
+            # Encode outside the write transaction: new codes commit on their own connection
+            params = [
+                {'row_id': row[0], 'answers': codebook.encode(1, dict(enumerate(row[1:], start=1)), register=True)}
+                for row in rows
+            ]
+            with db.engine.begin() as conn:
+                conn.execute(db.text(
+                    f'UPDATE {table} SET answers = :answers, question_set_id = 1, {cleared} WHERE id = :row_id'
+                ), params)
+            migrated += len(rows)
+        
+        if migrated:
+            print(f"✅ Packed {migrated} survey responses in {table} (VACUUM to reclaim space)")
+
+
+def normalize_user_emails(engine, batch_size, backfill=True):
+    """Add and backfill user.email_normalized on one database; returns rows filled"""
+    columns = {c['name'] for c in db.inspect(engine).get_columns('user')}
+    if 'email_normalized' not in columns:
+        with engine.begin() as conn:
+            conn.execute(db.text('ALTER TABLE "user" ADD COLUMN email_normalized VARCHAR(120)'))
     
-    return jsonify({'success': True, 'surveys': surveys_data}), 200
+    filled = 0
+    if not backfill:
+        return filled
+    while True:
+        with engine.connect() as conn:
+            rows = conn.execute(db.text(
+                'SELECT id, email FROM "user" WHERE email_normalized IS NULL LIMIT :limit'
+            ), {'limit': batch_size}).all()
+        if not rows:
+            return filled
+        with engine.begin() as conn:
+            conn.execute(db.text('UPDATE "user" SET email_normalized = :email WHERE id = :user_id'),
+                         [{'user_id': row.id, 'email': normalize_email(row.email)} for row in rows])
+        filled += len(rows)
 
 
-@app.route('/api/admin/challenges')
-def admin_get_challenges():
-    """Get all challenges"""
-    challenges = Challenge.query.all()
-    return jsonify({
-        'success': True,
-        'challenges': [c.to_dict() for c in challenges]
-    }), 200
+def duplicate_email_groups():
+    """[[keeper, duplicate, ...], ...]: users sharing a normalized email, oldest id first"""
+    with db.engine.connect() as conn:
+        if not get_user_shards().count:
+            groups = conn.execute(db.text(
+                'SELECT group_concat(id) FROM "user" GROUP BY email_normalized HAVING COUNT(*) > 1'
+            )).scalars().all()
+        else:
+            # Duplicates can sit on different shards, so group them in one place
+            conn.execute(db.text('CREATE TEMP TABLE email_owner (email TEXT NOT NULL, user_id INTEGER NOT NULL)'))
+            for engine in user_engines():
+                for batch in iter_export_batches(db.select(User.email_normalized, User.id), 5000, engine):
+                    conn.exec_driver_sql('INSERT INTO email_owner (email, user_id) VALUES (?, ?)', batch)
+            groups = conn.execute(db.text(
+                'SELECT group_concat(user_id) FROM email_owner GROUP BY email HAVING COUNT(*) > 1'
+            )).scalars().all()
+            conn.execute(db.text('DROP TABLE email_owner'))
+            conn.commit()
+    return [sorted(int(user_id) for user_id in group.split(',')) for group in groups]
 
 
-@app.route('/api/admin/stats')
-def admin_get_stats():
-    """Get overall statistics"""
-    total_users = User.query.count()
-    total_surveys = SurveyResponse.query.count()
-    total_challenges = Challenge.query.count()
+def merge_duplicate_users(keeper_id, duplicate_ids):
+    """Fold duplicate accounts into the keeper: their surveys move over and each
+    profile counter keeps its highest value"""
+    surveys = SurveyResponse.__table__
+    profiles = UserProfile.__table__
+    counters = [profiles.c[f] for f in PROFILE_COUNTERS]
+    keeper_db = user_session(keeper_id)
+    touched = {keeper_db}
     
-    profiles = UserProfile.query.all()
-    avg_skill = sum(p.skill_readiness for p in profiles) / len(profiles) if profiles else 0
+    merged = None
+    for user_id in [keeper_id, *duplicate_ids]:
+        profile = user_session(user_id).execute(db.select(*counters).where(profiles.c.user_id == user_id)).first()
+        if profile is not None:
+            merged = {f: max((merged or {}).get(f) or 0, profile._mapping[f] or 0) for f in PROFILE_COUNTERS}
     
-    return jsonify({
-        'success': True,
-        'total_users': total_users,
-        'total_surveys': total_surveys,
-        'total_challenges': total_challenges,
-        'avg_skill_readiness': round(avg_skill, 1)
-    }), 200
+    for user_id in duplicate_ids:
+        user_db = user_session(user_id)
+        touched.add(user_db)
+        if user_db is keeper_db:
+            user_db.execute(surveys.update().where(surveys.c.user_id == user_id).values(user_id=keeper_id))
+        else:
+            rows = user_db.execute(db.select(surveys).where(surveys.c.user_id == user_id)).mappings().all()
+            if rows:
+                keeper_db.execute(surveys.insert(), [{**row, 'user_id': keeper_id} for row in rows])
+            user_db.execute(surveys.delete().where(surveys.c.user_id == user_id))
+        user_db.execute(profiles.delete().where(profiles.c.user_id == user_id))
+        user_db.execute(User.__table__.delete().where(User.id == user_id))
+    
+    if merged is not None:
+        keeper_db.execute(profiles.delete().where(profiles.c.user_id == keeper_id))
+        keeper_db.execute(profiles.insert().values(user_id=keeper_id, **merged))
+    for user_db in touched:
+        user_db.commit()
+    release_user_ids(duplicate_ids)
 
 
-@app.route('/api/admin/users/<int:user_id>', methods=['DELETE'])
-def admin_delete_user(user_id):
-    """Delete a user"""
-    user = User.query.get(user_id)
+def migrate_user_emails(batch_size=1000):
+    """Backfill user.email_normalized, then merge accounts that only differed by case or spacing"""
+    shards = get_user_shards()
+    if shards.count:
+        # Once sharded the primary's user table is unused; it only needs the column
+        normalize_user_emails(db.engine, batch_size, backfill=False)
+    filled = sum(normalize_user_emails(engine, batch_size) for engine in user_engines())
+    if not filled:
+        return
     
-    if not user:
-        return jsonify({'success': False, 'message': 'User not found'}), 404
+    groups = duplicate_email_groups()
+    for group in groups:
+        merge_duplicate_users(group[0], group[1:])
     
-    db.session.delete(user)
-    db.session.commit()
+    if shards.count:
+        # The directory now holds normalized addresses too
+        for engine in shards.engines:
+            for batch in iter_export_batches(db.select(User.id, User.email_normalized), 5000, engine):
+                db.session.execute(
+                    UserDirectory.__table__.update().where(UserDirectory.id == db.bindparam('user_id'))
+                    .values(email=db.bindparam('email_normalized')),
+                    [{'user_id': user_id, 'email_normalized': email} for user_id, email in batch]
+                )
+        db.session.commit()
     
-    return jsonify({'success': True, 'message': 'User deleted successfully'}), 200
+    print(f"✅ Normalized {filled} user emails, merged {sum(len(g) - 1 for g in groups)} duplicate accounts")
 
 
-# ============= INITIALIZATION =============
+def init_schema():
+    """Create missing tables and indexes; run once per deploy, not per worker"""
+    db.create_all()
+    ensure_default_question_set()
+    migrate_challenge_deadlines()
+    ensure_archive()
+    migrate_survey_answers()
+    migrate_user_emails()
+    create_missing_indexes()
+    ensure_version_triggers()
+    if not get_user_shards().count:
+        ensure_xp_history()
+    init_user_shards()
+
 
-def init_db():
+def init_db(app):
     """Initialize database with sample data"""
     with app.app_context():
         # Create all tables
-        db.create_all()
+        init_schema()
         print("✅ Database tables created!")
         
-        # Add sample challenges if none exist
+        # Add sample challenges if none exist, open for the next few weeks
         if Challenge.query.count() == 0:
+            today = datetime.utcnow().replace(hour=23, minute=59, second=59, microsecond=0)
             challenges = [
                 Challenge(
                     title='Full-Stack Web Development Challenge',
                     company='TechCorp Inc.',
                     domain='Web Development',
                     difficulty='Medium',
-                    deadline='Jan 25, 2026',
+                    deadline=today + timedelta(days=21),
                     status='Continue Challenge'
                 ),
                 Challenge(
@@ -1139,7 +5158,7 @@ def init_db():
                     company='DataMinds AI',
                     domain='Machine Learning',
                     difficulty='Hard',
-                    deadline='Feb 1, 2026',
+                    deadline=today + timedelta(days=28),
                     status='Start Challenge'
                 ),
                 Challenge(
@@ -1147,7 +5166,7 @@ def init_db():
                     company='DesignHub',
                     domain='Frontend Development',
                     difficulty='Easy',
-                    deadline='Jan 30, 2026',
+                    deadline=today + timedelta(days=26),
                     status='View Details'
                 )
             ]
@@ -1162,6 +5181,100 @@ def init_db():
         print("\n")
 
 
+@bp.cli.command('init-db')
+def init_db_command():
+    """Create tables and indexes and add sample data"""
+    init_db(current_app._get_current_object())
+
+
+def warm_pool(engine, tables):
+    """Open the pool's connections up front and read each table's primary key index root"""
+    size = engine.pool.size() if hasattr(engine.pool, 'size') else 1
+    with ExitStack() as stack:
+        connections = [stack.enter_context(engine.connect()) for _ in range(size)]
+        for table in tables:
+            connections[0].execute(db.select(db.func.max(table.primary_key.columns[0])))
+
+
+def warm_worker(app):
+    """Per-worker warm-up after fork: fresh connections, hot pages, then ready"""
+    state = app.extensions['worker']
+    state.update(pid=os.getpid(), ready=False, warmed_at=None)
+    
+    with app.app_context():
+        # Connections inherited from the master must never be used in a child
+        db.engine.dispose(close=False)
+        shards = get_user_shards()
+        shards.dispose(close=False)
+        app.extensions['read_replica'].dispose(close=False)
+        warm_pool(db.engine, db.metadata.sorted_tables)
+        for engine in shards.engines:
+            warm_pool(engine, SHARDED_TABLES)
+        
+        # The lookups every survey and dashboard request makes, not whole tables
+        get_codebook().refresh()
+        dashboard_challenges()
+        db.session.remove()
+    
+    start_job_runner(app)
+    state.update(ready=True, warmed_at=datetime.utcnow().isoformat())
+
+
+@bp.route('/healthz')
+def healthz():
+    """Liveness probe"""
+    return jsonify({'success': True, 'pid': os.getpid()}), 200
+
+
+@bp.route('/readyz')
+def readyz():
+    """Readiness probe: 200 once this worker process has been warmed"""
+    state = current_app.extensions['worker']
+    ready = state['ready'] and state['pid'] == os.getpid()
+    return jsonify({
+        'success': ready,
+        'ready': ready,
+        'pid': os.getpid(),
+        'warmed_at': state['warmed_at'] if ready else None
+    }), 200 if ready else 503
+
+
+# ============= APP FACTORY =============
+
+def create_app(config=None):
+    """Build a configured app; schema setup and warm-up are separate steps"""
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    if config:
+        app.config.update(config)
+    
+    db.init_app(app)
+    app.register_blueprint(bp)
+    init_admission_control(app)
+    app.extensions['survey_codebook'] = SurveyCodebook()
+    app.extensions['challenge_cache'] = ChallengeListCache(app.config['CHALLENGE_CACHE_TTL'])
+    app.extensions['cohort_cache'] = CohortCache(app.config['ANALYTICS_CACHE_TTL'])
+    app.extensions['worker'] = {'pid': None, 'ready': False, 'warmed_at': None}
+    app.extensions['user_shards'] = UserShards(app)
+    app.extensions['write_queues'] = WriteQueues(app)
+    app.extensions['read_replica'] = ReadReplica(app)
+    app.teardown_appcontext(close_user_shard_sessions)
+    
+    archive_path = os.path.join(app.instance_path, app.config['ARCHIVE_DATABASE'])
+    with app.app_context():
+        event.listen(db.engine, 'connect', partial(attach_archive, archive_path))
+        event.listen(db.engine, 'connect', use_wal)
+    
+    return app
+
+
 if __name__ == '__main__':
-    init_db()
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    app = create_app()
+    # The debug reloader runs this script twice: a watcher, and the child that serves
+    # (WERKZEUG_RUN_MAIN set). Only the child gets connections and a job runner, and
+    # only the watcher sets up the schema, and only when asked (or use `flask init-db`).
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        warm_worker(app)
+    elif '--init-db' in sys.argv:
+        init_db(app)
+    app.run(debug=True, host='0.0.0.0', port=5000)
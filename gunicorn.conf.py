@@ -0,0 +1,34 @@
+"""Gunicorn settings for serving wsgi:app across all cores.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Environment overrides: BIND, WEB_CONCURRENCY (worker processes) and
+GUNICORN_THREADS (threads per worker). Admission-control limits in
+app.Config apply per worker process.
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# Build the app and check the schema once in the master, then fork
+preload_app = True
+
+timeout = 60
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers now and then; jitter keeps them from restarting together
+max_requests = 10000
+max_requests_jitter = 1000
+
+
+def post_fork(server, worker):
+    """Open fresh connections and warm caches in each worker before it serves"""
+    from app import warm_worker
+    from wsgi import app
+
+    warm_worker(app)
+    server.log.info('Worker %s warmed and ready', worker.pid)
@@ -0,0 +1,42 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, init_db, warm_worker
+
+
+def make_app(workdir, shards=0, **overrides):
+    # Absolute paths keep every database file out of the instance folder
+    config = {
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(workdir, 'skillverify.db'),
+        'ARCHIVE_DATABASE': os.path.join(workdir, 'skillverify_archive.db'),
+        'USER_SHARD_DATABASE': os.path.join(workdir, 'skillverify_users_g{generation}_s{shard}.db'),
+        'BACKUP_DIR': os.path.join(workdir, 'backups'),
+        'READ_REPLICA_DIR': os.path.join(workdir, 'replica'),
+        'JOB_EXPORT_DIR': os.path.join(workdir, 'exports'),
+        'JOB_POLL_INTERVAL': 0.1,
+        **overrides
+    }
+    app = create_app(config)
+    init_db(app)
+    if shards:
+        result = app.test_cli_runner().invoke(args=['reshard', '--shards', str(shards)])
+        assert result.exit_code == 0, result.output
+        app = create_app(config)
+    return app
+
+
+@pytest.fixture
+def app(tmp_path):
+    return make_app(str(tmp_path))
+
+
+@pytest.fixture(params=[0, 2], ids=['unsharded', 'sharded'])
+def running_app(request, tmp_path):
+    """An app, with and without user shards, with its job runner started"""
+    app = make_app(str(tmp_path), shards=request.param)
+    warm_worker(app)
+    return app
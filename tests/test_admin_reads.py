@@ -0,0 +1,62 @@
+import pytest
+from conftest import make_app
+
+from app import encode_cursor, get_limiter
+
+
+def test_archive_counts_come_from_the_replica(tmp_path):
+    app = make_app(str(tmp_path), READ_REPLICA_MAX_STALENESS=300)
+    assert app.test_cli_runner().invoke(args=['refresh-replica']).exit_code == 0
+    
+    client = app.test_client()
+    client.post('/api/register', json={'email': 'fresh@example.com', 'password': 'pw'})
+    client.post('/api/login', json={'email': 'fresh@example.com', 'password': 'pw'})
+    assert client.post('/api/submit-survey', json={'1': 'helping'}).status_code == 201
+    
+    # The copy predates the survey, so only a routed read misses it
+    counts = client.get('/api/admin/archive').get_json()
+    assert counts['hot_surveys'] == 0
+    assert client.get('/api/admin/admission').get_json()['read_replica']['reads'] == 1
+
+
+def test_admin_reads_are_admission_controlled(tmp_path):
+    app = make_app(str(tmp_path), ADMIN_CONCURRENCY=1, ADMIN_QUEUE_DEPTH=0)
+    client = app.test_client()
+    
+    with app.app_context():
+        limiter = get_limiter('admin')
+        assert limiter.acquire()
+        try:
+            for path in ('/api/admin/archive', '/api/admin/jobs', '/api/admin/jobs/1',
+                         '/api/admin/survey-question-sets'):
+                assert client.get(path).status_code == 503, path
+            assert client.post('/api/admin/users/import', json={'users': []}).status_code == 503
+            assert client.get('/api/admin/admission').status_code == 200
+        finally:
+            limiter.release()
+    assert client.get('/api/admin/archive').status_code == 200
+
+
+def test_survey_pages_walk_every_row(running_app):
+    client = running_app.test_client()
+    for i in range(3):
+        client.post('/api/register', json={'email': f'paged{i}@example.com', 'password': 'pw'})
+        client.post('/api/login', json={'email': f'paged{i}@example.com', 'password': 'pw'})
+        client.post('/api/submit-survey', json={'1': 'helping'})
+    
+    emails, cursor = [], None
+    while True:
+        page = client.get('/api/admin/surveys', query_string={'limit': 2, **({'cursor': cursor} if cursor else {})})
+        emails += [survey['user_email'] for survey in page.get_json()['surveys']]
+        cursor = page.get_json()['next_cursor']
+        if cursor is None:
+            break
+    assert sorted(emails) == [f'paged{i}@example.com' for i in range(3)]
+
+
+@pytest.mark.parametrize('cursor', [encode_cursor(1), encode_cursor([0, {'x': 1}]), encode_cursor([0]),
+                                    encode_cursor([True, 1]), encode_cursor([5, 1]), encode_cursor([0, '1']), 'not-base64!'])
+def test_malformed_survey_cursor_is_rejected(app, cursor):
+    response = app.test_client().get('/api/admin/surveys', query_string={'cursor': cursor})
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'Invalid cursor'
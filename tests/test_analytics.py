@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import app as app_module
+
+
+def test_cohorts_report_501_without_numpy(app, monkeypatch):
+    monkeypatch.setattr(app_module, 'np', None)
+    response = app.test_client().get('/api/admin/analytics/cohorts')
+    assert response.status_code == 501
+
+
+def test_cohort_funnel_and_progress(running_app):
+    pytest.importorskip('numpy')
+    client = running_app.test_client()
+    for name in ('ready', 'surveyed', 'idle'):
+        client.post('/api/register', json={'email': f'{name}@example.com', 'password': 'pw'})
+        client.post('/api/login', json={'email': f'{name}@example.com', 'password': 'pw'})
+        if name != 'idle':
+            assert client.post('/api/submit-survey', json={'1': 'helping'}).status_code == 201
+        if name == 'ready':
+            client.put('/api/update-profile', json={'total_xp': 10, 'skill_readiness': 80})
+        client.post('/api/logout')
+    
+    response = client.get('/api/admin/analytics/cohorts?weeks=2')
+    assert response.status_code == 200
+    [cohort] = response.get_json()['cohorts']
+    today = datetime.utcnow().date()
+    assert cohort['cohort'] == (today - timedelta(days=today.weekday())).isoformat()
+    assert cohort['users'] == 3
+    assert cohort['funnel'] == {'signed_up': 3, 'completed_survey': 2, 'earned_xp': 1, 'ready': 1}
+    # Only the signup week has happened so far
+    assert cohort['survey_completion'] == [0.6667, None]
+    assert cohort['skill_readiness'] == [26.7, None]
+    
+    # Offset-bearing bounds are read as UTC
+    start = (datetime.utcnow() - timedelta(weeks=3)).isoformat() + '+00:00'
+    assert client.get('/api/admin/analytics/cohorts', query_string={'start': start}).get_json()['cohorts'] == [
+        {**cohort, 'survey_completion': cohort['survey_completion'][:1] + [None] * 11,
+         'skill_readiness': cohort['skill_readiness'][:1] + [None] * 11}
+    ]
+
+
+@pytest.mark.parametrize('query', [{'weeks': 'x'}, {'weeks': 0}, {'start': 'last week'},
+                                   {'start': '2026-03-01', 'end': '2026-01-01'},
+                                   {'start': '2020-01-01', 'end': '2026-01-01'}])
+def test_cohort_arguments_are_checked(app, query):
+    pytest.importorskip('numpy')
+    assert app.test_client().get('/api/admin/analytics/cohorts', query_string=query).status_code == 400
@@ -0,0 +1,39 @@
+import os
+import sqlite3
+from contextlib import closing
+
+from app import (Job, backup_databases, db, list_snapshots, load_snapshot, restore_snapshot,
+                 verify_snapshot)
+
+
+def seed_finished_jobs(count):
+    db.session.execute(Job.__table__.insert(), [
+        {'kind': 'export', 'status': 'succeeded', 'params': '{}', 'result': os.urandom(200).hex()}
+        for _ in range(count)
+    ])
+    db.session.commit()
+
+
+def test_snapshots_store_only_changed_chunks(app, tmp_path):
+    with app.app_context():
+        seed_finished_jobs(5000)
+        first = backup_databases()['databases']['main']
+        assert len(first['chunks']) > 4 and first['new_chunks'] == len(set(first['chunks']))
+        
+        db.session.execute(Job.__table__.update().where(Job.id == 2500).values(result='rewritten'))
+        db.session.commit()
+        second = backup_databases()['databases']['main']
+        assert 0 < second['new_chunks'] <= 3
+        assert second['stored_size'] < first['stored_size'] / 3
+        
+        unchanged = backup_databases()['databases']['main']
+        assert unchanged['reused'] and unchanged['stored_size'] == 0
+        
+        snapshots = list_snapshots()
+        assert len(snapshots) == 3
+        for manifest in snapshots:
+            assert verify_snapshot(manifest['id'])['ok']
+        
+        restored = restore_snapshot(load_snapshot(snapshots[0]['id']), str(tmp_path / 'restore'))
+        with closing(sqlite3.connect(restored['main'])) as conn:
+            assert conn.execute('SELECT result FROM job WHERE id = 2500').fetchone()[0] != 'rewritten'
@@ -0,0 +1,38 @@
+import base64
+import json
+
+import pytest
+
+
+def cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+
+@pytest.mark.parametrize('sort', ['id', 'title', 'deadline'])
+def test_challenge_pages_cover_catalog(app, sort):
+    client = app.test_client()
+    everything = client.get('/api/challenges', query_string={'sort': sort, 'limit': 100}).get_json()['challenges']
+    
+    seen, next_cursor = [], None
+    while True:
+        query = {'sort': sort, 'limit': 2, **({'cursor': next_cursor} if next_cursor else {})}
+        page = client.get('/api/challenges', query_string=query).get_json()
+        seen += page['challenges']
+        next_cursor = page['next_cursor']
+        if next_cursor is None:
+            break
+    assert seen == everything and len(seen) > 2
+
+
+@pytest.mark.parametrize('sort, values', [
+    ('id', [[1]]), ('id', ['1']), ('id', [True]), ('id', [1, 2]), ('id', {'id': 1}),
+    ('title', [{'a': 1}, 1]), ('title', ['Data', '1']), ('title', ['Data']),
+    ('deadline', [5, 1]), ('deadline', ['tomorrow', 1])
+])
+def test_malformed_challenge_cursor_is_rejected(app, sort, values):
+    client = app.test_client()
+    response = client.get('/api/challenges', query_string={'sort': sort, 'cursor': cursor(values)})
+    assert response.status_code == 400
+    assert response.get_json()['message'] == 'Invalid cursor'
+    if sort == 'id':
+        assert client.get('/api/admin/challenges', query_string={'cursor': cursor(values)}).status_code == 400
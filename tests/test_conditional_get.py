@@ -0,0 +1,52 @@
+import sqlite3
+from contextlib import closing
+
+
+def revalidate(client, path, etag):
+    return client.get(path, headers={'If-None-Match': etag})
+
+
+def test_dashboard_etag_changes_with_the_users_writes(running_app):
+    client = running_app.test_client()
+    client.post('/api/register', json={'email': 'etag@example.com', 'password': 'pw'})
+    client.post('/api/login', json={'email': 'etag@example.com', 'password': 'pw'})
+    
+    first = client.get('/api/dashboard-data')
+    etag = first.headers['ETag'].strip('"')
+    assert first.headers['Cache-Control'] == 'private, no-cache'
+    unchanged = revalidate(client, '/api/dashboard-data', etag)
+    assert unchanged.status_code == 304 and unchanged.get_data() == b''
+    
+    client.put('/api/update-profile', json={'total_xp': '+5'})
+    changed = revalidate(client, '/api/dashboard-data', etag)
+    assert changed.status_code == 200 and changed.get_json()['stats']['total_xp'] == 5
+    assert changed.headers['ETag'].strip('"') != etag
+    
+    # Another user never gets a 304 for someone else's copy
+    other = running_app.test_client()
+    other.post('/api/register', json={'email': 'other@example.com', 'password': 'pw'})
+    other.post('/api/login', json={'email': 'other@example.com', 'password': 'pw'})
+    assert revalidate(other, '/api/dashboard-data', changed.headers['ETag'].strip('"')).status_code == 200
+
+
+def test_admin_etags_follow_writes_from_other_processes(running_app):
+    client = running_app.test_client()
+    etag = client.get('/api/admin/stats').headers['ETag'].strip('"')
+    assert revalidate(client, '/api/admin/stats', etag).status_code == 304
+    
+    client.post('/api/register', json={'email': 'stats@example.com', 'password': 'pw'})
+    client.post('/api/login', json={'email': 'stats@example.com', 'password': 'pw'})
+    client.post('/api/submit-survey', json={'1': 'helping'})
+    refreshed = revalidate(client, '/api/admin/stats', etag)
+    assert refreshed.status_code == 200 and refreshed.get_json()['total_surveys'] == 1
+    
+    # A write outside the app is picked up by the table_version triggers
+    with client.get('/api/admin/challenges') as response:
+        etag = response.headers['ETag'].strip('"')
+    path = running_app.config['SQLALCHEMY_DATABASE_URI'][len('sqlite:///'):]
+    with closing(sqlite3.connect(path)) as conn:
+        conn.execute("UPDATE challenge SET status = 'Closed' WHERE id = 1")
+        conn.commit()
+    with revalidate(client, '/api/admin/challenges', etag) as response:
+        assert response.status_code == 200
+        assert [c['status'] for c in response.get_json()['challenges'] if c['id'] == 1] == ['Closed']
@@ -0,0 +1,96 @@
+import csv
+import io
+import json
+import sqlite3
+import time
+from contextlib import closing
+from datetime import datetime
+
+from conftest import make_app
+
+from app import User, db, normalize_email
+
+
+def seed_users(app, count):
+    with app.app_context():
+        db.session.execute(User.__table__.insert(), [
+            {'email': f'bulk{i}@example.com', 'email_normalized': normalize_email(f'bulk{i}@example.com'),
+             'password_hash': 'x', 'name': f'Bulk {i}', 'created_at': datetime(2026, 1, 1)}
+            for i in range(count)
+        ])
+        db.session.commit()
+
+
+def test_csv_and_ndjson_exports_hold_every_row(app):
+    seed_users(app, 120)
+    client = app.test_client()
+    
+    rows = list(csv.DictReader(io.StringIO(client.get('/api/admin/export/users').get_data(as_text=True))))
+    assert len(rows) == 120 and rows[0]['email'] == 'bulk0@example.com'
+    
+    lines = client.get('/api/admin/export/users?format=ndjson').get_data(as_text=True).splitlines()
+    assert [json.loads(line)['name'] for line in lines[:2]] == ['Bulk 0', 'Bulk 1']
+    assert len(lines) == 120
+    
+    assert client.get('/api/admin/export/users?format=xml').status_code == 400
+    assert client.get('/api/admin/export/nothing').status_code == 404
+
+
+def test_open_export_stream_does_not_block_writers(tmp_path):
+    app = make_app(str(tmp_path), EXPORT_BATCH_SIZE=10)
+    seed_users(app, 200)
+    client = app.test_client()
+    
+    response = client.get('/api/admin/export/users', buffered=False)
+    chunks = iter(response.response)
+    next(chunks)
+    try:
+        # The export's read cursor is still open on the primary
+        started = time.monotonic()
+        register = app.test_client().post('/api/register', json={'email': 'mid@example.com', 'password': 'pw'})
+        assert register.status_code == 201
+        assert time.monotonic() - started < 2
+    finally:
+        body = ''.join(chunk.decode() if isinstance(chunk, bytes) else chunk for chunk in chunks)
+        response.close()
+    assert body.count('\n') >= 190
+
+
+def test_write_locked_by_another_process_answers_503(tmp_path):
+    app = make_app(str(tmp_path), SQLALCHEMY_ENGINE_OPTIONS={'connect_args': {'timeout': 0.2}})
+    path = app.config['SQLALCHEMY_DATABASE_URI'][len('sqlite:///'):]
+    
+    with closing(sqlite3.connect(path, isolation_level=None)) as other:
+        other.execute('BEGIN IMMEDIATE')
+        response = app.test_client().post('/api/register', json={'email': 'late@example.com', 'password': 'pw'})
+        other.execute('ROLLBACK')
+    assert response.status_code == 503
+    assert response.headers['Retry-After']
+
+
+def test_exports_beyond_the_limit_answer_503(tmp_path):
+    app = make_app(str(tmp_path), EXPORT_CONCURRENCY=1)
+    seed_users(app, 20)
+    client = app.test_client()
+    
+    first = client.get('/api/admin/export/users', buffered=False)
+    try:
+        second = client.get('/api/admin/export/surveys')
+        assert second.status_code == 503
+        assert second.headers['Retry-After']
+    finally:
+        first.close()
+    # The slot is freed when the stream closes
+    with client.get('/api/admin/export/users?format=ndjson') as response:
+        assert response.status_code == 200 and len(response.get_data().splitlines()) == 20
+
+
+def test_sharded_export_merges_in_id_order(running_app):
+    client = running_app.test_client()
+    for i in range(5):
+        client.post('/api/register', json={'email': f'spread{i}@example.com', 'password': 'pw'})
+    
+    with client.get('/api/admin/export/users?format=ndjson') as response:
+        rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [row['email'] for row in rows] == [f'spread{i}@example.com' for i in range(5)]
+    assert [row['id'] for row in rows] == sorted(row['id'] for row in rows)
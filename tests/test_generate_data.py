@@ -0,0 +1,39 @@
+import pytest
+
+from app import db, generate_synthetic_data, user_engines
+
+
+def trigger_names(engine):
+    with engine.connect() as conn:
+        return {row[0] for row in conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+
+
+def all_triggers():
+    return [trigger_names(engine) for engine in dict.fromkeys([db.engine, *user_engines()])]
+
+
+def test_generate_data_loads_users_and_surveys(running_app):
+    with running_app.app_context():
+        before = all_triggers()
+        counts = generate_synthetic_data(30, 5, batch_size=10, echo=lambda line: None)
+        assert counts['users'] == 30 and counts['challenges'] == 5 and counts['surveys'] > 0
+        assert all_triggers() == before
+    
+    login = running_app.test_client().post('/api/login', json={'email': 'synthetic5@example.test',
+                                                                'password': 'synthetic-5'})
+    assert login.status_code == 200
+
+
+def test_failed_generation_puts_triggers_back(running_app):
+    def fail_after_first_batch(line):
+        raise RuntimeError('interrupted')
+    
+    with running_app.app_context():
+        before = all_triggers()
+        assert any(name.startswith('xp_') for names in before for name in names)
+        with pytest.raises(RuntimeError):
+            generate_synthetic_data(30, 5, batch_size=10, echo=fail_after_first_batch)
+        assert all_triggers() == before
+    
+    # The batch that committed is counted like any other write
+    assert running_app.test_client().get('/api/admin/stats').get_json()['total_users'] == 10
@@ -0,0 +1,126 @@
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+
+from app import Job, JobContext, SurveyResponse, UserProfile, db, find_user, import_users_job, user_session
+
+
+def wait_for_job(client, job_id, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f'/api/admin/jobs/{job_id}').get_json()['job']
+        if job['status'] in ('succeeded', 'failed', 'cancelled'):
+            return job
+        time.sleep(0.1)
+    raise AssertionError(f'job {job_id} still {job["status"]}')
+
+
+def test_import_stores_every_user(running_app):
+    client = running_app.test_client()
+    users = [{'email': f'Import{i}@Example.com', 'password': f'secret-{i}', 'name': f'User {i}'} for i in range(6)]
+    users.append({'email': 'import0@example.com ', 'password': 'duplicate'})
+    
+    response = client.post('/api/admin/users/import', json={'users': users})
+    assert response.status_code == 202
+    job = wait_for_job(client, response.get_json()['job']['id'])
+    
+    assert job['status'] == 'succeeded', job['error']
+    assert job['result'] == {'created': 6, 'skipped': 1}
+    with running_app.app_context():
+        for i in range(6):
+            user = find_user(f'import{i}@example.com')
+            assert user is not None and user.check_password(f'secret-{i}')
+            assert user_session(user.id).query(UserProfile).filter_by(user_id=user.id).count() == 1
+    
+    login = client.post('/api/login', json={'email': 'import3@example.com', 'password': 'secret-3'})
+    assert login.status_code == 200
+
+
+def register_users(client, count):
+    user_ids = []
+    for i in range(count):
+        response = client.post('/api/register', json={'email': f'member{i}@example.com', 'password': 'pw', 'name': str(i)})
+        assert response.status_code == 201
+        user_ids.append(response.get_json()['user']['id'])
+        client.post('/api/login', json={'email': f'member{i}@example.com', 'password': 'pw'})
+        assert client.post('/api/submit-survey', json={'1': 'helping'}).status_code == 201
+        client.post('/api/logout')
+    return user_ids
+
+
+def test_profile_increments_and_bulk_delete(running_app):
+    client = running_app.test_client()
+    user_ids = register_users(client, 4)
+    
+    response = client.post('/api/admin/profile-increments', json={'increments': [
+        {'user_id': user_id, 'total_xp': 10} for user_id in user_ids + user_ids[:1]
+    ]})
+    assert response.get_json()['updated'] == 4
+    with running_app.app_context():
+        xp = {user_id: user_session(user_id).query(UserProfile).filter_by(user_id=user_id).one().total_xp
+              for user_id in user_ids}
+    assert xp == {user_id: 20 if user_id == user_ids[0] else 10 for user_id in user_ids}
+    
+    response = client.post('/api/admin/users/bulk-delete', json={'user_ids': user_ids[:3]})
+    job = wait_for_job(client, response.get_json()['job']['id'])
+    assert job['result'] == {'deleted': 3, 'requested': 3}
+    with running_app.app_context():
+        assert [find_user(f'member{i}@example.com') is None for i in range(4)] == [True, True, True, False]
+    assert client.get('/api/admin/stats').get_json()['total_surveys'] == 1
+
+
+def test_archive_moves_old_surveys(running_app):
+    client = running_app.test_client()
+    user_ids = register_users(client, 4)
+    
+    with running_app.app_context():
+        for user_id in user_ids[:3]:
+            user_db = user_session(user_id)
+            user_db.execute(SurveyResponse.__table__.update().where(SurveyResponse.user_id == user_id).values(
+                completed_at=datetime.utcnow() - timedelta(days=400)
+            ))
+            user_db.commit()
+    
+    response = client.post('/api/admin/archive', json={'older_than_days': 365})
+    job = wait_for_job(client, response.get_json()['job']['id'])
+    assert job['result']['archived'] == 3
+    counts = client.get('/api/admin/archive').get_json()
+    assert (counts['hot_surveys'], counts['archived_surveys']) == (1, 3)
+    
+    # The hot table by default; a range reaching into the archived period, with or without from=
+    cutoff = (datetime.utcnow() - timedelta(days=300)).isoformat()
+    assert len(list_surveys(client)) == 1
+    assert len(list_surveys(client, to=cutoff)) == 3
+    assert len(list_surveys(client, to=cutoff, limit=2)) == 2
+    assert len(list_surveys(client, **{'from': cutoff})) == 1
+
+
+def list_surveys(client, **args):
+    # Streamed lists hold an admin slot until the response is closed
+    with client.get('/api/admin/surveys', query_string=args) as response:
+        return response.get_json()['surveys']
+
+
+def test_import_queues_without_hashing(app):
+    users = [{'email': f'quick{i}@example.com', 'password': f'secret-{i}'} for i in range(100)]
+    
+    started = time.monotonic()
+    response = app.test_client().post('/api/admin/users/import', json={'users': users})
+    assert response.status_code == 202
+    assert time.monotonic() - started < 1
+    
+    rejected = app.test_client().post('/api/admin/users/import', json={'users': [{'email': 'x@example.com', 'password': 5}]})
+    assert rejected.status_code == 400
+    
+    # Run by hand (no job runner here): each batch's passwords are hashed and written back
+    with app.test_request_context():
+        job = db.session.get(Job, response.get_json()['job']['id'])
+        params = json.loads(job.params)
+        assert params['users'][0]['password'] == 'secret-0'
+        result = import_users_job(JobContext(job.id, threading.Event()), **{**params, 'batch_size': 40})
+        assert result == {'created': 100, 'skipped': 0}
+        
+        stored = json.loads(db.session.get(Job, job.id).params)['users']
+        assert not any('password' in item for item in stored)
+        assert all(item['password_hash'].startswith('scrypt:') for item in stored)
@@ -0,0 +1,113 @@
+import sqlite3
+
+from conftest import make_app
+
+from app import SurveyCodebook
+
+# The original schema, before answers were packed and deadlines typed
+LEGACY_SCHEMA = '''
+CREATE TABLE user (id INTEGER PRIMARY KEY, email VARCHAR(120) NOT NULL UNIQUE, password_hash VARCHAR(255) NOT NULL,
+                   name VARCHAR(100), created_at DATETIME);
+CREATE TABLE user_profile (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL REFERENCES user (id),
+                           skill_readiness INTEGER, verified_skills INTEGER, total_xp INTEGER, certifications INTEGER);
+CREATE TABLE survey_response (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL REFERENCES user (id),
+                              question_1 VARCHAR(50), question_2 VARCHAR(50), question_3 VARCHAR(50),
+                              question_4 VARCHAR(50), question_5 VARCHAR(50), completed_at DATETIME);
+CREATE TABLE challenge (id INTEGER PRIMARY KEY, title VARCHAR(200) NOT NULL, company VARCHAR(100),
+                        domain VARCHAR(100), difficulty VARCHAR(50), deadline VARCHAR(50), status VARCHAR(50));
+'''
+
+
+def legacy_app(tmp_path, *statements):
+    conn = sqlite3.connect(tmp_path / 'skillverify.db')
+    conn.executescript(LEGACY_SCHEMA)
+    conn.execute("INSERT INTO user VALUES (1, 'old@example.com', 'x', 'Old', '2025-01-02 03:04:05')")
+    for statement in statements:
+        conn.execute(statement)
+    conn.commit()
+    conn.close()
+    return make_app(str(tmp_path))
+
+
+def test_legacy_answers_are_packed(tmp_path):
+    app = legacy_app(
+        tmp_path,
+        "INSERT INTO survey_response VALUES (1, 1, 'helping', 'startup', NULL, 'balanced', 'research', '2025-01-03 00:00:00')",
+        "INSERT INTO survey_response VALUES (2, 1, 'an answer nobody offers', NULL, NULL, NULL, NULL, '2025-01-04 00:00:00')"
+    )
+    
+    with app.test_client().get('/api/admin/surveys') as response:
+        surveys = response.get_json()['surveys']
+    assert [(s['id'], s['question_set'], s['question_1'], s['question_2'], s['question_3'], s['question_5'])
+            for s in surveys] == [(1, 1, 'helping', 'startup', None, 'research'),
+                                  (2, 1, 'an answer nobody offers', None, None, None)]
+    with app.app_context():
+        assert SurveyCodebook().decode(1, b'\x00') == {f'question_{i}': None for i in range(1, 6)}
+
+
+def test_legacy_deadlines_are_typed(tmp_path):
+    app = legacy_app(tmp_path, *(
+        f"INSERT INTO challenge (id, title, deadline) VALUES ({i}, 'Challenge {i}', '{deadline}')"
+        for i, deadline in enumerate(['Jan 25, 2026', 'February 1, 2026', '2026-01-30', '03/15/2026',
+                                      '2026-03-01T10:00:00+02:00', 'TBD'], start=1)
+    ))
+    
+    challenges = app.test_client().get('/api/challenges?limit=10').get_json()['challenges']
+    assert [challenge['deadline'] for challenge in challenges] == [
+        '2026-01-25T23:59:59', '2026-02-01T23:59:59', '2026-01-30T23:59:59', '2026-03-15T23:59:59',
+        '2026-03-01T08:00:00', None
+    ]
+    by_deadline = app.test_client().get('/api/challenges?sort=deadline&deadline_after=2026-02-01').get_json()
+    assert [challenge['id'] for challenge in by_deadline['challenges']] == [2, 5, 4]
+
+
+def test_duplicate_accounts_are_merged(tmp_path):
+    app = legacy_app(
+        tmp_path,
+        "INSERT INTO user VALUES (2, ' Bob@Example.com', 'x', 'Bob', '2025-01-02 00:00:00')",
+        "INSERT INTO user VALUES (3, 'bob@example.com', 'x', 'Bobby', '2025-02-02 00:00:00')",
+        "INSERT INTO user_profile VALUES (1, 2, 10, 1, 500, 0)",
+        "INSERT INTO user_profile VALUES (2, 3, 40, 0, 100, 2)",
+        "INSERT INTO survey_response VALUES (1, 3, 'helping', NULL, NULL, NULL, NULL, '2025-02-03 00:00:00')"
+    )
+    client = app.test_client()
+    
+    with client.get('/api/admin/users') as response:
+        users = response.get_json()['users']
+    assert sorted((user['id'], user['email']) for user in users) == [(1, 'old@example.com'), (2, ' Bob@Example.com')]
+    bob = next(user for user in users if user['id'] == 2)
+    assert (bob['profile']['skill_readiness'], bob['profile']['total_xp'], bob['profile']['certifications']) == (40, 500, 2)
+    with client.get('/api/admin/surveys') as response:
+        assert [survey['user_email'] for survey in response.get_json()['surveys']] == [' Bob@Example.com']
+    
+    assert client.post('/api/register', json={'email': 'BOB@example.com', 'password': 'pw'}).status_code == 400
+    exists = client.post('/api/admin/users/exists', json={'emails': ['bob@EXAMPLE.com', 'new@example.com']}).get_json()
+    assert (exists['exists'], exists['existing']) == ({'bob@EXAMPLE.com': True, 'new@example.com': False}, 1)
+
+
+def test_codebook_misses_reload_only_after_changes(app, monkeypatch):
+    with app.app_context():
+        codebook = SurveyCodebook()
+        codebook.refresh()
+        reloads = []
+        reload = codebook.reload
+        monkeypatch.setattr(codebook, 'reload', lambda: reloads.append(1) or reload())
+        
+        # Unknown values and sets are remembered as missing until an option or set is written
+        for _ in range(3):
+            assert codebook.question_count(99) is None
+            assert codebook.value_for(1, 1, 200) is None
+        assert codebook.max_question_count() == 5
+        assert reloads == []
+    
+    # Another worker registers a question set; the next miss picks it up
+    response = app.test_client().post('/api/admin/survey-question-sets', json={
+        'question_count': 2, 'options': [['yes', 'no'], ['maybe']]
+    })
+    assert response.status_code == 201
+    set_id = response.get_json()['question_set']['id']
+    with app.app_context():
+        assert codebook.question_count(set_id) == 2
+        assert codebook.code_for(set_id, 2, 'maybe') == 1
+        assert codebook.max_question_count() == 5
+        assert len(reloads) == 1
@@ -0,0 +1,56 @@
+import json
+import re
+
+from app import UserProfile, db
+
+NAME = '</script><script>alert(1)</script> & \u2028\u2029'
+
+
+def test_dashboard_inlines_escaped_payload(app):
+    client = app.test_client()
+    client.post('/api/register', json={'email': 'page@example.com', 'password': 'pw', 'name': NAME})
+    client.post('/api/login', json={'email': 'page@example.com', 'password': 'pw'})
+    
+    response = client.get('/')
+    assert response.status_code == 200
+    html = response.get_data(as_text=True)
+    
+    match = re.search(r'<script id="dashboardBootstrap" type="application/json">(.*?)</script>', html, re.S)
+    assert match is not None
+    inlined = match.group(1)
+    # Nothing in the data can close the element early or break the script
+    assert not set('<>&\u2028\u2029') & set(inlined)
+    
+    payload = json.loads(inlined)
+    assert payload['success'] and payload['user']['name'] == NAME
+    assert 'challenges' in payload
+
+
+def test_dashboard_stats_default_without_profile(app):
+    client = app.test_client()
+    client.post('/api/register', json={'email': 'bare@example.com', 'password': 'pw'})
+    client.post('/api/login', json={'email': 'bare@example.com', 'password': 'pw'})
+    with app.app_context():
+        db.session.execute(UserProfile.__table__.delete())
+        db.session.commit()
+    
+    html = client.get('/').get_data(as_text=True)
+    payload = json.loads(re.search(r'id="dashboardBootstrap" type="application/json">(.*?)</script>', html, re.S).group(1))
+    assert payload['stats'] == {'skill_readiness': 0, 'verified_skills': 0, 'total_xp': 0, 'certifications': 0}
+
+
+def test_warm_worker_primes_per_request_lookups(running_app):
+    assert running_app.extensions['worker']['ready']
+    assert len(running_app.extensions['challenge_cache']._entries) == 1
+    assert running_app.extensions['survey_codebook']._question_counts == {1: 5}
+
+
+def test_fresh_install_lists_the_sample_challenges(app):
+    client = app.test_client()
+    client.post('/api/register', json={'email': 'new@example.com', 'password': 'pw'})
+    client.post('/api/login', json={'email': 'new@example.com', 'password': 'pw'})
+    
+    challenges = client.get('/api/dashboard-data').get_json()['challenges']
+    assert len(challenges) == 3
+    assert client.get('/api/challenges/closing-soon?days=30').get_json()['challenges'] == \
+        sorted(challenges, key=lambda challenge: challenge['deadline'])
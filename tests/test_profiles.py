@@ -0,0 +1,33 @@
+import pytest
+
+
+@pytest.fixture
+def client(app):
+    client = app.test_client()
+    client.post('/api/register', json={'email': 'profile@example.com', 'password': 'pw'})
+    client.post('/api/login', json={'email': 'profile@example.com', 'password': 'pw'})
+    return client
+
+
+def test_profile_values_and_deltas(client):
+    profile = client.put('/api/update-profile', json={'total_xp': 100, 'certifications': 2}).get_json()['profile']
+    assert (profile['total_xp'], profile['certifications']) == (100, 2)
+    
+    profile = client.put('/api/update-profile', json={'total_xp': '+50', 'certifications': ' -1 '}).get_json()['profile']
+    assert (profile['total_xp'], profile['certifications']) == (150, 1)
+
+
+@pytest.mark.parametrize('value', [1.9, '7', '+1.5', '+', '+ 5', True, None, [1]])
+def test_profile_values_must_be_integers(client, value):
+    response = client.put('/api/update-profile', json={'total_xp': value})
+    assert response.status_code == 400
+    assert client.get('/api/dashboard-data').get_json()['stats']['total_xp'] == 0
+
+
+@pytest.mark.parametrize('item', [{'user_id': 1, 'total_xp': 2.5}, {'user_id': 1, 'total_xp': '3'},
+                                  {'user_id': '1', 'total_xp': 3}, {'user_id': 1.0, 'total_xp': 3},
+                                  {'user_id': 1, 'certifications': False}, {'total_xp': 3}])
+def test_increments_must_be_integers(client, item):
+    response = client.post('/api/admin/profile-increments', json={'increments': [{'user_id': 1, 'total_xp': 1}, item]})
+    assert response.status_code == 400
+    assert client.get('/api/dashboard-data').get_json()['stats']['total_xp'] == 0
@@ -0,0 +1,50 @@
+from conftest import make_app
+
+from app import get_limiter
+
+
+def login(client, email, password='wrong', addr='10.0.0.1'):
+    return client.post('/api/login', json={'email': email, 'password': password}, environ_base={'REMOTE_ADDR': addr})
+
+
+def test_login_is_limited_per_account(tmp_path):
+    app = make_app(str(tmp_path), LOGIN_RATE_PER_ACCOUNT=(2, 60))
+    client = app.test_client()
+    client.post('/api/register', json={'email': 'target@example.com', 'password': 'pw'})
+    
+    assert [login(client, 'target@example.com').status_code for _ in range(2)] == [401, 401]
+    # Case and spacing variants share the account's bucket, even with the right password
+    limited = login(client, ' Target@Example.com', 'pw', addr='10.0.0.2')
+    assert limited.status_code == 429
+    assert int(limited.headers['Retry-After']) == 30
+    
+    assert login(client, 'other@example.com').status_code == 401
+    stats = client.get('/api/admin/admission').get_json()['rate_limits']['login_account']
+    assert stats == {'tracked_keys': 2, 'rejected': 1}
+
+
+def test_login_is_limited_per_ip(tmp_path):
+    app = make_app(str(tmp_path), LOGIN_RATE_PER_IP=(3, 30))
+    client = app.test_client()
+    
+    assert [login(client, f'user{i}@example.com').status_code for i in range(4)] == [401, 401, 401, 429]
+    assert login(client, 'user0@example.com', addr='10.0.0.9').status_code == 401
+    assert client.get('/api/admin/admission').get_json()['rate_limits']['login_ip']['rejected'] == 1
+
+
+def test_password_checks_shed_with_503(tmp_path):
+    app = make_app(str(tmp_path), AUTH_CONCURRENCY=1, AUTH_QUEUE_DEPTH=0)
+    client = app.test_client()
+    client.post('/api/register', json={'email': 'busy@example.com', 'password': 'pw'})
+    
+    with app.app_context():
+        limiter = get_limiter('auth')
+        assert limiter.acquire()
+        try:
+            response = login(client, 'busy@example.com', 'pw')
+            assert response.status_code == 503 and 'Retry-After' in response.headers
+            # Cheap endpoints are not held up behind the password checks
+            assert client.get('/api/challenges').status_code == 200
+        finally:
+            limiter.release()
+    assert login(client, 'busy@example.com', 'pw').status_code == 200
@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta, timezone
+
+
+def test_xp_history_ranges(running_app):
+    client = running_app.test_client()
+    user_id = client.post('/api/register', json={'email': 'xp@example.com', 'password': 'pw'}).get_json()['user']['id']
+    client.post('/api/admin/profile-increments', json={'increments': [{'user_id': user_id, 'total_xp': 15}]})
+    client.post('/api/login', json={'email': 'xp@example.com', 'password': 'pw'})
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    
+    history = client.get('/api/xp-history?period=day').get_json()
+    assert history['end'] == (today + timedelta(days=1)).isoformat()
+    assert history['start'] == (today - timedelta(days=29)).isoformat()
+    assert [(point['bucket'], point['delta'], point['value']) for point in history['points']] == \
+        [(today.isoformat(), 15, 15)]
+    
+    glob = client.get('/api/xp-history?scope=global&period=hour').get_json()
+    assert sum(point['delta'] for point in glob['points']) == 15
+    
+    # A range after the change starts from its running total
+    later = client.get('/api/xp-history', query_string={'period': 'day', 'start': (today + timedelta(days=1)).isoformat(),
+                                                        'end': (today + timedelta(days=3)).isoformat()}).get_json()
+    assert (later['baseline'], later['points']) == (15, [])
+
+
+def test_xp_history_accepts_offsets(running_app):
+    client = running_app.test_client()
+    client.post('/api/register', json={'email': 'tz@example.com', 'password': 'pw'})
+    client.post('/api/login', json={'email': 'tz@example.com', 'password': 'pw'})
+    
+    # Aware bounds are compared as UTC, like the stored buckets
+    start = datetime(2026, 3, 1, 2, 30, tzinfo=timezone(timedelta(hours=5)))
+    response = client.get('/api/xp-history', query_string={
+        'period': 'hour', 'start': start.isoformat(), 'end': '2026-03-01T12:00:00Z'
+    })
+    assert response.status_code == 200
+    assert (response.get_json()['start'], response.get_json()['end']) == ('2026-02-28T21:00:00', '2026-03-01T12:00:00')
+    recent = (datetime.now(timezone.utc) - timedelta(days=2)).isoformat()
+    assert client.get('/api/xp-history', query_string={'start': recent}).status_code == 200
+    
+    for query in ({'start': 'soon'}, {'start': '2026-03-02T00:00:00+01:00', 'end': '2026-03-01'},
+                  {'period': 'hour', 'start': '2020-01-01', 'end': '2026-01-01'}):
+        assert client.get('/api/xp-history', query_string=query).status_code == 400
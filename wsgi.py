@@ -0,0 +1,18 @@
+"""Production WSGI entry point for the prefork server.
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+gunicorn.conf.py sets preload_app, so the master imports this module exactly
+once: the app is built and the schema is checked here, before any fork. Each
+worker then drops the inherited connections and warms itself in the post_fork
+hook, and reports ready on /readyz.
+"""
+from app import create_app, db, get_user_shards, init_schema
+
+app = create_app()
+
+with app.app_context():
+    init_schema()
+    # Don't hand open SQLite handles to forked workers
+    db.engine.dispose()
+    get_user_shards().dispose()